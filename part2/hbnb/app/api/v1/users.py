@@ -52,7 +52,11 @@ class UserResource(Resource):
         if not user:
             return {'error': 'User not found'}, 404
 
-        user.update(user_data)
+        existing_user = facade.get_user_by_email(user_data['email'])
+        if existing_user and existing_user.id != user_id:
+            return {'error': 'Email already registered'}, 400
+
+        facade.update_user(user_id, user_data)
         return {
             'id': user.id,
             'first_name': user.first_name,
@@ -28,13 +28,62 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def get_all_by_attribute(self, attr_name, attr_value):
+        pass
+
+
+def index_key(value):
+    """Key under which an attribute value is indexed.
+
+    Related objects (e.g. review.place) are indexed by their id, so a lookup
+    works with either the object or its id.
+    """
+    return getattr(value, 'id', value)
+
 
 class InMemoryRepository(Repository):
-    def __init__(self):
+    def __init__(self, unique_indexes=(), indexes=()):
         self._storage = {}
+        # attribute -> {key: obj} for values that identify a single object
+        self._unique = {attr_name: {} for attr_name in unique_indexes}
+        # attribute -> {key: {obj_id: obj}} for values shared by many objects
+        self._indexes = {attr_name: {} for attr_name in indexes}
+
+    def _check_unique(self, obj, values):
+        """Raise ValueError if any unique value is already used by another object"""
+        for attr_name, index in self._unique.items():
+            if attr_name in values:
+                existing = index.get(index_key(values[attr_name]))
+                if existing is not None and existing.id != obj.id:
+                    raise ValueError(f"{attr_name} already exists")
+
+    def _index(self, obj):
+        for attr_name, index in self._unique.items():
+            index[index_key(getattr(obj, attr_name, None))] = obj
+        for attr_name, index in self._indexes.items():
+            index.setdefault(index_key(getattr(obj, attr_name, None)), {})[obj.id] = obj
+
+    def _unindex(self, obj):
+        for attr_name, index in self._unique.items():
+            key = index_key(getattr(obj, attr_name, None))
+            if index.get(key) is obj:
+                del index[key]
+        for attr_name, index in self._indexes.items():
+            key = index_key(getattr(obj, attr_name, None))
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(obj.id, None)
+                if not bucket:
+                    del index[key]
 
     def add(self, obj):
+        self._check_unique(obj, {attr_name: getattr(obj, attr_name, None) for attr_name in self._unique})
+        previous = self._storage.get(obj.id)
+        if previous is not None:
+            self._unindex(previous)
         self._storage[obj.id] = obj
+        self._index(obj)
 
     def get(self, obj_id):
         return self._storage.get(obj_id)
@@ -45,11 +94,30 @@ class InMemoryRepository(Repository):
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
-            obj.update(data)
+            self._check_unique(obj, data)
+            self._unindex(obj)
+            try:
+                obj.update(data)
+            finally:
+                self._index(obj)
 
     def delete(self, obj_id):
         if obj_id in self._storage:
-            del self._storage[obj_id]
+            self._unindex(self._storage.pop(obj_id))
 
     def get_by_attribute(self, attr_name, attr_value):
-        return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
\ No newline at end of file
+        key = index_key(attr_value)
+        if attr_name in self._unique:
+            return self._unique[attr_name].get(key)
+        if attr_name in self._indexes:
+            return next(iter(self._indexes[attr_name].get(key, {}).values()), None)
+        return next((obj for obj in self._storage.values() if index_key(getattr(obj, attr_name)) == key), None)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        key = index_key(attr_value)
+        if attr_name in self._unique:
+            obj = self._unique[attr_name].get(key)
+            return [obj] if obj is not None else []
+        if attr_name in self._indexes:
+            return list(self._indexes[attr_name].get(key, {}).values())
+        return [obj for obj in self._storage.values() if index_key(getattr(obj, attr_name)) == key]
\ No newline at end of file
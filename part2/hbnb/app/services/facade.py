@@ -8,10 +8,10 @@ from hbnb.app.models.review import Review
 
 class HBnBFacade:
     def __init__(self):
-        self.user_repo = InMemoryRepository()
+        self.user_repo = InMemoryRepository(unique_indexes=('email',))
         self.amenity_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
+        self.place_repo = InMemoryRepository(indexes=('owner',))
+        self.review_repo = InMemoryRepository(indexes=('place', 'user'))
 
     def create_user(self, user_data):
         user = User(**user_data)
@@ -24,6 +24,13 @@ class HBnBFacade:
     def get_user_by_email(self, email):
         return self.user_repo.get_by_attribute('email', email)
 
+    def update_user(self, user_id, user_data):
+        user = self.get_user(user_id)
+        if user:
+            self.user_repo.update(user_id, user_data)
+            return user
+        return None
+
     def create_amenity(self, amenity_data):
     # Placeholder for logic to create an amenity
         amenity = Amenity(**amenity_data)
@@ -42,7 +49,7 @@ class HBnBFacade:
         # Placeholder for logic to update an amenity
         amenity = self.get_amenity(amenity_id)
         if amenity:
-            amenity.update(amenity_data)
+            self.amenity_repo.update(amenity_id, amenity_data)
             return amenity
         return None
 
@@ -80,7 +87,7 @@ class HBnBFacade:
         # Placeholder for logic to update a place
         place = self.get_place(place_id)
         if place:
-            place.update(place_data)
+            self.place_repo.update(place_id, place_data)
             return place
         return None
 
@@ -110,15 +117,14 @@ class HBnBFacade:
         return self.review_repo.get_all()
 
     def get_reviews_by_place(self, place_id):
-        # Placeholder for logic to retrieve all reviews for a specific place
-        return [review for review in self.get_all_reviews() if review.place.id == place_id]
+        return self.review_repo.get_all_by_attribute('place', place_id)
 
 
     def update_review(self, review_id, review_data):
         # Placeholder for logic to update a review
         review = self.get_review(review_id)
         if review:
-            review.update(review_data)
+            self.review_repo.update(review_id, review_data)
             return review
         return None
 
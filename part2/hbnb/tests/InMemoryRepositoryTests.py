@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+
+import unittest
+from hbnb.app.persistence.repository import InMemoryRepository
+from hbnb.app.models.user import User
+from hbnb.app.models.place import Place
+from hbnb.app.models.review import Review
+
+class TestInMemoryRepositoryIndexes(unittest.TestCase):
+    """Test cases for the secondary indexes of InMemoryRepository"""
+
+    def setUp(self):
+        """Set up indexed repositories with a user, two places and reviews"""
+        self.user_repo = InMemoryRepository(unique_indexes=('email',))
+        self.review_repo = InMemoryRepository(indexes=('place', 'user'))
+
+        self.user = User(first_name="John", last_name="Doe", email="john@example.com")
+        self.user_repo.add(self.user)
+
+        self.place = Place(title="Loft", description="", price=100, latitude=10, longitude=10, owner=self.user)
+        self.other_place = Place(title="Cabin", description="", price=80, latitude=20, longitude=20, owner=self.user)
+
+        self.reviews = [
+            Review(text="Great", rating=5, user=self.user, place=self.place),
+            Review(text="Fine", rating=3, user=self.user, place=self.place),
+            Review(text="Cold", rating=2, user=self.user, place=self.other_place),
+        ]
+        for review in self.reviews:
+            self.review_repo.add(review)
+
+    def test_unique_lookup(self):
+        """Test email lookup through the unique index"""
+        self.assertIs(self.user_repo.get_by_attribute('email', "john@example.com"), self.user)
+        self.assertIsNone(self.user_repo.get_by_attribute('email', "jane@example.com"))
+
+    def test_unique_violation(self):
+        """Test that a second user with the same email is rejected"""
+        duplicate = User(first_name="Jane", last_name="Doe", email="john@example.com")
+        with self.assertRaises(ValueError):
+            self.user_repo.add(duplicate)
+        self.assertIsNone(self.user_repo.get(duplicate.id))
+
+    def test_unique_index_follows_update(self):
+        """Test that updating an email moves the user in the index"""
+        self.user_repo.update(self.user.id, {"email": "johnny@example.com"})
+        self.assertIsNone(self.user_repo.get_by_attribute('email', "john@example.com"))
+        self.assertIs(self.user_repo.get_by_attribute('email', "johnny@example.com"), self.user)
+
+    def test_relationship_lookup(self):
+        """Test reviews for a place by place object and by place id"""
+        by_id = self.review_repo.get_all_by_attribute('place', self.place.id)
+        by_object = self.review_repo.get_all_by_attribute('place', self.place)
+        self.assertEqual(by_id, self.reviews[:2])
+        self.assertEqual(by_object, self.reviews[:2])
+
+    def test_relationship_index_follows_update_and_delete(self):
+        """Test that moving and deleting reviews keeps the index correct"""
+        self.review_repo.update(self.reviews[0].id, {"place": self.other_place})
+        self.review_repo.delete(self.reviews[1].id)
+
+        self.assertEqual(self.review_repo.get_all_by_attribute('place', self.place.id), [])
+        self.assertEqual(
+            self.review_repo.get_all_by_attribute('place', self.other_place.id),
+            [self.reviews[2], self.reviews[0]]
+        )
+
+    def test_unindexed_attribute_falls_back_to_scan(self):
+        """Test lookups on attributes without an index"""
+        self.assertEqual(len(self.review_repo.get_all_by_attribute('rating', 5)), 1)
+        self.assertIs(self.review_repo.get_by_attribute('text', "Cold"), self.reviews[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
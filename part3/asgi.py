@@ -0,0 +1,10 @@
+#!/usr/bin/python3
+
+# Async deployment (pip install -r requirements-async.txt), e.g.
+#   uvicorn asgi:application --workers 4 --timeout-keep-alive 75
+import os
+from config import config
+from hbnb.app import create_app
+from hbnb.app.asgi import HBnBASGI
+
+application = HBnBASGI(create_app(config[os.getenv('HBNB_CONFIG', 'default')]))
@@ -0,0 +1,487 @@
+#!/usr/bin/python3
+"""HTTP load benchmark for the HBnB API.
+
+Boots create_app() on a freshly seeded SQLite database, serves it over a
+local threaded HTTP server, and drives a weighted mix of reads, writes and
+logins against every namespace from --concurrency keep-alive clients. It
+prints throughput and latency percentiles per endpoint as JSON, and with
+--baseline flags endpoints that got slower. Run from part3/:
+
+    python -m benchmarks.http_load --mix mixed --concurrency 16 --duration 30 \\
+        --output results.json --baseline baseline.json
+
+Use --save-baseline to store a run to compare later runs against. Seeding,
+the request mix and every client's choices follow --seed, so two runs
+issue the same requests, give or take thread scheduling.
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import logging
+import math
+import os
+import platform
+import random
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from werkzeug.serving import WSGIRequestHandler, make_server
+from config import Config
+from hbnb.app import create_app, db, password_hasher
+from hbnb.app.services import facade
+
+PASSWORD = 'bench-password'
+
+WORDS = ['ocean', 'view', 'loft', 'garden', 'quiet', 'central', 'studio', 'cabin', 'lake', 'modern',
+         'rustic', 'sunny', 'cozy', 'villa', 'harbor', 'forest', 'terrace', 'historic', 'beach', 'city']
+
+AMENITIES = ['Wifi', 'Pool', 'Parking', 'Kitchen', 'Gym', 'Sauna', 'Air conditioning', 'Washer',
+             'Dryer', 'Heating', 'Workspace', 'TV', 'Fireplace', 'Balcony', 'Elevator', 'Crib']
+
+# Scenario -> relative weight. 'browse' is a read-mostly day, 'mixed' adds the
+# write traffic of hosts and guests, 'write-heavy' stresses commits and invalidation.
+MIXES = {
+    'browse': {
+        'list_places': 20, 'get_place': 25, 'filter_places': 10, 'search_text': 6, 'search_near': 6,
+        'place_reviews': 10, 'list_reviews': 4, 'get_user': 5, 'list_users': 2, 'list_amenities': 5,
+        'login': 2, 'create_review': 1, 'admin_stats': 1,
+    },
+    'mixed': {
+        'list_places': 15, 'get_place': 20, 'filter_places': 8, 'search_text': 5, 'search_near': 5,
+        'place_reviews': 8, 'list_reviews': 4, 'get_user': 4, 'list_users': 2, 'list_amenities': 4,
+        'login': 5, 'register': 1, 'create_place': 3, 'update_place': 4, 'create_review': 6,
+        'admin_stats': 1,
+    },
+    'write-heavy': {
+        'list_places': 10, 'get_place': 10, 'place_reviews': 5, 'login': 10, 'register': 5,
+        'create_place': 15, 'update_place': 20, 'create_review': 20, 'admin_stats': 1,
+    },
+}
+
+# Fail the comparison when a percentile or the throughput is off by more than
+# the tolerance; gaps under MIN_DELTA_MS are noise on fast endpoints
+COMPARED_PERCENTILES = ('p50_ms', 'p95_ms')
+MIN_DELTA_MS = 1.0
+
+
+class Dataset:
+    """What the seeded database holds, so scenarios can build valid requests"""
+
+    def __init__(self, users, places, reviews, seed):
+        self.users = users
+        self.places = places
+        self.reviews = reviews
+        self.seed = seed
+        self.amenity_ids = []
+        self.tokens = {}  # user index -> access token
+        # Reviews are numbered; review n is by user review_author(n) on place n % places
+        self._next_review = itertools.count(reviews)
+        self._next_user = itertools.count(users)
+
+    def owner(self, place):
+        return place % self.users
+
+    def review_author(self, n):
+        place = n % self.places
+        # Never the owner, and a new author each time the numbering wraps around the places
+        return (self.owner(place) + 1 + (n // self.places) % (self.users - 1)) % self.users
+
+    def next_review(self):
+        n = next(self._next_review)
+        return self.review_author(n), n % self.places
+
+    def next_user(self):
+        return next(self._next_user)
+
+    def records(self):
+        """NDJSON lines for facade.import_records()"""
+        rng = random.Random(self.seed)
+        password_hash = password_hasher.hash(PASSWORD)
+        for user in range(self.users):
+            yield json.dumps({'type': 'user', 'id': f'user-{user}', 'first_name': f'First{user}',
+                              'last_name': f'Last{user}', 'email': f'user{user}@bench.test',
+                              'password_hash': password_hash, 'is_admin': user == 0})
+        for name in AMENITIES:
+            yield json.dumps({'type': 'amenity', 'name': name})
+        for place in range(self.places):
+            yield json.dumps({
+                'type': 'place', 'id': f'place-{place}', 'owner_id': f'user-{self.owner(place)}',
+                'title': ' '.join(rng.sample(WORDS, 3)).title(),
+                'description': ' '.join(rng.choices(WORDS, k=rng.randint(8, 30))),
+                'price': round(rng.uniform(20, 500), 2),
+                'latitude': round(rng.uniform(-60, 60), 5), 'longitude': round(rng.uniform(-170, 170), 5),
+                'amenities': rng.sample(AMENITIES, rng.randint(0, 6)),
+            })
+        for n in range(self.reviews):
+            yield json.dumps({
+                'type': 'review', 'id': f'review-{n}', 'place_id': f'place-{n % self.places}',
+                'user_id': f'user-{self.review_author(n)}', 'rating': rng.randint(1, 5),
+                'text': ' '.join(rng.choices(WORDS, k=rng.randint(5, 20))),
+            })
+
+
+# Each scenario returns (endpoint label, method, path, JSON body, user whose token to send, expected statuses)
+
+def list_places(rng, data):
+    return 'GET /places/', 'GET', f'/api/v1/places/?limit={rng.choice((20, 50))}', None, None, (200,)
+
+
+def get_place(rng, data):
+    return 'GET /places/<place_id>', 'GET', f'/api/v1/places/place-{rng.randrange(data.places)}', None, None, (200,)
+
+
+def filter_places(rng, data):
+    low = rng.randrange(20, 300)
+    path = f'/api/v1/places/?min_price={low}&max_price={low + 150}&limit=20'
+    amenities = rng.sample(data.amenity_ids, rng.randint(0, 2))
+    if amenities:
+        path += '&amenities=' + ','.join(amenities)
+    return 'GET /places/?filters', 'GET', path, None, None, (200,)
+
+
+def search_text(rng, data):
+    query = '+'.join(rng.sample(WORDS, rng.randint(1, 2)))
+    return 'GET /places/search?q', 'GET', f'/api/v1/places/search?q={query}&limit=20', None, None, (200,)
+
+
+def search_near(rng, data):
+    lat, lon = rng.uniform(-50, 50), rng.uniform(-160, 160)
+    path = f'/api/v1/places/search?lat={lat:.4f}&lon={lon:.4f}&radius_km={rng.choice((100, 500, 1000))}&limit=20'
+    return 'GET /places/search?lat,lon', 'GET', path, None, None, (200,)
+
+
+def place_reviews(rng, data):
+    # Places without reviews answer 404, as the endpoint does today
+    path = f'/api/v1/reviews/places/place-{rng.randrange(data.places)}/reviews'
+    return 'GET /reviews/places/<place_id>/reviews', 'GET', path, None, None, (200, 404)
+
+
+def list_reviews(rng, data):
+    return 'GET /reviews/', 'GET', '/api/v1/reviews/?limit=50', None, None, (200,)
+
+
+def get_user(rng, data):
+    return 'GET /users/<user_id>', 'GET', f'/api/v1/users/user-{rng.randrange(data.users)}', None, None, (200,)
+
+
+def list_users(rng, data):
+    return 'GET /users/', 'GET', '/api/v1/users/?limit=50', None, None, (200,)
+
+
+def list_amenities(rng, data):
+    return 'GET /amenities/', 'GET', '/api/v1/amenities/', None, None, (200,)
+
+
+def login(rng, data):
+    body = {'email': f'user{rng.randrange(data.users)}@bench.test', 'password': PASSWORD}
+    return 'POST /auth/login', 'POST', '/api/v1/auth/login', body, None, (200,)
+
+
+def register(rng, data):
+    user = data.next_user()
+    body = {'first_name': 'New', 'last_name': f'User{user}', 'email': f'user{user}@bench.test', 'password': PASSWORD}
+    return 'POST /users/', 'POST', '/api/v1/users/', body, None, (200, 201)
+
+
+def create_place(rng, data):
+    user = rng.choice(list(data.tokens))
+    body = {'title': ' '.join(rng.sample(WORDS, 3)).title(), 'description': ' '.join(rng.choices(WORDS, k=12)),
+            'price': round(rng.uniform(20, 500), 2), 'latitude': round(rng.uniform(-60, 60), 5),
+            'longitude': round(rng.uniform(-170, 170), 5), 'owner_id': f'user-{user}',
+            'amenities': rng.sample(data.amenity_ids, 2)}
+    return 'POST /places/', 'POST', '/api/v1/places/', body, user, (201,)
+
+
+def update_place(rng, data):
+    user = rng.choice(list(data.tokens))
+    # Seeded places are owned round-robin: place p belongs to user p % users
+    place = user + data.users * rng.randrange(max(1, (data.places - user + data.users - 1) // data.users))
+    body = {'title': ' '.join(rng.sample(WORDS, 3)).title(), 'price': round(rng.uniform(20, 500), 2)}
+    return 'PUT /places/<place_id>', 'PUT', f'/api/v1/places/place-{place}', body, user, (200,)
+
+
+def create_review(rng, data):
+    user, place = data.next_review()
+    if user not in data.tokens:
+        user = rng.choice(list(data.tokens))
+    body = {'text': ' '.join(rng.choices(WORDS, k=10)), 'rating': rng.randint(1, 5),
+            'user_id': f'user-{user}', 'place_id': f'place-{place}'}
+    # 400 when the picked author already reviewed the place or owns it
+    return 'POST /reviews/', 'POST', '/api/v1/reviews/', body, user, (201, 400)
+
+
+def admin_stats(rng, data):
+    return 'GET /admin/db-stats', 'GET', '/api/v1/admin/db-stats', None, 0, (200,)
+
+
+SCENARIOS = {scenario.__name__: scenario for scenario in (
+    list_places, get_place, filter_places, search_text, search_near, place_reviews, list_reviews,
+    get_user, list_users, list_amenities, login, register, create_place, update_place, create_review,
+    admin_stats,
+)}
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    # Keep-alive, like a production server behind a load balancer
+    protocol_version = 'HTTP/1.1'
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class Client:
+    """One keep-alive HTTP connection, as one concurrent user"""
+
+    def __init__(self, host, port, accept_encoding):
+        self.host, self.port = host, port
+        self.accept_encoding = accept_encoding
+        self.connection = None
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Accept-Encoding': self.accept_encoding} if self.accept_encoding else {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        try:
+            self.connection.request(method, path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            self.connection.close()
+            self.connection = None
+            raise
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of sorted values"""
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+def summarize(samples, elapsed):
+    """Throughput and latency percentiles from (latency seconds, ok) samples"""
+    latencies = sorted(latency * 1000 for latency, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p95_ms': round(percentile(latencies, 0.95), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'max_ms': round(latencies[-1], 3),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Per-endpoint change against a baseline run, and the endpoints that regressed"""
+    changes, regressions = {}, []
+    for endpoint, stats in results['endpoints'].items():
+        before = baseline.get('endpoints', {}).get(endpoint)
+        if before is None:
+            continue
+        change = {metric: round(stats[metric] / before[metric] - 1, 4) if before[metric] else None
+                  for metric in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms')}
+        changes[endpoint] = change
+        for metric in COMPARED_PERCENTILES:
+            if stats[metric] > before[metric] * (1 + tolerance) and stats[metric] - before[metric] > MIN_DELTA_MS:
+                regressions.append(f"{endpoint}: {metric} {before[metric]} -> {stats[metric]}")
+        if stats['throughput_rps'] < before['throughput_rps'] * (1 - tolerance):
+            regressions.append(f"{endpoint}: throughput_rps {before['throughput_rps']} -> {stats['throughput_rps']}")
+        if stats['errors'] > before['errors']:
+            regressions.append(f"{endpoint}: errors {before['errors']} -> {stats['errors']}")
+    # Numbers from another mix, load or dataset are not comparable
+    meta, before_meta = results['meta'], baseline.get('meta') or {}
+    mismatched = [key for key in ('mix', 'concurrency', 'duration_s', 'seed', 'dataset', 'accept_encoding')
+                  if before_meta.get(key) != meta[key]]
+    return {'baseline': before_meta, 'mismatched': mismatched, 'tolerance': tolerance,
+            'changes': changes, 'regressions': regressions}
+
+
+def bench_config(args, database_path):
+    class BenchConfig(Config):
+        SECRET_KEY = secrets.token_hex(32)
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{database_path}'
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': args.concurrency + 4, 'max_overflow': 0}
+        SQLITE_PRAGMAS = {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'busy_timeout': 5000}
+        BCRYPT_LOG_ROUNDS = args.bcrypt_rounds
+        # The login endpoint issues tokens whose subject is a dict
+        JWT_VERIFY_SUB = False
+        RESPONSE_CACHE_TTL = args.response_cache_ttl
+    return BenchConfig
+
+
+def seed(app, data):
+    with app.app_context():
+        db.create_all()
+        report = facade.import_records(data.records())
+        data.amenity_ids = list(facade.amenity_repo.get_ids_by_name(AMENITIES).values())
+    return report['imported']
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix='hbnb-bench-')
+    database_path = args.database or os.path.join(workdir, 'bench.db')
+    os.environ.setdefault('CACHE_SQLITE_PATH', os.path.join(workdir, 'cache.sqlite'))
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    app = create_app(bench_config(args, database_path))
+    data = Dataset(args.users, args.places, args.reviews, args.seed)
+    started = time.perf_counter()
+    imported = seed(app, data)
+    print(f"Seeded {imported} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+
+    # Tokens for the users that write, user 0 being the admin
+    setup = Client(host, port, None)
+    for user in range(min(args.token_users, data.users)):
+        status, body = setup.request('POST', '/api/v1/auth/login',
+                                     {'email': f'user{user}@bench.test', 'password': PASSWORD})
+        if status != 200:
+            raise SystemExit(f"Login failed with {status}: {body[:200]!r}")
+        data.tokens[user] = json.loads(body)['access_token']
+    setup.close()
+
+    mix = MIXES[args.mix]
+    names, weights = list(mix), list(mix.values())
+    samples = defaultdict(list)  # endpoint -> [(latency, ok)]
+    statuses = defaultdict(lambda: defaultdict(int))
+    lock = threading.Lock()
+    warmup_ends = time.perf_counter() + args.warmup
+    run_ends = warmup_ends + args.duration
+
+    def worker(index):
+        rng = random.Random(args.seed * 1000 + index)
+        client = Client(host, port, args.accept_encoding)
+        local_samples, local_statuses = defaultdict(list), defaultdict(lambda: defaultdict(int))
+        while True:
+            now = time.perf_counter()
+            if now >= run_ends:
+                break
+            endpoint, method, path, body, user, expected = SCENARIOS[rng.choices(names, weights)[0]](rng, data)
+            token = data.tokens.get(user) if user is not None else None
+            sent = time.perf_counter()
+            try:
+                status, _ = client.request(method, path, body, token)
+            except (http.client.HTTPException, OSError):
+                status = 'connection error'
+            latency = time.perf_counter() - sent
+            if sent >= warmup_ends:
+                local_samples[endpoint].append((latency, status in expected))
+                local_statuses[endpoint][str(status)] += 1
+        client.close()
+        with lock:
+            for endpoint, values in local_samples.items():
+                samples[endpoint].extend(values)
+                for status, count in local_statuses[endpoint].items():
+                    statuses[endpoint][status] += count
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+
+    all_samples = [sample for values in samples.values() for sample in values]
+    if not all_samples:
+        raise SystemExit("No requests completed; increase --duration")
+    return {
+        'meta': {
+            'started_at': datetime.now(timezone.utc).isoformat(),
+            'mix': args.mix,
+            'concurrency': args.concurrency,
+            'duration_s': args.duration,
+            'warmup_s': args.warmup,
+            'seed': args.seed,
+            'dataset': {'users': args.users, 'places': args.places, 'reviews': args.reviews},
+            'accept_encoding': args.accept_encoding,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'total': summarize(all_samples, args.duration),
+        'endpoints': {
+            endpoint: dict(summarize(values, args.duration), statuses=dict(statuses[endpoint]))
+            for endpoint, values in sorted(samples.items())
+        },
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--mix', choices=sorted(MIXES), default='mixed', help='Request mix (default mixed)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent keep-alive clients')
+    parser.add_argument('--duration', type=float, default=20, help='Measured seconds')
+    parser.add_argument('--warmup', type=float, default=3, help='Seconds of load before measuring')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the dataset and the request mix')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--places', type=int, default=2000)
+    parser.add_argument('--reviews', type=int, default=6000)
+    parser.add_argument('--token-users', type=int, default=20, help='Users logged in up front to issue writes')
+    parser.add_argument('--bcrypt-rounds', type=int, default=Config.BCRYPT_LOG_ROUNDS,
+                        help='bcrypt cost for seeded passwords and logins')
+    parser.add_argument('--response-cache-ttl', type=int, default=Config.RESPONSE_CACHE_TTL,
+                        help='RESPONSE_CACHE_TTL for the run (0 disables the response cache)')
+    parser.add_argument('--accept-encoding', default='gzip', help="Accept-Encoding sent by clients ('' for none)")
+    parser.add_argument('--database', help='SQLite file to seed (default: a temporary file)')
+    parser.add_argument('--output', help='Write the JSON results here instead of stdout')
+    parser.add_argument('--baseline', help='Results of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help='Allowed relative slowdown before an endpoint counts as a regression')
+    parser.add_argument('--save-baseline', help='Also write the results here, as the next baseline')
+    args = parser.parse_args(argv)
+    if args.users < 2 or args.places < 1 or args.concurrency < 1:
+        parser.error('need at least 2 users, 1 place and 1 client')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = run(args)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            results['comparison'] = compare(results, json.load(baseline), args.tolerance)
+    encoded = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(encoded + '\n')
+    else:
+        print(encoded)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as baseline:
+            baseline.write(encoded + '\n')
+
+    total = results['total']
+    print(f"{total['requests']} requests, {total['throughput_rps']} req/s, p50 {total['p50_ms']} ms, "
+          f"p95 {total['p95_ms']} ms, p99 {total['p99_ms']} ms, {total['errors']} errors", file=sys.stderr)
+    comparison = results.get('comparison', {})
+    if comparison.get('mismatched'):
+        print(f"WARNING baseline differs in {', '.join(comparison['mismatched'])}", file=sys.stderr)
+    regressions = comparison.get('regressions', [])
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
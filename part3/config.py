@@ -1,17 +1,81 @@
 #!/usr/bin/python3
 
 import os
+import tempfile
+
+
+def _env_flag(name, default):
+    return os.getenv(name, str(default)).lower() in ('1', 'true', 'yes', 'on')
 
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Keyset pagination for list endpoints
+    PAGE_SIZE_DEFAULT = int(os.getenv('PAGE_SIZE_DEFAULT', 50))
+    PAGE_SIZE_MAX = int(os.getenv('PAGE_SIZE_MAX', 500))
+    # Password hashing: bcrypt cost factor and size of the hashing process pool
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+    # Seconds a resolved JWT principal (id, is_admin, owned places) stays cached per worker
+    PRINCIPAL_CACHE_TTL = int(os.getenv('PRINCIPAL_CACHE_TTL', 60))
+    # Fail a request that repeats one SQL statement shape more than this many times (N+1 detector)
+    SQL_STRICT_REPEAT_LIMIT = int(os.getenv('SQL_STRICT_REPEAT_LIMIT', 0)) or None
+    # Cached GET responses: lifetime in seconds (0 disables) and memory bound per worker
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 30))
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    # Where cached responses live ('memory' per worker, or 'sqlite' shared by the workers on a host)
+    # and how invalidations reach other workers ('local', or 'sqlite' through the same file)
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+    CACHE_BUS = os.getenv('CACHE_BUS', 'local')
+    CACHE_SQLITE_PATH = os.getenv('CACHE_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'hbnb-cache.sqlite'))
+    # Seconds between bus polls, and how long invalidations are kept (must exceed every cache TTL)
+    CACHE_BUS_POLL_INTERVAL = float(os.getenv('CACHE_BUS_POLL_INTERVAL', 0.005))
+    CACHE_BUS_RETENTION = int(os.getenv('CACHE_BUS_RETENTION', 300))
+    # Rows written per transaction by the NDJSON bulk import
+    IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 1000))
+    # Prometheus exposition; set PROMETHEUS_MULTIPROC_DIR to aggregate across workers
+    METRICS_PATH = os.getenv('METRICS_PATH', '/metrics')
+    # PRAGMA name -> value run on every new SQLite connection (none by default)
+    SQLITE_PRAGMAS = {}
+    # Response compression: Content-Encodings in order of preference ('' disables; br and zstd
+    # need the brotli and zstandard packages), the smallest body worth compressing, and levels
+    COMPRESS_ENCODINGS = os.getenv('COMPRESS_ENCODINGS', 'zstd,br,gzip')
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', 4))
+    COMPRESS_ZSTD_LEVEL = int(os.getenv('COMPRESS_ZSTD_LEVEL', 3))
+    # ASGI mode (asgi.py): threads running Flask views, which caps concurrent requests per worker
+    ASGI_THREADS = int(os.getenv('ASGI_THREADS', 10))
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+class ProductionConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connection pool of each worker process; pre-ping and recycle drop stale connections
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DATABASE_POOL_SIZE', 5)),
+        'max_overflow': int(os.getenv('DATABASE_MAX_OVERFLOW', 10)),
+        'pool_timeout': float(os.getenv('DATABASE_POOL_TIMEOUT', 30)),
+        'pool_pre_ping': _env_flag('DATABASE_POOL_PRE_PING', True),
+        'pool_recycle': int(os.getenv('DATABASE_POOL_RECYCLE', 1800)),
+    }
+    # WAL lets readers run while a writer commits; busy_timeout (ms) bounds the wait for the write lock.
+    # mmap_size is in bytes, a negative cache_size is in KiB.
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64 * 1024)),
+    }
+
 config = {
     'development': DevelopmentConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
\ No newline at end of file
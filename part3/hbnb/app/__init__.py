@@ -2,13 +2,21 @@
 
 from flask import Flask
 from flask_restx import Api
-from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
+from hbnb.app.passwords import PasswordHasher
+from hbnb.app.instrumentation import QueryInspector
+from hbnb.app.metrics import Metrics
+from hbnb.app.persistence.engine import EngineTuning
+from hbnb.app.compression import ResponseCompression
 
-bcrypt = Bcrypt()
 jwt = JWTManager()
 db = SQLAlchemy()
+password_hasher = PasswordHasher()
+query_inspector = QueryInspector()
+metrics = Metrics()
+engine_tuning = EngineTuning()
+response_compression = ResponseCompression()
 
 from hbnb.app.api.v1.users import api as users_ns
 from hbnb.app.api.v1.amenities import api as amenities_ns
@@ -16,15 +24,25 @@ from hbnb.app.api.v1.places import api as places_ns
 from hbnb.app.api.v1.reviews import api as reviews_ns
 from hbnb.app.api.v1.auth import api as auth_ns
 from hbnb.app.api.v1.admin import api as admin_ns
+from hbnb.app.api.v1.encoding import output_json
+from hbnb.app.commands import index_cli, data_cli, bench_cli
+from hbnb.app.services import facade
 
 
 def create_app(config_class="config.DevelopmentConfig"):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
-    bcrypt.init_app(app)
+    password_hasher.init_app(app)
     jwt.init_app(app)
     db.init_app(app)
+    engine_tuning.init_app(app)
+    query_inspector.init_app(app)
+    metrics.init_app(app)
+    # after_request hooks run in reverse order: compression follows the facade's
+    # commit, and its time still counts in the request metrics
+    response_compression.init_app(app)
+    facade.init_app(app)
 
     authorizations = {
         "BearerAuth": {
@@ -42,6 +60,8 @@ def create_app(config_class="config.DevelopmentConfig"):
         authorizations=authorizations,
         security="BearerAuth",
     )
+    # orjson when installed, instead of flask-restx's stdlib encoder
+    api.representations['application/json'] = output_json
 
     # Register the users namespace
     api.add_namespace(users_ns, path='/api/v1/users')
@@ -51,4 +71,8 @@ def create_app(config_class="config.DevelopmentConfig"):
     api.add_namespace(auth_ns, path='/api/v1/auth')
     api.add_namespace(admin_ns, path='/api/v1/admin')
 
+    app.cli.add_command(index_cli)
+    app.cli.add_command(data_cli)
+    app.cli.add_command(bench_cli)
+
     return app
\ No newline at end of file
@@ -1,9 +1,13 @@
 #!/usr/bin/python3
 
-from flask import request
-from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Response, current_app, request, stream_with_context
+from flask_restx import Namespace, Resource, fields, reqparse
+from flask_jwt_extended import jwt_required
+from hbnb.app import engine_tuning, query_inspector
 from hbnb.app.services import facade
+from hbnb.app.services.bulk_export import EXPORT_ENTITIES, csv_chunks, ndjson_chunks
+from hbnb.app.services.bulk_import import parse_datetime
+from hbnb.app.api.v1.principal import current_principal
 
 api = Namespace('admin', description='Admin operations')
 
@@ -27,8 +31,8 @@ class AdminUserCreate(Resource):
     @api.response(400, 'Email already registered')
     @api.response(403, 'Admin privileges required')
     def post(self):
-        current_user = get_jwt_identity()
-        if not current_user.get('is_admin'):
+        principal = current_principal()
+        if not principal or not principal.is_admin:
             return {'error': 'Admin privileges required'}, 403
 
         user_data = request.json
@@ -44,16 +48,88 @@ class AdminUserCreate(Resource):
             'id': new_user.id,
             'message': 'User created successfully' }, 201
 
+@api.route('/users/bulk')
+class AdminUserBulkCreate(Resource):
+    @jwt_required()
+    @api.expect([user_model], validate=True)
+    @api.response(201, 'Users created successfully')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    def post(self):
+        """Create several users in one request, hashing passwords in parallel"""
+        principal = current_principal()
+        if not principal or not principal.is_admin:
+            return {'error': 'Admin privileges required'}, 403
+
+        try:
+            new_users = facade.create_users(request.json)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return {
+            'ids': [user.id for user in new_users],
+            'message': 'Users created successfully' }, 201
+
+@api.route('/import')
+class AdminImport(Resource):
+    @jwt_required()
+    @api.response(200, 'Import finished, see the report for rejected lines')
+    @api.response(403, 'Admin privileges required')
+    def post(self):
+        """Bulk-load users, amenities, places and reviews from an NDJSON request body"""
+        principal = current_principal()
+        if not principal or not principal.is_admin:
+            return {'error': 'Admin privileges required'}, 403
+
+        # Read line by line so the body is never held in memory
+        report = facade.import_records(request.stream, current_app.config['IMPORT_CHUNK_SIZE'])
+        return report, 200
+
+# Query string arguments of the export endpoint
+export_parser = reqparse.RequestParser()
+export_parser.add_argument('format', type=str, location='args', choices=('ndjson', 'csv'), default='ndjson',
+                           help='Output format')
+export_parser.add_argument('since', type=str, location='args',
+                           help='Only rows updated at or after this ISO 8601 timestamp')
+
+@api.route('/export/<entity>')
+class AdminExport(Resource):
+    @jwt_required()
+    @api.expect(export_parser)
+    @api.response(200, 'Rows streamed as NDJSON or CSV')
+    @api.response(400, 'Invalid since timestamp')
+    @api.response(403, 'Admin privileges required')
+    @api.response(404, 'Unknown entity')
+    def get(self, entity):
+        """Stream every users, amenities, places or reviews row without loading the table in memory"""
+        principal = current_principal()
+        if not principal or not principal.is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        if entity not in EXPORT_ENTITIES:
+            return {'error': 'Unknown entity'}, 404
+
+        args = export_parser.parse_args()
+        try:
+            since = parse_datetime(args['since']) if args['since'] else None
+        except ValueError:
+            return {'error': 'since must be an ISO 8601 timestamp'}, 400
+
+        records = facade.export_records(entity, since)
+        if args['format'] == 'csv':
+            chunks, mimetype = csv_chunks(records), 'text/csv'
+        else:
+            chunks, mimetype = ndjson_chunks(records), 'application/x-ndjson'
+        return Response(stream_with_context(chunks), mimetype=mimetype, headers={
+            'Content-Disposition': f'attachment; filename={entity}.{args["format"]}'})
+
 @api.route('/users/<user_id>')
 class AdminUserResource(Resource):
     @jwt_required()
     @api.response(200, 'User updated successfully')
+    @api.response(400, 'Invalid input data')
     @api.response(404, 'User not found')
     def put(self, user_id):
-        current_user = get_jwt_identity()
-
-        # If 'is_admin' is part of the identity payload
-        if not current_user.get('is_admin'):
+        principal = current_principal()
+        if not principal or not principal.is_admin:
             return {'error': 'Admin privileges required'}, 403
 
         data = request.json
@@ -66,7 +142,10 @@ class AdminUserResource(Resource):
                 return {'error': 'Email is already in use'}, 400
 
         # Logic to update user details
-        user = facade.update_user(user_id, data)
+        try:
+            user = facade.update_user(user_id, data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         if not user:
             return {'error': 'User not found'}, 404
         return {
@@ -85,8 +164,8 @@ class AdminAmenityCreate(Resource):
     @api.response(400, 'Invalid input data')
     @api.response(403, 'Admin privileges required')
     def post(self):
-        current_user = get_jwt_identity()
-        if not current_user.get('is_admin'):
+        principal = current_principal()
+        if not principal or not principal.is_admin:
             return {'error': 'Admin privileges required'}, 403
 
         # Logic to create a new amenity
@@ -102,8 +181,8 @@ class AdminAmenityModify(Resource):
     @api.response(200, 'Amenity updated successfully')
     @api.response(403, 'Admin privileges required')
     def put(self, amenity_id):
-        current_user = get_jwt_identity()
-        if not current_user.get('is_admin'):
+        principal = current_principal()
+        if not principal or not principal.is_admin:
             return {'error': 'Admin privileges required'}, 403
 
         # Logic to update an amenity
@@ -126,18 +205,79 @@ class AdminPlaceModify(Resource):
     @api.response(403, 'Unauthorized action')
     @api.response(404, 'Place not found')
     def put(self, place_id):
-        current_user = get_jwt_identity()
-
-        # Set is_admin default to False if not exists
-        is_admin = current_user.get('is_admin', False)
-        user_id = current_user.get('id')
-
-        place = facade.get_place(place_id)
-        if not is_admin and place.owner_id != user_id:
+        # Ownership comes from the cached principal, no need to load the place
+        principal = current_principal()
+        if not principal or (not principal.is_admin and place_id not in principal.place_ids):
             return {'error': 'Unauthorized action'}, 403
 
         # Logic to update the place
         updated_place = facade.update_place(place_id, request.json)
         if not updated_place:
             return {'error': 'Place not found'}, 404
-        return {'message': 'Place updated successfully'}, 200
\ No newline at end of file
+        return {'message': 'Place updated successfully'}, 200
+
+@api.route('/response-cache')
+class AdminResponseCache(Resource):
+    @jwt_required()
+    @api.response(200, 'Response cache statistics')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Hit ratio of this worker, entries and memory use of the response cache"""
+        principal = current_principal()
+        if not principal or not principal.is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        return dict(facade.responses.stats(), **facade.bus.stats()), 200
+
+    @jwt_required()
+    @api.response(204, 'Response cache cleared')
+    @api.response(403, 'Admin privileges required')
+    def delete(self):
+        principal = current_principal()
+        if not principal or not principal.is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        facade.clear_caches()
+        return '', 204
+
+@api.route('/db-stats')
+class AdminDatabaseStats(Resource):
+    @jwt_required()
+    @api.response(200, 'Per-endpoint SQL statistics')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Query counts, database time and slowest statements per endpoint"""
+        principal = current_principal()
+        if not principal or not principal.is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        return query_inspector.snapshot(), 200
+
+    @jwt_required()
+    @api.response(204, 'Statistics reset')
+    @api.response(403, 'Admin privileges required')
+    def delete(self):
+        principal = current_principal()
+        if not principal or not principal.is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        query_inspector.reset()
+        return '', 204
+
+@api.route('/db-pool')
+class AdminDatabasePool(Resource):
+    @jwt_required()
+    @api.response(200, 'Connection pool statistics per engine')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Pool size, checkouts, peak concurrency and connection hold times of this worker"""
+        principal = current_principal()
+        if not principal or not principal.is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        return engine_tuning.snapshot(), 200
+
+    @jwt_required()
+    @api.response(204, 'Statistics reset')
+    @api.response(403, 'Admin privileges required')
+    def delete(self):
+        principal = current_principal()
+        if not principal or not principal.is_admin:
+            return {'error': 'Admin privileges required'}, 403
+        engine_tuning.reset()
+        return '', 204
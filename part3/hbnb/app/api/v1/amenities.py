@@ -2,6 +2,10 @@
 
 from flask_restx import Namespace, Resource, fields
 from hbnb.app.services import facade
+from hbnb.app.api.v1.pagination import pagination_parser, parse_page_args, parse_ids_arg, page_response, ids_response
+from hbnb.app.api.v1.caching import cached_response, response_tags
+from hbnb.app.api.v1.conditional import entity_validators, collection_validators, is_not_modified, not_modified, validator_headers
+from hbnb.app.api.v1.fieldsets import compile_serializer
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -10,6 +14,12 @@ amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description='Name of the amenity')
 })
 
+amenity_output_model = api.model('AmenityOutput', {
+    'id': fields.String(description='Amenity ID'),
+    'name': fields.String(description='Name of the amenity')
+})
+serialize_amenity = compile_serializer(amenity_output_model, list(amenity_output_model))
+
 @api.route('/')
 class AmenityList(Resource):
     @api.expect(amenity_model)
@@ -29,15 +39,29 @@ class AmenityList(Resource):
             'name': new_amenity.name
         }, 201
 
+    @api.expect(pagination_parser)
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(400, 'Invalid cursor or ids')
+    @cached_response
     def get(self):
-        """Retrieve a list of all amenities"""
-        # Placeholder for logic to return a list of all amenities
-        amenities = facade.get_all_amenities()
-        return [{
-            'id': amenity.id,
-            'name': amenity.name
-        } for amenity in amenities], 200
+        """Retrieve a page of amenities, or the amenities listed in ?ids="""
+        validators = collection_validators('amenities', facade.get_table_versions('amenities'))
+        if is_not_modified(*validators):
+            return not_modified(*validators)
+        limit, cursor = parse_page_args()
+        try:
+            ids = parse_ids_arg()
+            if ids is not None:
+                amenities, next_cursor = facade.get_amenities_by_ids(ids), None
+            else:
+                amenities, next_cursor = facade.get_amenities_page(limit, cursor)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        response_tags('amenities', *(f'amenity:{amenity.id}' for amenity in amenities))
+        items = [serialize_amenity(amenity) for amenity in amenities]
+        if ids is not None:
+            return ids_response(items, ids), 200, validator_headers(*validators)
+        return page_response(items, next_cursor, facade.count_amenities()), 200, validator_headers(*validators)
 
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
@@ -45,14 +69,17 @@ class AmenityResource(Resource):
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """Get amenity details by ID"""
-        # Placeholder for the logic to retrieve an amenity by ID
+        updated_at = facade.get_amenity_updated_at(amenity_id)
+        if updated_at is None:
+            return {'error': 'Amenity not found'}, 404
+        validators = entity_validators('amenity', amenity_id, updated_at)
+        if is_not_modified(*validators):
+            return not_modified(*validators)
+
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
-        return {
-            'id': amenity_id,
-            'name': amenity.name
-            }, 200
+        return serialize_amenity(amenity), 200, validator_headers(*validators)
 
     @api.expect(amenity_model)
     @api.response(200, 'Amenity updated successfully')
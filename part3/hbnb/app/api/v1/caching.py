@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+
+from functools import wraps
+from urllib.parse import urlencode
+from flask import Response, g, request
+from flask_restx.utils import unpack
+from werkzeug.http import parse_date, unquote_etag
+from hbnb.app.services import facade
+from hbnb.app.services.response_cache import CachedResponse
+from hbnb.app.api.v1.conditional import is_not_modified, not_modified
+
+
+def response_key():
+    """Cache key for the current request: its path and sorted query string"""
+    return f"{request.path}?{urlencode(sorted(request.args.items(multi=True)))}"
+
+
+def response_tags(*tags):
+    """Tag the response being built, so writes to those entities invalidate it"""
+    if 'response_tags' in g:
+        g.response_tags.update(tags)
+
+
+def uncacheable():
+    """Keep the response being built out of the cache"""
+    g.pop('response_tags', None)
+
+
+def cached_response(func):
+    """Serve a GET handler's 200 responses from facade.responses.
+
+    The handler names what its response depends on with response_tags().
+    A response is not stored if one of its tags was invalidated while it was
+    being built: the write behind that invalidation may have landed after
+    the handler read the data.
+    """
+    @wraps(func)
+    def wrapper(resource, *args, **kwargs):
+        cache = facade.responses
+        if not cache.enabled:
+            return func(resource, *args, **kwargs)
+
+        key = response_key()
+        cached = cache.get(key)
+        if cached is not None:
+            headers = dict(cached.headers)
+            if 'ETag' in headers:
+                etag, _ = unquote_etag(headers['ETag'])
+                last_modified = parse_date(headers.get('Last-Modified'))
+                if is_not_modified(etag, last_modified):
+                    return not_modified(etag, last_modified)
+            response = Response(cached.body, cached.status, cached.headers)
+            response.headers['X-Cache'] = 'HIT'
+            return response
+
+        generation = cache.generation()
+        g.response_tags = set()
+        data, status, headers = unpack(func(resource, *args, **kwargs))
+        if status != 200 or 'response_tags' not in g:
+            return data, status, headers
+        response = resource.api.make_response(data, status, headers=headers)
+        cache.set(key, CachedResponse(response.get_data(), status, list(response.headers)), g.response_tags,
+                  generation)
+        response.headers['X-Cache'] = 'MISS'
+        return response
+    return wrapper
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+
+import hashlib
+from datetime import timezone
+from flask import request
+from werkzeug.http import http_date, quote_etag
+
+
+def _etag(*parts):
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _latest(*timestamps):
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(timestamps) if timestamps else None
+
+
+def entity_validators(kind, obj_id, updated_at, versions=None):
+    """Return (etag, last_modified) for one entity, varying with the query string (?fields=, ?include=).
+
+    versions, from facade.get_table_versions(), lists the other tables the
+    response embeds data from (e.g. the owner of a place).
+    """
+    versions = versions or {}
+    args = sorted(request.args.items(multi=True))
+    etag = _etag(kind, obj_id, updated_at.isoformat(), sorted(versions.items()), args)
+    return etag, _latest(updated_at, *(changed for _, changed in versions.values()))
+
+
+def collection_validators(kind, versions):
+    """Return (etag, last_modified) for a list endpoint, varying with its query string"""
+    args = sorted(request.args.items(multi=True))
+    etag = _etag(kind, sorted(versions.items()), args)
+    return etag, _latest(*(changed for _, changed in versions.values()))
+
+
+def is_not_modified(etag, last_modified=None):
+    """Whether the client's cached copy is current (If-None-Match wins over If-Modified-Since)"""
+    if request.if_none_match:
+        # Weak comparison: compressed responses carry the ETag as W/"..."
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since:
+        return last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    return False
+
+
+def validator_headers(etag, last_modified=None):
+    """ETag/Last-Modified headers; clients must revalidate before reusing a response"""
+    headers = {'ETag': quote_etag(etag), 'Cache-Control': 'no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified.replace(tzinfo=timezone.utc))
+    return headers
+
+
+def not_modified(etag, last_modified=None):
+    """Empty 304 response carrying the current validators"""
+    return '', 304, validator_headers(etag, last_modified)
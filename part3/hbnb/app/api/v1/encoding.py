@@ -0,0 +1,32 @@
+#!/usr/bin/python3
+
+import json
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:  # Optional: responses are encoded with the stdlib json module instead
+    orjson = None
+
+
+def stdlib_dumps(data, indent=False):
+    """Encode data as UTF-8 JSON bytes, ending with a newline, with the json module"""
+    return (json.dumps(data, indent=4 if indent else None) + '\n').encode('utf-8')
+
+
+def orjson_dumps(data, indent=False):
+    """Encode data as UTF-8 JSON bytes, ending with a newline, with orjson"""
+    option = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, option=option)
+
+
+dumps = orjson_dumps if orjson is not None else stdlib_dumps
+
+
+def output_json(data, code, headers=None):
+    """flask-restx representation for application/json, encoded with dumps()"""
+    response = make_response(dumps(data, indent=current_app.debug), code)
+    response.headers.extend(headers or {})
+    return response
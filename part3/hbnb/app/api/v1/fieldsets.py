@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+
+from collections import namedtuple
+from flask_restx import fields, reqparse
+from hbnb.app.persistence.repository import Projection
+
+# Query string arguments shared by endpoints with sparse fieldsets
+fieldset_parser = reqparse.RequestParser()
+fieldset_parser.add_argument('fields', type=str, location='args',
+                             help='Comma-separated fields to return, e.g. id,title,price')
+fieldset_parser.add_argument('include', type=str, location='args',
+                             help='Comma-separated related entities to embed, e.g. owner,amenities')
+
+# Field and include names requested for one response
+Fieldset = namedtuple('Fieldset', ['fields', 'include'])
+
+
+def with_fieldset_args(parser):
+    """Copy of a request parser, such as pagination_parser, that also takes ?fields= and ?include="""
+    parser = parser.copy()
+    for argument in fieldset_parser.args:
+        parser.add_argument(argument)
+    return parser
+
+
+def _names(value):
+    return list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+
+
+def _identifier(name):
+    if not name.isidentifier():
+        raise ValueError(f"Cannot compile a serializer for field {name!r}")
+    return name
+
+
+def _compile_nested(namespace, model):
+    """Compile a serializer for every field of a nested model into namespace, returning its name"""
+    helper = f"_nested{len(namespace)}"
+    namespace[helper] = compile_serializer(model, list(model))
+    return helper
+
+
+def compile_serializer(model, names, computed=()):
+    """Build one flat function returning {name: value} for the given fields of an api.model.
+
+    Plain fields read obj.<attribute> directly, Nested and List(Nested)
+    fields call serializers compiled for their own model, and computed
+    fields become keyword arguments. The generated function replaces
+    flask-restx marshalling, which walks the model field by field for
+    every object.
+    """
+    namespace = {}
+    items = []
+    for name in names:
+        if name in computed:
+            items.append(f"{name!r}: {_identifier(name)}")
+            continue
+        field = model[name]
+        source = f"obj.{_identifier(field.attribute or name)}"
+        if isinstance(field, fields.List) and isinstance(field.container, fields.Nested):
+            helper = _compile_nested(namespace, field.container.nested)
+            items.append(f"{name!r}: [{helper}(item) for item in {source}]")
+        elif isinstance(field, fields.Nested):
+            helper = _compile_nested(namespace, field.nested)
+            items.append(f"{name!r}: None if {source} is None else {helper}({source})")
+        else:
+            items.append(f"{name!r}: {source}")
+    params = ''.join(f", {name}=None" for name in computed)
+    code = f"def serialize(obj{params}):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(code, f"<serializer {model.name}>", 'exec'), namespace)
+    return namespace['serialize']
+
+
+class ResourceFields:
+    """The fields and embedded entities one resource type can return, read from its response model.
+
+    Every field of the api.model reads the model attribute of the same name
+    (or its attribute=). Names listed in computed are values the handler
+    passes to the serializer; names listed in includes are Nested fields
+    embedding related entities, which the repository batch-loads under the
+    same name.
+    """
+
+    def __init__(self, model, includes=(), computed=()):
+        self.model = model
+        self.includes = tuple(includes)
+        self.computed = tuple(computed)
+        # Field name -> model attribute, None for computed fields
+        self.attributes = {name: None if name in self.computed else field.attribute or name
+                           for name, field in model.items() if name not in self.includes}
+        self._serializers = {}
+
+    def parse(self, default, default_include=()):
+        """Return the Fieldset asked for with ?fields= and ?include=, defaulting to the given names.
+
+        Fields come back in the order of the model, so a response looks the
+        same however the client orders ?fields=.
+        """
+        args = fieldset_parser.parse_args()
+        requested = _names(args['fields']) if args['fields'] is not None else list(default)
+        unknown = [name for name in requested if name not in self.attributes]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        requested = set(requested) | {'id'}
+        include = _names(args['include']) if args['include'] is not None else list(default_include)
+        unknown = [name for name in include if name not in self.includes]
+        if unknown:
+            raise ValueError(f"Unknown include: {', '.join(unknown)}")
+        return Fieldset([name for name in self.attributes if name in requested],
+                        [name for name in self.includes if name in include])
+
+    def projection(self, fieldset):
+        """Repository load profile reading only the columns behind the requested fields"""
+        columns = (self.attributes[name] for name in fieldset.fields)
+        return Projection(tuple(column for column in columns if column), tuple(fieldset.include))
+
+    def serializer(self, fieldset):
+        """The compiled function serializing objects to a fieldset; computed fields are keyword arguments"""
+        key = (tuple(fieldset.fields), tuple(fieldset.include))
+        serialize = self._serializers.get(key)
+        if serialize is None:
+            # Fieldsets are subsets in model order, so there are at most 2**n of them
+            serialize = compile_serializer(self.model, key[0] + key[1], self.computed)
+            self._serializers[key] = serialize
+        return serialize
+
+    def dump(self, obj, fieldset, **computed):
+        """Serialize one object to a fieldset"""
+        return self.serializer(fieldset)(obj, **computed)
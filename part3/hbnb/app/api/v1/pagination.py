@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+
+import base64
+from flask import current_app
+from flask_restx import reqparse
+
+# Query string arguments shared by every paginated list endpoint
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument('limit', type=int, location='args',
+                               help='Maximum number of items to return')
+pagination_parser.add_argument('cursor', type=str, location='args',
+                               help='Value of next_cursor from the previous page')
+pagination_parser.add_argument('ids', type=str, location='args',
+                               help='Comma-separated ids to fetch in one request instead of a page')
+
+
+def clamp_limit(limit):
+    """Apply the configured default and maximum page size to a requested limit"""
+    limit = limit or current_app.config['PAGE_SIZE_DEFAULT']
+    return max(1, min(limit, current_app.config['PAGE_SIZE_MAX']))
+
+
+def parse_page_args():
+    """Return (limit, cursor) from the query string"""
+    args = pagination_parser.parse_args()
+    return clamp_limit(args.get('limit')), args.get('cursor')
+
+
+def parse_ids_arg():
+    """Return the list of ids requested with ?ids=, or None for a normal page"""
+    value = pagination_parser.parse_args().get('ids')
+    if value is None:
+        return None
+    ids = [obj_id for obj_id in value.split(',') if obj_id]
+    if len(ids) > current_app.config['PAGE_SIZE_MAX']:
+        raise ValueError(f"At most {current_app.config['PAGE_SIZE_MAX']} ids can be requested")
+    return ids
+
+
+def encode_offset(offset):
+    """Opaque cursor for endpoints paginated by position, such as ranked search results"""
+    return base64.urlsafe_b64encode(f"offset|{offset}".encode('ascii')).decode('ascii')
+
+
+def decode_offset(cursor):
+    """Decode a cursor from encode_offset(); no cursor means the first page"""
+    if not cursor:
+        return 0
+    try:
+        label, offset = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('ascii').split('|')
+        if label != 'offset' or int(offset) < 0:
+            raise ValueError
+        return int(offset)
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def ids_response(items, ids):
+    """Build the envelope returned for ?ids= requests, listing ids that were not found"""
+    found = {item['id'] for item in items}
+    return {
+        'items': items,
+        'missing': [obj_id for obj_id in dict.fromkeys(ids) if obj_id not in found]
+    }
+
+
+def page_response(items, next_cursor, total):
+    """Build the envelope returned by paginated list endpoints"""
+    return {
+        'items': items,
+        'next_cursor': next_cursor,
+        'total': total
+    }
@@ -1,8 +1,13 @@
 #!/usr/bin/python3
 
-from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_restx import Namespace, Resource, fields, reqparse
+from flask_jwt_extended import jwt_required
 from hbnb.app.services import facade
+from hbnb.app.api.v1.principal import current_principal
+from hbnb.app.api.v1.pagination import pagination_parser, parse_page_args, parse_ids_arg, page_response, ids_response, clamp_limit, encode_offset, decode_offset
+from hbnb.app.api.v1.caching import cached_response, response_tags, uncacheable
+from hbnb.app.api.v1.conditional import entity_validators, collection_validators, is_not_modified, not_modified, validator_headers
+from hbnb.app.api.v1.fieldsets import ResourceFields, with_fieldset_args, fieldset_parser
 
 api = Namespace('places', description='Place operations')
 
@@ -39,6 +44,86 @@ place_model = api.model('Place', {
     'reviews': fields.List(fields.Nested(review_model), description="List of reviews")
 })
 
+rating_model = api.model('PlaceRatingSummary', {
+    'review_count': fields.Integer(description='Number of reviews'),
+    'average': fields.Float(description='Average rating, null without reviews'),
+    'histogram': fields.Raw(description='Number of reviews per star rating (detail only)')
+})
+
+# Everything a place response can carry: ?fields= picks among the plain
+# fields ('rating' is computed from the rating summaries) and ?include= embeds
+# the related entities
+place_output_model = api.model('PlaceOutput', {
+    'id': fields.String(description='Place ID'),
+    'title': fields.String(description='Title of the place'),
+    'description': fields.String(description='Description of the place'),
+    'price': fields.Float(description='Price per night'),
+    'latitude': fields.Float(description='Latitude of the place'),
+    'longitude': fields.Float(description='Longitude of the place'),
+    'owner_id': fields.String(attribute='user_id', description='ID of the owner'),
+    'rating': fields.Nested(rating_model, description='Rating summary'),
+    'owner': fields.Nested(user_model, description='Owner, with ?include=owner'),
+    'amenities': fields.List(fields.Nested(amenity_model), description='Amenities, with ?include=amenities'),
+    'reviews': fields.List(fields.Nested(review_model), description='Reviews, with ?include=reviews')
+})
+place_fields = ResourceFields(place_output_model, includes=('owner', 'amenities', 'reviews'), computed=('rating',))
+PLACE_LIST_FIELDS = ('id', 'title', 'price', 'latitude', 'longitude', 'rating')
+PLACE_FIELDS = ('id', 'title', 'description', 'price', 'latitude', 'longitude', 'rating')
+PLACE_INCLUDE = ('owner', 'amenities')
+
+# Tables an included entity is read from, for the ETag
+INCLUDE_TABLES = {'owner': 'users', 'amenities': 'amenities', 'reviews': 'reviews'}
+
+
+def fieldset_tables(fieldset, *tables):
+    """The tables a place response reads: the given ones plus those behind its rating and includes"""
+    if 'rating' in fieldset.fields:
+        tables += ('reviews',)
+    tables += tuple(INCLUDE_TABLES[name] for name in fieldset.include)
+    return tuple(dict.fromkeys(tables))
+
+
+def include_tags(places, fieldset):
+    """Tag a response with the entities embedded through ?include="""
+    if 'owner' in fieldset.include:
+        response_tags(*(f'user:{place.user_id}' for place in places))
+    if 'amenities' in fieldset.include:
+        response_tags(*(f'amenity:{amenity.id}' for place in places for amenity in place.amenities))
+    # Review writes already invalidate place:<id>
+
+
+# List arguments: pagination, fieldsets, and the price and amenity filters
+place_list_parser = with_fieldset_args(pagination_parser)
+place_list_parser.add_argument('min_price', type=float, location='args', help='Lowest price per night')
+place_list_parser.add_argument('max_price', type=float, location='args', help='Highest price per night')
+place_list_parser.add_argument('amenities', type=str, location='args',
+                               help='Comma-separated amenity ids the places must all have')
+
+
+def parse_place_filters():
+    """Return (min_price, max_price, amenity_ids), or None when the list is not filtered"""
+    args = place_list_parser.parse_args()
+    if args['min_price'] is None and args['max_price'] is None and args['amenities'] is None:
+        return None
+    if any(price is not None and price < 0 for price in (args['min_price'], args['max_price'])):
+        raise ValueError("Prices must be non-negative")
+    if None not in (args['min_price'], args['max_price']) and args['min_price'] > args['max_price']:
+        raise ValueError("min_price must not exceed max_price")
+    amenity_ids = list(dict.fromkeys(
+        amenity_id for amenity_id in (args['amenities'] or '').split(',') if amenity_id))
+    return args['min_price'], args['max_price'], amenity_ids
+
+
+def rating_summary(summary, with_histogram=False):
+    """Serialize a PlaceRating (or its absence) for place responses"""
+    rating = {
+        'review_count': summary.review_count if summary else 0,
+        'average': summary.average if summary else None
+    }
+    if with_histogram:
+        rating['histogram'] = summary.histogram() if summary else {str(stars): 0 for stars in range(1, 6)}
+    return rating
+
 @api.route('/')
 class PlaceList(Resource):
     @api.expect(place_model)
@@ -49,10 +134,8 @@ class PlaceList(Resource):
     def post(self):
         """Register a new place"""
         # Placeholder for the logic to register a new place
-        current_user = get_jwt_identity()  # Retrieve the user's identity from the token
         place_data = api.payload
 
-
         try:
             new_place = facade.create_place(place_data)
             return {
@@ -67,48 +150,167 @@ class PlaceList(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
+    @api.expect(place_list_parser)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid cursor, ids, filters, fields or include')
+    @cached_response
+    def get(self):
+        """Retrieve a page of places, optionally filtered by price and amenities with facet counts, or the places listed in ?ids="""
+        try:
+            filters = parse_place_filters()
+            fieldset = place_fields.parse(PLACE_LIST_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        tables = ('places', 'amenities') if filters is not None else ('places',)
+        validators = collection_validators('places', facade.get_table_versions(*fieldset_tables(fieldset, *tables)))
+        if is_not_modified(*validators):
+            return not_modified(*validators)
+        limit, cursor = parse_page_args()
+        profile = place_fields.projection(fieldset)
+        facets, current = None, True
+        try:
+            ids = parse_ids_arg()
+            if ids is not None:
+                places, next_cursor = facade.get_places_by_ids(ids, profile=profile), None
+            elif filters is not None:
+                places, next_cursor, total, facets, current = facade.filter_places(
+                    limit, cursor, *filters, profile=profile)
+            else:
+                places, next_cursor = facade.get_places_page(limit, cursor, profile=profile)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        ratings = facade.get_place_ratings([place.id for place in places]) if 'rating' in fieldset.fields else {}
+        response_tags('places', *(f'place:{place.id}' for place in places))
+        include_tags(places, fieldset)
+        serialize = place_fields.serializer(fieldset)
+        items = [serialize(place, rating=rating_summary(ratings.get(place.id))) for place in places]
+        if ids is not None:
+            return ids_response(items, ids), 200, validator_headers(*validators)
+        if facets is not None:
+            # Which places match changes with any place's price or amenities
+            response_tags('place_facets', 'amenities', *(f'amenity:{amenity_id}' for amenity_id in facets))
+            response = page_response(items, next_cursor, total)
+            response['facets'] = {'amenities': sorted((
+                {'id': amenity_id, 'name': name, 'count': count}
+                for amenity_id, (name, count) in facets.items()
+            ), key=lambda facet: (-facet['count'], facet['name']))}
+            if not current:
+                # Matched against the facet snapshot being rebuilt: neither cache nor validate it
+                uncacheable()
+                return response, 200
+            return response, 200, validator_headers(*validators)
+        return page_response(items, next_cursor, facade.count_places()), 200, validator_headers(*validators)
+
+# Query string arguments for the keyword and geospatial searches
+search_parser = reqparse.RequestParser()
+search_parser.add_argument('q', type=str, location='args',
+                           help='Keywords to find in titles, descriptions and reviews')
+search_parser.add_argument('cursor', type=str, location='args',
+                           help='Value of next_cursor from the previous page of keyword results')
+search_parser.add_argument('lat', type=float, location='args', help='Latitude of the centre point')
+search_parser.add_argument('lon', type=float, location='args', help='Longitude of the centre point')
+search_parser.add_argument('radius_km', type=float, location='args', help='Search radius in kilometres')
+search_parser.add_argument('bbox', type=str, location='args',
+                           help='Bounding box as min_lon,min_lat,max_lon,max_lat')
+search_parser.add_argument('limit', type=int, location='args', help='Maximum number of places to return')
+
+
+def parse_bbox(value):
+    """Parse and validate a min_lon,min_lat,max_lon,max_lat bounding box"""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(','))
+    except ValueError:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+        raise ValueError("bbox coordinates are out of range")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.expect(search_parser)
+    @api.response(200, 'Places found, best match or nearest first')
+    @api.response(400, 'Invalid search parameters')
     def get(self):
-        """Retrieve a list of all places"""
-        # Placeholder for logic to return a list of all places
-        places = facade.get_all_places()
-        return [{
+        """Search places by keywords (?q=), by radius around a point or inside a bounding box"""
+        args = search_parser.parse_args()
+        limit = clamp_limit(args['limit'])
+
+        if args['q'] is not None:
+            return self.keyword_search(args['q'], limit, args['cursor'])
+        try:
+            if args['bbox']:
+                results = facade.search_places_in_bbox(*parse_bbox(args['bbox']), limit)
+            elif None not in (args['lat'], args['lon'], args['radius_km']):
+                if not (-90 <= args['lat'] <= 90 and -180 <= args['lon'] <= 180):
+                    return {'error': 'lat/lon are out of range'}, 400
+                if args['radius_km'] <= 0:
+                    return {'error': 'radius_km must be positive'}, 400
+                results = facade.search_places_near(args['lat'], args['lon'], args['radius_km'], limit)
+            else:
+                return {'error': 'Provide lat, lon and radius_km, or bbox'}, 400
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return {'items': [{
+            'id': place.id,
+            'title': place.title,
+            'price': place.price,
+            'latitude': place.latitude,
+            'longitude': place.longitude,
+            'distance_km': round(distance, 3)
+        } for place, distance in results]}, 200
+
+    def keyword_search(self, query, limit, cursor):
+        """Places matching every keyword, ranked by BM25, with a highlighted snippet"""
+        try:
+            offset = decode_offset(cursor)
+            results, total = facade.search_places_text(query, limit, offset)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        next_cursor = encode_offset(offset + limit) if offset + limit < total else None
+        return page_response([{
             'id': place.id,
             'title': place.title,
+            'price': place.price,
             'latitude': place.latitude,
             'longitude': place.longitude,
-        } for place in places], 200
+            'score': score,
+            'snippet': snippet
+        } for place, score, snippet in results], next_cursor, total), 200
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
+    @api.expect(fieldset_parser)
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(400, 'Invalid fields or include')
     @api.response(404, 'Place not found')
+    @cached_response
     def get(self, place_id):
-        """Get place details by ID"""
-        # Placeholder for the logic to retrieve a place by ID, including associated owner and amenities
-        place = facade.get_place(place_id)
+        """Get place details by ID, with its owner and amenities unless ?include= says otherwise"""
+        try:
+            fieldset = place_fields.parse(PLACE_FIELDS, PLACE_INCLUDE)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        # Validate the client's copy before loading the place with its related entities
+        updated_at = facade.get_place_updated_at(place_id)
+        if updated_at is None:
+            return {'error': 'Place not found'}, 404
+        validators = entity_validators('place', place_id, updated_at,
+                                       facade.get_table_versions(*fieldset_tables(fieldset)))
+        if is_not_modified(*validators):
+            return not_modified(*validators)
+
+        place = facade.get_place(place_id, profile=place_fields.projection(fieldset))
 
         if not place:
             return {'error': 'Place not found'}, 404
-        return {
-            'id': place.id,
-            'title': place.title,
-            'description': place.description,
-            'price': place.price,
-            'latitude': place.latitude,
-            'longitude': place.longitude,
-            'owner': {
-                'id': place.owner.id,
-                'first_name': place.owner.first_name,
-                'last_name': place.owner.last_name,
-                'email': place.owner.email
-            },
-            'amenities': [
-                {
-                    'id': place.amenity.id,
-                    'name': place.amenity.name
-                } for place.amenity in place.amenities]
-        }, 200
+        response_tags(f'place:{place.id}')
+        include_tags([place], fieldset)
+        rating = None
+        if 'rating' in fieldset.fields:
+            rating = rating_summary(facade.get_place_ratings([place.id]).get(place.id), with_histogram=True)
+        return place_fields.dump(place, fieldset, rating=rating), 200, validator_headers(*validators)
 
     @api.expect(place_model)
     @api.response(200, 'Place updated successfully')
@@ -119,13 +321,16 @@ class PlaceResource(Resource):
     def put(self, place_id):
         """Update a place's information"""
         # Placeholder for the logic to update a place by ID
-        current_user = get_jwt_identity()
+        principal = current_principal()
         place_data = api.payload
 
-        if place_data['owner_id'] != current_user:
+        if not principal or place_id not in principal.place_ids:
             return {'error': 'Unauthorized action'}, 403
 
-        updated_place = facade.update_place(place_id, place_data)
+        try:
+            updated_place = facade.update_place(place_id, place_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         if not updated_place:
             return {'error': 'Place not found'}, 404
         return {'message': 'Place updated successfully'}, 200
\ No newline at end of file
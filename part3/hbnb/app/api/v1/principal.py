@@ -0,0 +1,10 @@
+#!/usr/bin/python3
+
+from flask_jwt_extended import get_jwt_identity
+from hbnb.app.services import facade
+
+
+def current_principal():
+    """Resolve the caller of a @jwt_required() handler, or None if the user is gone"""
+    identity = get_jwt_identity()
+    return facade.get_principal(identity.get('id'))
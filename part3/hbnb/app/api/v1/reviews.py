@@ -1,8 +1,13 @@
 #!/usr/bin/python3
 
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from hbnb.app.services import facade
+from hbnb.app.api.v1.principal import current_principal
+from hbnb.app.api.v1.pagination import pagination_parser, parse_page_args, parse_ids_arg, page_response, ids_response
+from hbnb.app.api.v1.caching import cached_response, response_tags
+from hbnb.app.api.v1.conditional import entity_validators, collection_validators, is_not_modified, not_modified, validator_headers
+from hbnb.app.api.v1.fieldsets import ResourceFields, fieldset_parser, with_fieldset_args
 
 api = Namespace('reviews', description='Review operations')
 
@@ -14,6 +19,36 @@ review_model = api.model('Review', {
     'place_id': fields.String(required=True, description='ID of the place')
 })
 
+review_user_model = api.model('ReviewUser', {
+    'id': fields.String(description='User ID'),
+    'first_name': fields.String(description='First name of the author'),
+    'last_name': fields.String(description='Last name of the author')
+})
+
+review_place_model = api.model('ReviewPlace', {
+    'id': fields.String(description='Place ID'),
+    'title': fields.String(description='Title of the place')
+})
+
+# Fields selectable with ?fields=; ?include=user,place embeds the author and the place
+review_output_model = api.model('ReviewOutput', {
+    'id': fields.String(description='Review ID'),
+    'text': fields.String(description='Text of the review'),
+    'rating': fields.Integer(description='Rating of the place (1-5)'),
+    'user_id': fields.String(description='ID of the user'),
+    'place_id': fields.String(description='ID of the place'),
+    'user': fields.Nested(review_user_model, description='Author, with ?include=user'),
+    'place': fields.Nested(review_place_model, description='Reviewed place, with ?include=place')
+})
+review_fields = ResourceFields(review_output_model, includes=('user', 'place'))
+REVIEW_LIST_FIELDS = ('id', 'text', 'rating')
+REVIEW_FIELDS = ('id', 'text', 'rating', 'user_id', 'place_id')
+
+# Tables an included entity is read from, for the ETag
+INCLUDE_TABLES = {'user': 'users', 'place': 'places'}
+
+review_list_parser = with_fieldset_args(pagination_parser)
+
 @api.route('/')
 class ReviewList(Resource):
     @api.expect(review_model)
@@ -24,16 +59,19 @@ class ReviewList(Resource):
     def post(self):
         """Register a new review"""
         # Placeholder for the logic to register a new review
-        current_user = get_jwt_identity()
+        principal = current_principal()
         review_data = api.payload
 
-        if current_user == review_data['place.owner_id']:
+        # Reviews are written as the logged-in user only
+        if not principal or review_data['user_id'] != principal.id:
+            return {'error': 'Unauthorized action'}, 403
+
+        # Owned places come from the cached principal, no need to load the place
+        if review_data['place_id'] in principal.place_ids:
             return {'error': 'You cannot review your own place.'}, 400
 
-        reviews = facade.get_all_reviews(review_data['place_id'])
-        for review in reviews:
-            if review.user_id == current_user:
-                return {'error': 'You have already reviewed this place.'}, 400
+        if facade.has_reviewed(principal.id, review_data['place_id']):
+            return {'error': 'You have already reviewed this place.'}, 400
 
         try:
             new_review = facade.create_review(review_data)
@@ -48,34 +86,61 @@ class ReviewList(Resource):
             return {'error': str(e)}, 400
 
 
+    @api.expect(review_list_parser)
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid cursor, ids, fields or include')
     def get(self):
-        """Retrieve a list of all reviews"""
-        # Placeholder for logic to return a list of all reviews
-        reviews = facade.get_all_reviews()
-        return [{
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating
-        } for review in reviews], 200
+        """Retrieve a page of reviews, or the reviews listed in ?ids="""
+        try:
+            fieldset = review_fields.parse(REVIEW_LIST_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        tables = ('reviews', *(INCLUDE_TABLES[name] for name in fieldset.include))
+        validators = collection_validators('reviews', facade.get_table_versions(*tables))
+        if is_not_modified(*validators):
+            return not_modified(*validators)
+        limit, cursor = parse_page_args()
+        profile = review_fields.projection(fieldset)
+        try:
+            ids = parse_ids_arg()
+            if ids is not None:
+                reviews, next_cursor = facade.get_reviews_by_ids(ids, profile=profile), None
+            else:
+                reviews, next_cursor = facade.get_reviews_page(limit, cursor, profile=profile)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        serialize = review_fields.serializer(fieldset)
+        items = [serialize(review) for review in reviews]
+        if ids is not None:
+            return ids_response(items, ids), 200, validator_headers(*validators)
+        return page_response(items, next_cursor, facade.count_reviews()), 200, validator_headers(*validators)
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
+    @api.expect(fieldset_parser)
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(400, 'Invalid fields or include')
     @api.response(404, 'Review not found')
     def get(self, review_id):
         """Get review details by ID"""
-        # Placeholder for the logic to retrieve a review by ID
-        review = facade.get_review(review_id)
+        try:
+            fieldset = review_fields.parse(REVIEW_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        updated_at = facade.get_review_updated_at(review_id)
+        if updated_at is None:
+            return {'error': 'Review not found'}, 404
+        versions = None
+        if fieldset.include:
+            versions = facade.get_table_versions(*(INCLUDE_TABLES[name] for name in fieldset.include))
+        validators = entity_validators('review', review_id, updated_at, versions)
+        if is_not_modified(*validators):
+            return not_modified(*validators)
+
+        review = facade.get_review(review_id, profile=review_fields.projection(fieldset))
         if not review:
             return {'error': 'Review not found'}, 404
-        return {
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            'user_id': review.user.id,
-            'place_id': review.place.id
-        }, 200
+        return review_fields.dump(review, fieldset), 200, validator_headers(*validators)
 
     @api.expect(review_model)
     @api.response(200, 'Review updated successfully')
@@ -86,20 +151,25 @@ class ReviewResource(Resource):
     def put(self, review_id):
         """Update a review's information"""
         # Placeholder for the logic to update a review by ID
-        current_user = get_jwt_identity()
+        principal = current_principal()
         review_data = api.payload
 
-        if current_user != review_data['user_id']:
-            return {'error': 'Unauthorized action'}, 403
-
-        if 'place_id' not in review_data or 'user_id' not in review_data:
-            return {'error': 'Invalid input data'}, 400
-
         review = facade.get_review(review_id)
         if not review:
             return {'error': 'Review not found'}, 404
 
-        updated_review = facade.update_review(review_id, review_data)
+        if not principal or principal.id != review.user_id:
+            return {'error': 'Unauthorized action'}, 403
+
+        # A review stays with its author and its place
+        if review_data.get('user_id', review.user_id) != review.user_id \
+                or review_data.get('place_id', review.place_id) != review.place_id:
+            return {'error': 'Invalid input data'}, 400
+
+        try:
+            updated_review = facade.update_review(review_id, review_data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return {
             'text': updated_review.text,
             'rating': updated_review.rating
@@ -112,12 +182,12 @@ class ReviewResource(Resource):
     def delete(self, review_id):
         """Delete a review"""
         # Placeholder for the logic to delete a review
-        current_user = get_jwt_identity()
+        principal = current_principal()
         review = facade.get_review(review_id)
         if not review:
             return {'error': 'Review not found'}, 404
 
-        if current_user != review.user_id:
+        if not principal or principal.id != review.user_id:
             return {'error': 'Unauthorized action'}, 403
 
         facade.delete_review(review_id)
@@ -125,16 +195,28 @@ class ReviewResource(Resource):
 
 @api.route('/places/<place_id>/reviews')
 class PlaceReviewList(Resource):
+    @api.expect(fieldset_parser)
     @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(400, 'Invalid fields or include')
     @api.response(404, 'Place not found')
+    @cached_response
     def get(self, place_id):
         """Get all reviews for a specific place"""
-        # Placeholder for logic to return a list of reviews for a place
-        reviews = facade.get_reviews_by_place(place_id)
+        try:
+            fieldset = review_fields.parse(REVIEW_LIST_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        tables = ('reviews', *(INCLUDE_TABLES[name] for name in fieldset.include))
+        validators = collection_validators(('place_reviews', place_id), facade.get_table_versions(*tables))
+        if is_not_modified(*validators):
+            return not_modified(*validators)
+        reviews = facade.get_reviews_by_place(place_id, profile=review_fields.projection(fieldset))
         if not reviews:
             return {'error': 'Place not found'}, 404
-        return [{
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating
-        } for review in reviews], 200
\ No newline at end of file
+        response_tags(f'place_reviews:{place_id}')
+        if 'user' in fieldset.include:
+            response_tags(*(f'user:{review.user_id}' for review in reviews))
+        if 'place' in fieldset.include:
+            response_tags(f'place:{place_id}')
+        serialize = review_fields.serializer(fieldset)
+        return [serialize(review) for review in reviews], 200, validator_headers(*validators)
\ No newline at end of file
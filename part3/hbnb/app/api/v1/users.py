@@ -3,6 +3,9 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from hbnb.app.services import facade
+from hbnb.app.api.v1.pagination import pagination_parser, parse_page_args, parse_ids_arg, page_response, ids_response
+from hbnb.app.api.v1.conditional import entity_validators, collection_validators, is_not_modified, not_modified, validator_headers
+from hbnb.app.api.v1.fieldsets import ResourceFields, fieldset_parser, with_fieldset_args
 
 api = Namespace('users', description='User operations')
 
@@ -14,6 +17,24 @@ user_model = api.model('User', {
     'password': fields.String(required=True, description='Password of the user'),
 })
 
+user_place_model = api.model('UserPlace', {
+    'id': fields.String(description='Place ID'),
+    'title': fields.String(description='Title of the place')
+})
+
+# Fields selectable with ?fields=; ?include=places embeds the places a user owns
+user_output_model = api.model('UserOutput', {
+    'id': fields.String(description='User ID'),
+    'first_name': fields.String(description='First name of the user'),
+    'last_name': fields.String(description='Last name of the user'),
+    'email': fields.String(description='Email of the user'),
+    'places': fields.List(fields.Nested(user_place_model), description='Owned places, with ?include=places')
+})
+user_fields = ResourceFields(user_output_model, includes=('places',))
+USER_FIELDS = ('id', 'first_name', 'last_name', 'email')
+
+user_list_parser = with_fieldset_args(pagination_parser)
+
 @api.route('/')
 class UserList(Resource):
     @api.expect(user_model, validate=True)
@@ -39,32 +60,60 @@ class UserList(Resource):
             return {'error': str(e)}, 400
 
 
-    @api.response(200, 'Get all users')
+    @api.expect(user_list_parser)
+    @api.response(200, 'Get a page of users')
+    @api.response(400, 'Invalid cursor, ids, fields or include')
     def get(self):
-        """Get all users"""
-        users = facade.get_all_users()
-        return [{
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email,
-        }for user in users], 200
+        """Get a page of users, or the users listed in ?ids="""
+        try:
+            fieldset = user_fields.parse(USER_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        tables = ('users', 'places') if 'places' in fieldset.include else ('users',)
+        validators = collection_validators('users', facade.get_table_versions(*tables))
+        if is_not_modified(*validators):
+            return not_modified(*validators)
+        limit, cursor = parse_page_args()
+        profile = user_fields.projection(fieldset)
+        try:
+            ids = parse_ids_arg()
+            if ids is not None:
+                users, next_cursor = facade.get_users_by_ids(ids, profile), None
+            else:
+                users, next_cursor = facade.get_users_page(limit, cursor, profile)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        serialize = user_fields.serializer(fieldset)
+        items = [serialize(user) for user in users]
+        if ids is not None:
+            return ids_response(items, ids), 200, validator_headers(*validators)
+        return page_response(items, next_cursor, facade.count_users()), 200, validator_headers(*validators)
 
 # User retrieval by ID
 @api.route('/<user_id>')
 class UserResource(Resource):
+    @api.expect(fieldset_parser)
     @api.response(200, 'User details retrieved successfully')
+    @api.response(400, 'Invalid fields or include')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """Get user details by ID"""
-        user = facade.get_user(user_id)
+        try:
+            fieldset = user_fields.parse(USER_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        updated_at = facade.get_user_updated_at(user_id)
+        if updated_at is None:
+            return {'error': 'User not found'}, 404
+        versions = facade.get_table_versions('places') if 'places' in fieldset.include else None
+        validators = entity_validators('user', user_id, updated_at, versions)
+        if is_not_modified(*validators):
+            return not_modified(*validators)
+
+        user = facade.get_user(user_id, profile=user_fields.projection(fieldset))
         if not user:
             return {'error': 'User not found'}, 404
-        return {'id': user.id,
-                'first_name': user.first_name,
-                'last_name': user.last_name,
-                'email': user.email,
-                }, 200
+        return user_fields.dump(user, fieldset), 200, validator_headers(*validators)
 
     @api.expect(user_model, validate=True)
     @api.response(200, 'User details updated successfully')
@@ -91,7 +140,8 @@ class UserResource(Resource):
             'last_name': user_data.get('last_name')
         }
 
-        user.update(allowed_updates)
+        # Through the facade, so the change is committed and the users version bumped
+        user = facade.update_user(user_id, allowed_updates)
         return {
             'id': user.id,
             'first_name': user.first_name,
@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+
+from a2wsgi import WSGIMiddleware
+
+
+class HBnBASGI:
+    """ASGI application serving the Flask namespaces unchanged.
+
+    The ASGI server's event loop owns the sockets, so idle keep-alive
+    connections and clients slow to read a response hold no thread. Every
+    API request still runs as a Flask view on a pool of ASGI_THREADS
+    threads, so at most ASGI_THREADS requests per worker process are
+    handled at once, as under a threaded WSGI server. Keep the database
+    pool (DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW) at least that large.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.wsgi = WSGIMiddleware(app, workers=app.config.get('ASGI_THREADS', 10))
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+        else:
+            await self.wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from flask_restx import marshal
+from hbnb.app.services import facade
+from hbnb.app.persistence.repository import Projection
+from hbnb.app.services.bulk_export import EXPORT_ENTITIES, csv_chunks, ndjson_chunks
+from hbnb.app.services.bulk_import import parse_datetime
+
+index_cli = AppGroup('index', help='Maintain derived indexes')
+data_cli = AppGroup('data', help='Import and export data')
+bench_cli = AppGroup('bench', help='Measure hot paths against the configured database')
+
+
+@index_cli.command('rebuild-geo')
+def rebuild_geo():
+    """Rebuild the place spatial index from the places table"""
+    count = facade.rebuild_geo_index()
+    click.echo(f"Indexed {count} places")
+
+
+@index_cli.command('rebuild-search')
+def rebuild_search():
+    """Rebuild the full-text index of place titles, descriptions and reviews"""
+    count = facade.rebuild_search_index()
+    click.echo(f"Indexed {count} places")
+
+
+@index_cli.command('rebuild-ratings')
+def rebuild_ratings():
+    """Recompute the per-place rating summaries from the reviews table"""
+    count = facade.rebuild_rating_summaries()
+    click.echo(f"Rebuilt rating summaries for {count} places")
+
+
+@data_cli.command('import')
+@click.argument('source', type=click.File('rb'))
+@click.option('--chunk-size', type=int, default=None, help='Rows written per transaction')
+def import_data(source, chunk_size):
+    """Load NDJSON records from a file ('-' for stdin)"""
+    report = facade.import_records(source, chunk_size or current_app.config['IMPORT_CHUNK_SIZE'])
+    for kind, count in sorted(report['imported'].items()):
+        click.echo(f"Imported {count} {kind} records")
+    for error in report['errors']:
+        click.echo(f"line {error['line']}: {error['error']}", err=True)
+    if report['error_count']:
+        click.echo(f"{report['error_count']} lines rejected", err=True)
+
+
+@data_cli.command('export')
+@click.argument('entity', type=click.Choice(sorted(EXPORT_ENTITIES)))
+@click.option('--format', 'output_format', type=click.Choice(['ndjson', 'csv']), default='ndjson')
+@click.option('--since', default=None, help='Only rows updated at or after this ISO 8601 timestamp')
+@click.option('--output', type=click.File('w'), default='-', help='Destination file (default stdout)')
+def export_data(entity, output_format, since, output):
+    """Stream every row of a table as NDJSON or CSV"""
+    try:
+        since = parse_datetime(since) if since else None
+    except ValueError:
+        raise click.BadParameter('must be an ISO 8601 timestamp', param_hint='--since')
+    records = facade.export_records(entity, since)
+    for chunk in (csv_chunks if output_format == 'csv' else ndjson_chunks)(records):
+        output.write(chunk)
+
+
+@bench_cli.command('serialization')
+@click.option('--limit', type=int, default=1000, help='Places per page')
+@click.option('--rounds', type=int, default=20, help='Times each variant serializes the page')
+def bench_serialization(limit, rounds):
+    """Time serializing and encoding a page of places with their owners and amenities"""
+    from hbnb.app.api.v1 import encoding
+    from hbnb.app.api.v1.fieldsets import Fieldset
+    from hbnb.app.api.v1.places import place_fields, place_output_model
+
+    places, _ = facade.get_places_page(limit, profile=Projection(None, ('owner', 'amenities')))
+    if not places:
+        raise click.ClickException("No places to serialize; import some data first")
+    fieldset = Fieldset(['id', 'title', 'price', 'latitude', 'longitude'], ['owner', 'amenities'])
+    marshal_fields = {name: place_output_model[name] for name in fieldset.fields + fieldset.include}
+    serialize = place_fields.serializer(fieldset)
+
+    def by_hand(place):
+        # What the handlers built before serializers were compiled
+        return {
+            'id': place.id,
+            'title': place.title,
+            'price': place.price,
+            'latitude': place.latitude,
+            'longitude': place.longitude,
+            'owner': {
+                'id': place.owner.id,
+                'first_name': place.owner.first_name,
+                'last_name': place.owner.last_name,
+                'email': place.owner.email
+            },
+            'amenities': [{'id': amenity.id, 'name': amenity.name} for amenity in place.amenities]
+        }
+
+    variants = [
+        ('dict + json', lambda: encoding.stdlib_dumps([by_hand(place) for place in places])),
+        ('marshal + json', lambda: encoding.stdlib_dumps(marshal(places, marshal_fields))),
+        ('compiled + json', lambda: encoding.stdlib_dumps([serialize(place) for place in places])),
+    ]
+    if encoding.orjson is not None:
+        variants.append(('compiled + orjson', lambda: encoding.orjson_dumps([serialize(place) for place in places])))
+    else:
+        click.echo("orjson is not installed; skipping the orjson variant", err=True)
+
+    baseline = None
+    for name, run in variants:
+        run()  # Warm up
+        started = time.perf_counter()
+        for _ in range(rounds):
+            run()
+        elapsed = (time.perf_counter() - started) / rounds
+        baseline = baseline or elapsed
+        click.echo(f"{name:<18} {elapsed * 1000:8.2f} ms/page {len(places) / elapsed:>10,.0f} places/s "
+                   f"{baseline / elapsed:5.1f}x")
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+
+import zlib
+from collections import namedtuple
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # Optional: 'br' is only offered when the brotli package is installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # Optional: 'zstd' is only offered when the zstandard package is installed
+    zstandard = None
+
+# Incremental compressor: compress(data) and flush() return the bytes ready so far, finish() the rest
+Encoder = namedtuple('Encoder', ['compress', 'flush', 'finish'])
+
+
+def gzip_encoder(level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return Encoder(compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush)
+
+
+def brotli_encoder(level):
+    compressor = brotli.Compressor(quality=level)
+    return Encoder(compressor.process, compressor.flush, compressor.finish)
+
+
+def zstd_encoder(level):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return Encoder(compressor.compress, lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+                   compressor.flush)
+
+
+# Content-Encoding token -> (encoder factory, config key of its level)
+ENCODINGS = {'gzip': (gzip_encoder, 'COMPRESS_GZIP_LEVEL')}
+if brotli is not None:
+    ENCODINGS['br'] = (brotli_encoder, 'COMPRESS_BR_LEVEL')
+if zstandard is not None:
+    ENCODINGS['zstd'] = (zstd_encoder, 'COMPRESS_ZSTD_LEVEL')
+
+# Responses compressed by default: the JSON API, exports, Swagger UI and /metrics
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/csv', 'text/html', 'text/plain')
+
+
+class ResponseCompression:
+    """Compresses responses with the best encoding the client accepts.
+
+    COMPRESS_ENCODINGS lists the encodings in order of preference; those
+    whose package is missing are skipped. Bodies under COMPRESS_MIN_SIZE
+    bytes go out as they are. Streamed responses, such as exports, are
+    compressed chunk by chunk and flushed after each chunk, so the client
+    keeps receiving rows as they are produced.
+    """
+
+    def __init__(self, app=None):
+        self.encodings = ()
+        self.levels = {}
+        self.min_size = 0
+        self.mimetypes = frozenset()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        preferred = [name.strip() for name in app.config.get('COMPRESS_ENCODINGS', '').split(',')]
+        self.encodings = tuple(name for name in preferred if name in ENCODINGS)
+        self.levels = {name: app.config[ENCODINGS[name][1]] for name in self.encodings}
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 1024)
+        self.mimetypes = frozenset(app.config.get('COMPRESS_MIMETYPES', COMPRESSIBLE_MIMETYPES))
+        app.after_request(self._compress_response)
+        app.extensions['response_compression'] = self
+
+    def negotiate(self, accept_encodings):
+        """The accepted encoding with the highest q-value, ties going to the preferred one, or None"""
+        best, best_quality = None, 0
+        for name in self.encodings:
+            quality = accept_encodings.quality(name)
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def encoder(self, name):
+        factory, _ = ENCODINGS[name]
+        return factory(self.levels[name])
+
+    def _compress_response(self, response):
+        if (not self.encodings or request.method == 'HEAD' or response.status_code in (204, 206, 304)
+                or response.status_code < 200 or response.direct_passthrough
+                or response.mimetype not in self.mimetypes or 'Content-Encoding' in response.headers):
+            return response
+        # Caches must keep the compressed and plain variants apart, even when this body is too small
+        response.vary.add('Accept-Encoding')
+        name = self.negotiate(request.accept_encodings)
+        if name is None:
+            return response
+        if response.is_streamed:
+            response.response = self._stream(response.response, self.encoder(name))
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_size:
+                return response
+            encoder = self.encoder(name)
+            response.set_data(encoder.compress(body) + encoder.finish())
+        response.headers['Content-Encoding'] = name
+        # The compressed bytes differ from the plain ones: only weakly equal (RFC 9110 8.8.3)
+        etag, weak = response.get_etag()
+        if etag is not None and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    @staticmethod
+    def _stream(chunks, encoder):
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                data = encoder.compress(chunk) + encoder.flush()
+                if data:
+                    yield data
+            yield encoder.finish()
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
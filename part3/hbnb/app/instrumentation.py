@@ -0,0 +1,151 @@
+#!/usr/bin/python3
+
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Statistics of the request (or tracked block) currently running, if any
+_current_stats = ContextVar('hbnb_query_stats', default=None)
+
+# Expanded IN (...) lists differ only in their number of placeholders
+_IN_LIST = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)|\((?:\s*%\(\w+\)s\s*,)+\s*%\(\w+\)s\s*\)')
+
+
+def statement_shape(statement):
+    """Normalise a SQL statement so repeated executions of the same query compare equal"""
+    return ' '.join(_IN_LIST.sub('(?)', statement).split())
+
+
+class NPlusOneError(RuntimeError):
+    """Raised in strict mode when one statement shape repeats too often"""
+
+
+class QueryStats:
+    """Statements executed during one request or tracked block"""
+
+    def __init__(self, repeat_limit=None):
+        self.repeat_limit = repeat_limit
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+        self.shapes = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.total_time += duration
+        if duration >= self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+        if self.repeat_limit and self.shapes[shape] > self.repeat_limit:
+            raise NPlusOneError(
+                f"Statement repeated {self.shapes[shape]} times (limit {self.repeat_limit}): {shape}"
+            )
+
+
+class QueryInspector:
+    """Counts and times the SQL statements issued by each request.
+
+    Adds Server-Timing and X-DB-Queries headers to every response and keeps
+    per-endpoint totals for the admin API. With SQL_STRICT_REPEAT_LIMIT set,
+    a request that repeats one statement shape more often than that fails
+    with NPlusOneError.
+    """
+
+    def __init__(self, app=None, slow_log_size=20):
+        self.repeat_limit = None
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._slowest = deque(maxlen=slow_log_size)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.repeat_limit = app.config.get('SQL_STRICT_REPEAT_LIMIT')
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._teardown_request)
+        app.extensions['query_inspector'] = self
+
+    @contextmanager
+    def track(self, repeat_limit=None):
+        """Collect QueryStats for a block of code, e.g. to assert query counts in tests"""
+        stats = QueryStats(repeat_limit if repeat_limit is not None else self.repeat_limit)
+        token = _current_stats.set(stats)
+        try:
+            yield stats
+        finally:
+            _current_stats.reset(token)
+
+    def _start_request(self):
+        _current_stats.set(QueryStats(self.repeat_limit))
+
+    def _finish_request(self, response):
+        stats = _current_stats.get()
+        if stats is None:
+            return response
+        db_ms = stats.total_time * 1000
+        response.headers['X-DB-Queries'] = str(stats.count)
+        response.headers.add('Server-Timing', f'db;dur={db_ms:.2f};desc="{stats.count} queries"')
+        self._aggregate(request.url_rule.rule if request.url_rule else request.path, stats)
+        return response
+
+    def _teardown_request(self, exc=None):
+        _current_stats.set(None)
+
+    def _aggregate(self, endpoint, stats):
+        with self._lock:
+            totals = self._endpoints.setdefault(
+                endpoint, {'requests': 0, 'queries': 0, 'db_time_ms': 0.0, 'max_queries': 0})
+            totals['requests'] += 1
+            totals['queries'] += stats.count
+            totals['db_time_ms'] += stats.total_time * 1000
+            totals['max_queries'] = max(totals['max_queries'], stats.count)
+            if stats.slowest_statement is not None:
+                self._slowest.append((stats.slowest_time * 1000, endpoint, stats.slowest_statement))
+
+    def snapshot(self):
+        """Per-endpoint totals and the slowest recent statements"""
+        with self._lock:
+            endpoints = {
+                endpoint: dict(totals,
+                               db_time_ms=round(totals['db_time_ms'], 3),
+                               avg_queries=round(totals['queries'] / totals['requests'], 2))
+                for endpoint, totals in self._endpoints.items()
+            }
+            slowest = sorted(self._slowest, reverse=True)
+        return {
+            'endpoints': endpoints,
+            'slowest_statements': [
+                {'duration_ms': round(duration, 3), 'endpoint': endpoint, 'statement': statement}
+                for duration, endpoint, statement in slowest
+            ]
+        }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._slowest.clear()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault('hbnb_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    starts = conn.info.get('hbnb_query_start')
+    if stats is not None and starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+
+import os
+import time
+from flask import Response, g, request
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Gauge, Histogram,
+                               generate_latest, multiprocess)
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+# With PROMETHEUS_MULTIPROC_DIR set, every worker writes its samples to that
+# directory and /metrics sums them across processes.
+REQUEST_LATENCY = Histogram(
+    'hbnb_http_request_duration_seconds', 'HTTP request latency',
+    ['route', 'method', 'status'],
+    buckets=(.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    'hbnb_http_requests_in_progress', 'HTTP requests being served',
+    ['route', 'method'], multiprocess_mode='livesum'
+)
+DB_CONNECTIONS_OPEN = Gauge(
+    'hbnb_db_pool_connections_open', 'Database connections held by the pools',
+    multiprocess_mode='livesum'
+)
+DB_CONNECTIONS_CHECKED_OUT = Gauge(
+    'hbnb_db_pool_connections_checked_out', 'Database connections currently checked out',
+    multiprocess_mode='livesum'
+)
+PASSWORD_HASH_LATENCY = Histogram(
+    'hbnb_password_hash_duration_seconds', 'Time spent hashing or verifying passwords',
+    ['operation'],
+    buckets=(.01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+)
+
+
+def _route():
+    """Route template of the current request, to keep label cardinality bounded"""
+    return request.url_rule.rule if request.url_rule else '<unmatched>'
+
+
+def registry():
+    """Registry to expose: per-process, or aggregated over all workers"""
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+    aggregated = CollectorRegistry()
+    multiprocess.MultiProcessCollector(aggregated)
+    return aggregated
+
+
+def mark_process_dead(pid):
+    """Drop the live gauges of a worker that exited (call from gunicorn's child_exit hook)"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        multiprocess.mark_process_dead(pid)
+
+
+class Metrics:
+    """Prometheus metrics for requests, database pools and password hashing.
+
+    Serves the text exposition format at METRICS_PATH (default /metrics).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not event.contains(Pool, 'checkout', _on_checkout):
+            event.listen(Pool, 'connect', _on_connect)
+            event.listen(Pool, 'close', _on_close)
+            event.listen(Pool, 'close_detached', _on_close)
+            event.listen(Pool, 'checkout', _on_checkout)
+            event.listen(Pool, 'checkin', _on_checkin)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule(app.config.get('METRICS_PATH', '/metrics'), 'metrics', self.expose)
+        app.extensions['metrics'] = self
+
+    def _start_request(self):
+        g.metrics_labels = (_route(), request.method)
+        g.metrics_start = time.perf_counter()
+        REQUESTS_IN_PROGRESS.labels(*g.metrics_labels).inc()
+
+    def _finish_request(self, response):
+        if 'metrics_start' in g:
+            REQUEST_LATENCY.labels(*g.metrics_labels, str(response.status_code)).observe(
+                time.perf_counter() - g.metrics_start)
+        return response
+
+    def _teardown_request(self, exc=None):
+        labels = g.pop('metrics_labels', None)
+        if labels is not None:
+            REQUESTS_IN_PROGRESS.labels(*labels).dec()
+
+    def expose(self):
+        return Response(generate_latest(registry()), content_type=CONTENT_TYPE_LATEST)
+
+
+def _on_connect(dbapi_connection, connection_record):
+    DB_CONNECTIONS_OPEN.inc()
+
+
+def _on_close(dbapi_connection, connection_record=None):
+    DB_CONNECTIONS_OPEN.dec()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_CONNECTIONS_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_CONNECTIONS_CHECKED_OUT.dec()
@@ -5,6 +5,9 @@ from hbnb.app import db
 
 class Amenity(BaseModel):
     __tablename__ = 'amenities'
+    __table_args__ = (
+        db.Index('ix_amenities_created_at_id', 'created_at', 'id'),
+    )
 
     name = db.Column(db.String(50), nullable=False)
 
@@ -12,7 +15,8 @@ class Amenity(BaseModel):
         super().__init__()
         self.name = self._validate_name(name)
 
-    def _validate_name(self, name):
+    @staticmethod
+    def _validate_name(name):
         if len(name) == 0:
             raise ValueError("Name cannot be empty")
         if len(name) > 50:
@@ -12,6 +12,12 @@ place_amenity = db.Table('place_amenity',
 
 class Place(BaseModel):
     __tablename__ = 'places'
+    __table_args__ = (
+        db.Index('ix_places_created_at_id', 'created_at', 'id'),
+        db.Index('ix_places_lat_lon', 'latitude', 'longitude'),
+        db.Index('ix_places_user_id', 'user_id'),
+        db.Index('ix_places_price', 'price'),
+    )
 
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String, nullable=True)
@@ -23,7 +29,7 @@ class Place(BaseModel):
     
     owner = db.relationship('User', backref=db.backref('places', lazy=True))
     reviews = db.relationship('Review', backref='place', cascade='all, delete-orphan', lazy=True)
-    amenities = db.relationship('Amenity', secondary=place_amenity, lazy='subquery', backref=db.backref('places', lazy=True))
+    amenities = db.relationship('Amenity', secondary=place_amenity, lazy=True, backref=db.backref('places', lazy=True))
 
     def __init__(self, title, description, price, latitude, longitude, owner, amenities=[]):
         super().__init__()
@@ -36,24 +42,28 @@ class Place(BaseModel):
         self.user_id = owner.id
         self.amenities = amenities  # List of Amenity objects
 
-    def validate_title(self, title):
+    @staticmethod
+    def validate_title(title):
         if not title:
             raise ValueError("Title cannot be empty")
         if len(title) > 100:
             raise ValueError("Title must be less than 100 characters")
         return title
 
-    def validate_price(self, price):
+    @staticmethod
+    def validate_price(price):
         if price < 0:
             raise ValueError("Price must be a non-negative value")
         return price
 
-    def validate_latitude(self, latitude):
+    @staticmethod
+    def validate_latitude(latitude):
         if not -90 <= latitude <= 90:
             raise ValueError("Latitude must be between -90 and 90")
         return latitude
 
-    def validate_longitude(self, longitude):
+    @staticmethod
+    def validate_longitude(longitude):
         if not -180 <= longitude <= 180:
             raise ValueError("Longitude must be between -180 and 180")
         return longitude
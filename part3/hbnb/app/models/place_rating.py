@@ -0,0 +1,32 @@
+#!/usr/bin/python3
+
+from hbnb.app import db
+
+
+class PlaceRating(db.Model):
+    """Running review totals for a place, maintained alongside review writes"""
+    __tablename__ = 'place_ratings'
+
+    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), primary_key=True)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    stars_1 = db.Column(db.Integer, nullable=False, default=0)
+    stars_2 = db.Column(db.Integer, nullable=False, default=0)
+    stars_3 = db.Column(db.Integer, nullable=False, default=0)
+    stars_4 = db.Column(db.Integer, nullable=False, default=0)
+    stars_5 = db.Column(db.Integer, nullable=False, default=0)
+
+    @staticmethod
+    def star_column(rating):
+        """Name of the histogram column counting a given rating"""
+        return f'stars_{rating}'
+
+    @property
+    def average(self):
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    def histogram(self):
+        """Number of reviews per star, keyed '1' to '5'"""
+        return {str(stars): getattr(self, self.star_column(stars)) for stars in range(1, 6)}
@@ -10,6 +10,8 @@ class Review(BaseModel):
     __tablename__ = 'reviews'
     __table_args__ = (
         db.CheckConstraint('rating >= 1 AND rating <= 5', name='rating_check'),
+        db.Index('ix_reviews_created_at_id', 'created_at', 'id'),
+        db.Index('ix_reviews_place_id', 'place_id'),
     )
 
     text = db.Column(db.String, nullable=False)
@@ -29,7 +31,8 @@ class Review(BaseModel):
         self.user_id = user.id
         self.place_id = place.id
 
-    def _validate_rating(self, rating):
+    @staticmethod
+    def _validate_rating(rating):
         if not (1 <= rating <= 5):
             raise ValueError("Rating must be between 1 and 5")
         return rating
@@ -44,7 +47,8 @@ class Review(BaseModel):
             raise ValueError("Place must be valid instances")
         return place
 
-    def _validate_text(self, text):
+    @staticmethod
+    def _validate_text(text):
         if not text:
             raise ValueError("Text cannot be empty")
         return text
\ No newline at end of file
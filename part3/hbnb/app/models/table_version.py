@@ -0,0 +1,12 @@
+#!/usr/bin/python3
+
+from hbnb.app import db
+
+
+class TableVersion(db.Model):
+    """Counter bumped on every write to a table, used to validate cached collections"""
+    __tablename__ = 'table_versions'
+
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False)
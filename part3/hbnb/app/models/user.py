@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
-from hbnb.app import db, bcrypt
+from hbnb.app import db, password_hasher
+from hbnb.app.passwords import MAX_PASSWORD_BYTES
 import re
 import uuid
 from .base_model import BaseModel  # Import BaseModel from its module
@@ -11,6 +12,9 @@ regex = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
 
 class User(BaseModel):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
 
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
@@ -18,28 +22,48 @@ class User(BaseModel):
     password = db.Column(db.String(128), nullable=False)
     is_admin = db.Column(db.Boolean, default=False)
 
-    def __init__(self, first_name, last_name, email, password, is_admin=False):
+    def __init__(self, first_name, last_name, email, password=None, is_admin=False, password_hash=None):
         super().__init__()
         self.first_name = self._validate_name(first_name, "First")
         self.last_name = self._validate_name(last_name, "Last")
         self.email = self._validate_email(email)
         self.is_admin = is_admin
-        self.hash_password(password)
+        if (password is None) == (password_hash is None):
+            raise ValueError("Provide either a password or a password hash")
+        if password_hash is not None:
+            # Already hashed, e.g. by HBnBFacade.create_users
+            self.password = password_hash
+        else:
+            self.hash_password(password)
 
-    def _validate_email(self, email):
+    @staticmethod
+    def _validate_email(email):
         if not re.fullmatch(regex, email):
             raise ValueError("Invalid email format")
         return email
 
-    def _validate_name(self, name, field_name):
+    @staticmethod
+    def _validate_name(name, field_name):
         if not 0 < len(name) <= 50:
             raise ValueError(f"{field_name} name must be between 1 and 50 characters")
         return name
 
+    @staticmethod
+    def _validate_password(password):
+        if not isinstance(password, str) or not password:
+            raise ValueError("Password cannot be empty")
+        if len(password.encode('utf-8')) > MAX_PASSWORD_BYTES:
+            raise ValueError(f"Password must be at most {MAX_PASSWORD_BYTES} bytes")
+        return password
+
     def hash_password(self, password):
         """Hashes the password before storing it."""
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = password_hasher.hash(self._validate_password(password))
 
     def verify_password(self, password):
         """Verifies if the provided password matches the hashed password."""
-        return bcrypt.check_password_hash(self.password, password)
\ No newline at end of file
+        return password_hasher.verify(password, self.password)
+
+    def needs_rehash(self):
+        """Whether the stored hash uses an outdated bcrypt cost factor."""
+        return password_hasher.needs_rehash(self.password)
\ No newline at end of file
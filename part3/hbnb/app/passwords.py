@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+
+import hmac
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt as _bcrypt
+from hbnb.app.metrics import PASSWORD_HASH_LATENCY
+
+# bcrypt only reads this many bytes of a password and bcrypt 5 rejects longer ones
+MAX_PASSWORD_BYTES = 72
+
+
+def _hash(password, rounds):
+    """Hash a password with bcrypt (runs in a pool worker)"""
+    return _bcrypt.hashpw(password.encode('utf-8'), _bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _verify(password, password_hash):
+    """Check a password against a bcrypt hash (runs in a pool worker)"""
+    password = password.encode('utf-8')
+    if len(password) > MAX_PASSWORD_BYTES:
+        # Never accepted as a new password, so it cannot match
+        return False
+    password_hash = password_hash.encode('utf-8')
+    return hmac.compare_digest(_bcrypt.hashpw(password, password_hash), password_hash)
+
+
+def hash_rounds(password_hash):
+    """Cost factor stored in a bcrypt hash such as '$2b$12$...'"""
+    try:
+        return int(password_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded process pool so request threads don't compete for it.
+
+    Configured through BCRYPT_LOG_ROUNDS (cost factor), PASSWORD_HASH_WORKERS
+    (pool size, 0 hashes inline) and PASSWORD_HASH_TIMEOUT (seconds).
+    """
+
+    def __init__(self, app=None):
+        self.rounds = 12
+        self.workers = os.cpu_count() or 1
+        self.timeout = None
+        self._pool = None
+        self._pool_pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT')
+        self.shutdown()
+
+    def _executor(self):
+        """Return the process pool, starting it lazily (and again after a fork)"""
+        if self._pool is None or self._pool_pid != os.getpid():
+            # The pool usually starts from a request thread: forking a threaded
+            # process can leave a lock held in the child, so pool workers are
+            # forked from a single-threaded fork server with bcrypt preloaded
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context('spawn')
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            self._pool_pid = os.getpid()
+        return self._pool
+
+    def shutdown(self):
+        if self._pool is not None and self._pool_pid == os.getpid():
+            self._pool.shutdown(wait=False)
+        self._pool = None
+
+    def _run(self, operation, func, *args):
+        with PASSWORD_HASH_LATENCY.labels(operation).time():
+            if not self.workers:
+                return func(*args)
+            return self._executor().submit(func, *args).result(timeout=self.timeout)
+
+    def hash(self, password):
+        return self._run('hash', _hash, password, self.rounds)
+
+    def verify(self, password, password_hash):
+        return self._run('verify', _verify, password, password_hash)
+
+    def needs_rehash(self, password_hash):
+        """Whether a hash was made with a different cost factor than the configured one"""
+        return hash_rounds(password_hash) != self.rounds
+
+    def hash_many(self, passwords):
+        """Hash several passwords in parallel across the pool, preserving order"""
+        with PASSWORD_HASH_LATENCY.labels('hash_many').time():
+            if not self.workers:
+                return [_hash(password, self.rounds) for password in passwords]
+            return list(self._executor().map(_hash, passwords, [self.rounds] * len(passwords),
+                                             timeout=self.timeout))
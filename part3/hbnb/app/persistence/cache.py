@@ -0,0 +1,403 @@
+#!/usr/bin/python3
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+# Tag that invalidates every cached entry
+ALL = '*'
+
+
+class CacheBackend(ABC):
+    """Storage for cached values (bytes), with TTL expiry and tag invalidation.
+
+    Every invalidation advances a generation. A value computed after reading
+    generation() is only stored if none of its tags was invalidated since, so
+    a write that lands while the value is being built cannot be undone by it.
+    """
+
+    # Whether every worker process sees the same entries
+    shared = False
+
+    @abstractmethod
+    def get(self, key):
+        """Return the stored bytes, or None if missing or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key, value, ttl, tags=(), generation=None):
+        """Store the value, unless a tag was invalidated after the given generation"""
+        pass
+
+    @abstractmethod
+    def generation(self):
+        """Return the current invalidation generation"""
+        pass
+
+    @abstractmethod
+    def invalidate(self, tags):
+        """Drop every entry carrying any of the tags; return how many were dropped"""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    @abstractmethod
+    def stats(self):
+        """Return {'entries': ..., 'bytes': ...} plus backend specific details"""
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU bounded by the total size of the stored values"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, tags, monotonic expiry)
+        self._tags = {}  # tag -> set of keys
+        self._generation = 0
+        self._invalidated = {}  # tag -> generation of its last invalidation; ALL for clear()
+        self._bytes = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[2]:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, ttl, tags=(), generation=None):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and any(
+                    self._invalidated.get(tag, 0) > generation for tag in (ALL, *tags)):
+                return
+            self._remove(key)
+            self._entries[key] = (value, frozenset(tags), time.monotonic() + ttl)
+            self._bytes += len(value)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        value, tags, _ = entry
+        self._bytes -= len(value)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
+
+    def invalidate(self, tags):
+        with self._lock:
+            self._generation += 1
+            self._invalidated.update(dict.fromkeys(tags, self._generation))
+            return sum(self._remove(key) for tag in tags for key in list(self._tags.get(tag, ())))
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._invalidated = {ALL: self._generation}
+            self._entries.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'backend': 'memory', 'entries': len(self._entries), 'bytes': self._bytes,
+                    'max_bytes': self.max_bytes, 'evictions': self._evictions}
+
+
+class SQLiteFile:
+    """One connection per thread and process to a SQLite file shared by the workers"""
+
+    def __init__(self, path, schema):
+        self.path = path
+        self.schema = schema
+        self._local = threading.local()
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(self.schema)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at);
+CREATE TABLE IF NOT EXISTS cache_tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_cache_tags_key ON cache_tags (key);
+CREATE TABLE IF NOT EXISTS cache_size (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL);
+INSERT OR IGNORE INTO cache_size VALUES (0, 0);
+CREATE TABLE IF NOT EXISTS cache_generations (
+    tag TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO cache_generations VALUES ('', 0);
+CREATE TRIGGER IF NOT EXISTS cache_entries_insert AFTER INSERT ON cache_entries BEGIN
+    UPDATE cache_size SET bytes = bytes + length(NEW.value);
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entries_delete AFTER DELETE ON cache_entries BEGIN
+    UPDATE cache_size SET bytes = bytes - length(OLD.value);
+    DELETE FROM cache_tags WHERE key = OLD.key;
+END;
+"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache kept in a SQLite file that every worker on the host reads and writes.
+
+    Over max_bytes, the entries closest to expiry are evicted first; a hit
+    does not write to the file.
+    """
+
+    shared = True
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._file = SQLiteFile(path, CACHE_SCHEMA)
+
+    def get(self, key):
+        row = self._file.connection().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def generation(self):
+        return self._file.connection().execute(
+            "SELECT generation FROM cache_generations WHERE tag = ''").fetchone()[0]
+
+    def _advance(self, conn, tags):
+        """Record an invalidation of the tags, in the caller's transaction"""
+        conn.execute("UPDATE cache_generations SET generation = generation + 1 WHERE tag = ''")
+        conn.executemany(
+            "INSERT OR REPLACE INTO cache_generations "
+            "SELECT ?, generation FROM cache_generations WHERE tag = ''", [(tag,) for tag in tags]
+        )
+
+    def set(self, key, value, ttl, tags=(), generation=None):
+        if len(value) > self.max_bytes:
+            return
+        tags = list(tags)
+        conn = self._file.connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if generation is not None:
+                checked = [ALL, *tags]
+                placeholders = ','.join('?' * len(checked))
+                if conn.execute(
+                    f"SELECT 1 FROM cache_generations WHERE tag IN ({placeholders}) AND generation > ? LIMIT 1",
+                    (*checked, generation)
+                ).fetchone():
+                    return
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            conn.execute("INSERT INTO cache_entries VALUES (?, ?, ?)", (key, value, time.time() + ttl))
+            conn.executemany("INSERT OR IGNORE INTO cache_tags VALUES (?, ?)", [(tag, key) for tag in tags])
+            self._evict(conn)
+
+    def _evict(self, conn):
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        excess = conn.execute("SELECT bytes FROM cache_size").fetchone()[0] - self.max_bytes
+        if excess > 0:
+            # Drop the entries closest to expiry until the excess is covered
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                "SELECT key FROM (SELECT key, length(value) AS size, "
+                "SUM(length(value)) OVER (ORDER BY expires_at, key) AS freed FROM cache_entries) "
+                "WHERE freed - size < ?)",
+                (excess,)
+            )
+
+    def invalidate(self, tags):
+        tags = list(tags)
+        if not tags:
+            return 0
+        conn = self._file.connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._advance(conn, tags)
+            placeholders = ','.join('?' * len(tags))
+            return conn.execute(
+                f"DELETE FROM cache_entries WHERE key IN "
+                f"(SELECT key FROM cache_tags WHERE tag IN ({placeholders}))", tags
+            ).rowcount
+
+    def clear(self):
+        conn = self._file.connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._advance(conn, [ALL])
+            conn.execute("DELETE FROM cache_generations WHERE tag NOT IN ('', ?)", (ALL,))
+            conn.execute("DELETE FROM cache_entries")
+
+    def stats(self):
+        conn = self._file.connection()
+        entries = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+        size = conn.execute("SELECT bytes FROM cache_size").fetchone()[0]
+        return {'backend': 'sqlite', 'path': self._file.path, 'entries': entries, 'bytes': size,
+                'max_bytes': self.max_bytes}
+
+
+class InvalidationBus:
+    """Delivers invalidation tags to the caches of this process.
+
+    Subscribers are called with a list of tags; ALL means drop everything.
+    """
+
+    def __init__(self):
+        self._subscribers = []  # (callback, wants messages from other workers)
+
+    def subscribe(self, callback, remote=True):
+        self._subscribers.append((callback, remote))
+
+    def publish(self, tags):
+        tags = list(tags)
+        if tags:
+            self._deliver(tags, local=True)
+
+    def _deliver(self, tags, local):
+        for callback, remote in self._subscribers:
+            if local or remote:
+                callback(tags)
+
+    def poll(self):
+        """Apply invalidations published by other workers"""
+        pass
+
+    def stats(self):
+        return {'bus': 'local'}
+
+
+BUS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_invalidations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    published_at REAL NOT NULL
+);
+"""
+
+
+class SQLiteInvalidationBus(InvalidationBus):
+    """Invalidation log in a SQLite file, read by every worker before it serves a request.
+
+    Workers poll at most every poll_interval seconds. Messages are kept for
+    retention seconds, which must exceed the longest cache TTL; a worker that
+    finds messages missing drops all of its cached entries.
+    """
+
+    def __init__(self, path, poll_interval=0.005, retention=300):
+        super().__init__()
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._file = SQLiteFile(path, BUS_SCHEMA)
+        self._origin = f'{socket.gethostname()}:{os.getpid()}:{id(self)}'
+        self._last_seq = None
+        self._last_poll = 0.0
+        self._received = 0
+        self._lock = threading.Lock()
+
+    def _reset_after_fork(self):
+        origin = f'{socket.gethostname()}:{os.getpid()}:{id(self)}'
+        if origin != self._origin:
+            self._origin, self._last_seq = origin, None
+
+    def publish(self, tags):
+        tags = list(tags)
+        if not tags:
+            return
+        self._reset_after_fork()
+        now = time.time()
+        conn = self._file.connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO cache_invalidations (origin, tag, published_at) VALUES (?, ?, ?)",
+                [(self._origin, tag, now) for tag in tags]
+            )
+            conn.execute("DELETE FROM cache_invalidations WHERE published_at < ?", (now - self.retention,))
+        self._deliver(tags, local=True)
+
+    def poll(self):
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return
+        with self._lock:
+            self._last_poll = now
+            self._reset_after_fork()
+            conn = self._file.connection()
+            if self._last_seq is None:
+                # Start from the current end of the log; earlier messages predate our caches
+                self._last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM cache_invalidations").fetchone()[0]
+                return
+            rows = conn.execute(
+                "SELECT seq, origin, tag FROM cache_invalidations WHERE seq > ? ORDER BY seq", (self._last_seq,)
+            ).fetchall()
+            if not rows:
+                return
+            if rows[0][0] > self._last_seq + 1:
+                tags = [ALL]  # Messages were pruned before we read them
+            else:
+                tags = list(dict.fromkeys(tag for _, origin, tag in rows if origin != self._origin))
+            self._last_seq = rows[-1][0]
+            self._received += len(rows)
+        if tags:
+            self._deliver(tags, local=False)
+
+    def stats(self):
+        return {'bus': 'sqlite', 'path': self._file.path, 'last_seq': self._last_seq,
+                'received': self._received}
+
+
+def create_backend(name, path=None, max_bytes=64 * 1024 * 1024):
+    """Build the cache backend named by the CACHE_BACKEND setting"""
+    if name == 'memory':
+        return MemoryCacheBackend(max_bytes)
+    if name == 'sqlite':
+        return SQLiteCacheBackend(path, max_bytes)
+    raise ValueError(f"Unknown cache backend: {name}")
+
+
+def create_bus(name, path=None, poll_interval=0.005, retention=300):
+    """Build the invalidation bus named by the CACHE_BUS setting"""
+    if name == 'local':
+        return InvalidationBus()
+    if name == 'sqlite':
+        return SQLiteInvalidationBus(path, poll_interval, retention)
+    raise ValueError(f"Unknown invalidation bus: {name}")
@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+
+import threading
+import time
+from sqlalchemy import event
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """Run PRAGMA name=value for each setting on a fresh SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+class PoolStats:
+    """Checkout counters and hold times of one engine's connection pool"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._checked_out = 0
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.peak_checked_out = self._checked_out
+            self.hold_time = 0.0
+            self.max_hold_time = 0.0
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        connection_record.info['hbnb_checkout_at'] = time.perf_counter()
+        with self._lock:
+            self.checkouts += 1
+            self._checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self._checked_out)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        started = connection_record.info.pop('hbnb_checkout_at', None)
+        if started is None:
+            return
+        held = time.perf_counter() - started
+        with self._lock:
+            self._checked_out -= 1
+            self.checkins += 1
+            self.hold_time += held
+            self.max_hold_time = max(self.max_hold_time, held)
+
+    def on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self):
+        pool = self.engine.pool  # Replaced by engine.dispose()
+        with self._lock:
+            stats = {
+                'pool': type(pool).__name__,
+                'connects': self.connects,
+                'checkouts': self.checkouts,
+                'invalidations': self.invalidations,
+                'peak_checked_out': self.peak_checked_out,
+                'avg_hold_ms': round(self.hold_time * 1000 / self.checkins, 3) if self.checkins else None,
+                'max_hold_ms': round(self.max_hold_time * 1000, 3),
+            }
+        # QueuePool sizing; other pool classes do not track these
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            method = getattr(pool, name, None)
+            if method is not None:
+                stats[name] = method()
+        stats['timeout'] = getattr(pool, '_timeout', None)
+        return stats
+
+
+class EngineTuning:
+    """Applies SQLITE_PRAGMAS to every new SQLite connection and tracks pool usage.
+
+    Pool sizing itself comes from SQLALCHEMY_ENGINE_OPTIONS (see
+    ProductionConfig). Pool statistics are served by the admin API.
+    """
+
+    def __init__(self, app=None):
+        self._stats = {}  # engine name -> PoolStats
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+        with app.app_context():
+            engines = dict(app.extensions['sqlalchemy'].engines)
+        for name, engine in engines.items():
+            if engine.dialect.name == 'sqlite' and pragmas:
+                event.listen(engine, 'connect', lambda conn, record: apply_sqlite_pragmas(conn, pragmas))
+            stats = PoolStats(engine)
+            event.listen(engine, 'connect', stats.on_connect)
+            event.listen(engine, 'checkout', stats.on_checkout)
+            event.listen(engine, 'checkin', stats.on_checkin)
+            event.listen(engine, 'invalidate', stats.on_invalidate)
+            self._stats[name or 'default'] = stats
+        app.extensions['engine_tuning'] = self
+
+    def snapshot(self):
+        """Pool statistics per engine (the default engine is 'default')"""
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    def reset(self):
+        for stats in self._stats.values():
+            stats.reset()
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+
+import hashlib
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def geo_key(place_id):
+    """Stable 63-bit integer key for a place in the R*Tree"""
+    digest = hashlib.blake2b(place_id.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') >> 1
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points, in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_boxes(lat, lon, radius_km):
+    """Return the (min_lat, min_lon, max_lat, max_lon) boxes covering a circle.
+
+    A circle that crosses the antimeridian is split into two boxes so each
+    one can be answered by a plain range query.
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        # The circle reaches a pole, every longitude is in range
+        return [(min_lat, -180.0, max_lat, 180.0)]
+    dlon = math.degrees(radius_km / (EARTH_RADIUS_KM * math.cos(math.radians(lat))))
+    if dlon >= 180.0:
+        return [(min_lat, -180.0, max_lat, 180.0)]
+    return split_antimeridian(min_lat, lon - dlon, max_lat, lon + dlon)
+
+
+def split_antimeridian(min_lat, min_lon, max_lat, max_lon):
+    """Normalise a box whose longitudes may run past +/-180 degrees"""
+    if min_lon < -180.0:
+        return [(min_lat, min_lon + 360.0, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+    if max_lon > 180.0:
+        return [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon - 360.0)]
+    if min_lon > max_lon:
+        # bbox given west > east, i.e. it wraps around the antimeridian
+        return [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+    return [(min_lat, min_lon, max_lat, max_lon)]
@@ -1,8 +1,72 @@
 #!/usr/bin/python3
 
 
+import base64
+import bisect
+import operator
+import time
 from abc import ABC, abstractmethod
+from collections import namedtuple
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.orm import load_only, selectinload
 from hbnb.app import db
+from hbnb.app.persistence.unit_of_work import commit
+
+# How long (in seconds) an approximate row count is trusted before recounting
+COUNT_CACHE_TTL = 60
+
+# Ids bound per IN (...) clause, safely below SQLite's host parameter limit
+IN_CHUNK_SIZE = 500
+
+# Comparison suffixes accepted in find()/count() filters, e.g. {'price__lte': 100}
+FILTER_OPERATORS = {
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'lt': operator.lt,
+    'lte': operator.le,
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'in': None,  # Membership, compiled separately by each backend
+}
+
+# A load profile built per request: the model attributes to load (None for
+# every column) and the relationships, named in INCLUDES, to batch-load.
+Projection = namedtuple('Projection', ['columns', 'include'])
+
+
+def encode_cursor(obj):
+    """Encode the (created_at, id) position of an object as an opaque cursor"""
+    raw = f"{obj.created_at.isoformat()}|{obj.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Decode an opaque cursor back into its (created_at, id) position"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        created_at, obj_id = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), obj_id
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_filter_key(key):
+    """Split a filter key such as 'price__lte' into ('price', 'lte')"""
+    attr_name, _, op = key.partition('__')
+    op = op or 'eq'
+    if op not in FILTER_OPERATORS:
+        raise ValueError(f"Unsupported filter operator: {op}")
+    return attr_name, op
+
+
+def parse_order_key(key):
+    """Split an ordering key such as '-created_at' into ('created_at', True)"""
+    if key.startswith('-'):
+        return key[1:], True
+    return key, False
+
 
 class Repository(ABC):
     @abstractmethod
@@ -10,13 +74,51 @@ class Repository(ABC):
         pass
 
     @abstractmethod
-    def get(self, obj_id):
+    def add_all(self, objs):
+        pass
+
+    @abstractmethod
+    def get(self, obj_id, profile=None):
+        """Return one object; profile names a set of relationships to load with it"""
+        pass
+
+    @abstractmethod
+    def get_updated_at(self, obj_id):
+        """Return only the updated_at of an object, or None if it does not exist"""
+        pass
+
+    @abstractmethod
+    def get_many(self, obj_ids, profile=None):
+        """Return the objects for the given ids, in that order, skipping unknown ids"""
         pass
 
     @abstractmethod
     def get_all(self):
         pass
 
+    @abstractmethod
+    def get_page(self, limit, cursor=None, profile=None):
+        """Return (items, next_cursor) ordered by (created_at, id)"""
+        pass
+
+    @abstractmethod
+    def count_estimate(self):
+        pass
+
+    @abstractmethod
+    def find(self, filters=None, order_by=None, limit=None, offset=0, profile=None):
+        """Return the objects matching every filter.
+
+        filters maps attribute names, optionally suffixed with an operator
+        from FILTER_OPERATORS, to values. order_by lists attribute names,
+        prefixed with '-' for descending order.
+        """
+        pass
+
+    @abstractmethod
+    def count(self, filters=None):
+        pass
+
     @abstractmethod
     def update(self, obj_id, data):
         pass
@@ -33,16 +135,87 @@ class Repository(ABC):
 class InMemoryRepository(Repository):
     def __init__(self):
         self._storage = {}
+        self._order = []  # Sorted (created_at, id) keys used for keyset pagination
 
     def add(self, obj):
+        if obj.id not in self._storage:
+            bisect.insort(self._order, (obj.created_at, obj.id))
         self._storage[obj.id] = obj
 
-    def get(self, obj_id):
+    def add_all(self, objs):
+        for obj in objs:
+            self.add(obj)
+
+    # Objects are held in memory with their relationships, so load profiles are ignored
+    def get(self, obj_id, profile=None):
         return self._storage.get(obj_id)
 
+    def get_updated_at(self, obj_id):
+        obj = self._storage.get(obj_id)
+        return obj.updated_at if obj else None
+
+    def get_many(self, obj_ids, profile=None):
+        return [self._storage[obj_id] for obj_id in dict.fromkeys(obj_ids) if obj_id in self._storage]
+
     def get_all(self):
         return list(self._storage.values())
 
+    def get_page(self, limit, cursor=None, profile=None):
+        start = bisect.bisect_right(self._order, decode_cursor(cursor)) if cursor else 0
+        keys = self._order[start:start + limit + 1]
+        items = [self._storage[obj_id] for _, obj_id in keys[:limit]]
+        next_cursor = encode_cursor(items[-1]) if len(keys) > limit else None
+        return items, next_cursor
+
+    def count_estimate(self):
+        return len(self._storage)
+
+    def _matches(self, obj, conditions):
+        for attr_name, op, value in conditions:
+            attr = getattr(obj, attr_name)
+            if op == 'in':
+                if attr not in value:
+                    return False
+            elif not FILTER_OPERATORS[op](attr, value):
+                return False
+        return True
+
+    def _select(self, filters, ordered=False):
+        """Yield matching objects, using the id lookup and the creation order where possible"""
+        conditions = [parse_filter_key(key) + (value,) for key, value in (filters or {}).items()]
+        ids = None
+        for attr_name, op, value in conditions:
+            if attr_name == 'id' and op in ('eq', 'in'):
+                ids = [value] if op == 'eq' else list(value)
+                break
+        if ids is not None:
+            candidates = (self._storage[obj_id] for obj_id in ids if obj_id in self._storage)
+            if ordered:
+                candidates = sorted(candidates, key=lambda obj: (obj.created_at, obj.id))
+        elif ordered:
+            candidates = (self._storage[obj_id] for _, obj_id in self._order)
+        else:
+            candidates = self._storage.values()
+        return (obj for obj in candidates if self._matches(obj, conditions))
+
+    def find(self, filters=None, order_by=None, limit=None, offset=0, profile=None):
+        order_by = list(order_by or [])
+        # Creation order is already maintained, so it needs no sort
+        presorted = order_by in (['created_at'], ['created_at', 'id'])
+        results = self._select(filters, ordered=presorted)
+        if order_by and not presorted:
+            results = list(results)
+            for key in reversed(order_by):
+                attr_name, descending = parse_order_key(key)
+                results.sort(key=operator.attrgetter(attr_name), reverse=descending)
+        stop = offset + limit if limit is not None else None
+        return list(islice(results, offset, stop))
+
+    def count(self, filters=None):
+        if not filters:
+            return len(self._storage)
+        return sum(1 for _ in self._select(filters))
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
@@ -50,38 +223,175 @@ class InMemoryRepository(Repository):
 
     def delete(self, obj_id):
         if obj_id in self._storage:
-            del self._storage[obj_id]
+            obj = self._storage.pop(obj_id)
+            index = bisect.bisect_left(self._order, (obj.created_at, obj.id))
+            del self._order[index]
 
     def get_by_attribute(self, attr_name, attr_value):
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
 
 
 class SQLAlchemyRepository(Repository):
+    # Named loader option sets, e.g. {'detail': (selectinload(Place.owner),)}.
+    # Subclasses declare them so each endpoint runs a fixed number of queries.
+    LOAD_PROFILES = {}
+
+    # Relationships a Projection may include: name -> (relationship attribute,
+    # columns the loader needs). Each is one selectin query, whatever the row count.
+    INCLUDES = {}
+
     def __init__(self, model):
         self.model = model
+        self._count_cache = (None, 0)  # (row count, monotonic expiry time)
+
+    def _load_options(self, profile):
+        if profile is None:
+            return ()
+        if isinstance(profile, Projection):
+            return self._projection_options(profile)
+        if profile not in self.LOAD_PROFILES:
+            raise ValueError(f"Unknown load profile: {profile}")
+        return self.LOAD_PROFILES[profile]
+
+    def _projection_options(self, projection):
+        options = []
+        columns = set(projection.columns) if projection.columns is not None else None
+        for name in projection.include:
+            if name not in self.INCLUDES:
+                raise ValueError(f"Unknown include: {name}")
+            attr_name, needed = self.INCLUDES[name]
+            options.append(selectinload(getattr(self.model, attr_name)))
+            if columns is not None:
+                columns.update(needed)
+        if columns is not None:
+            # Keyset pagination and encode_cursor() read (created_at, id)
+            columns.update(('id', 'created_at'))
+            options.append(load_only(*(getattr(self.model, name) for name in sorted(columns))))
+        return tuple(options)
+
+    def _query(self, profile=None):
+        return self.model.query.options(*self._load_options(profile))
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        commit()
+        self._adjust_count(1)
+
+    def add_all(self, objs):
+        db.session.add_all(objs)
+        commit()
+        self._adjust_count(len(objs))
+
+    def get(self, obj_id, profile=None):
+        return db.session.get(self.model, obj_id, options=self._load_options(profile))
+
+    def get_updated_at(self, obj_id):
+        return db.session.query(self.model.updated_at).filter(self.model.id == obj_id).scalar()
+
+    def get_many(self, obj_ids, profile=None):
+        obj_ids = list(dict.fromkeys(obj_ids))
+        found = {}
+        for start in range(0, len(obj_ids), IN_CHUNK_SIZE):
+            chunk = obj_ids[start:start + IN_CHUNK_SIZE]
+            found.update((obj.id, obj) for obj in self._query(profile).filter(self.model.id.in_(chunk)))
+        return [found[obj_id] for obj_id in obj_ids if obj_id in found]
+
+    def get_existing(self, attr_name, values):
+        """Return the subset of values already stored in a column, e.g. known ids or emails"""
+        column = getattr(self.model, attr_name)
+        values = list(set(values))
+        found = set()
+        for start in range(0, len(values), IN_CHUNK_SIZE):
+            chunk = values[start:start + IN_CHUNK_SIZE]
+            found.update(db.session.execute(db.select(column).where(column.in_(chunk))).scalars())
+        return found
 
-    def get(self, obj_id):
-        return self.model.query.get(obj_id)
+    def insert_rows(self, rows):
+        """Insert column dicts with a single executemany, in the current transaction"""
+        if rows:
+            db.session.execute(insert(self.model.__table__), rows)
+            self._adjust_count(len(rows))
 
     def get_all(self):
         return self.model.query.all()
 
+    def iter_row_batches(self, since=None, batch_size=1000):
+        """Yield lists of column dicts for the whole table, streamed from a server-side cursor"""
+        table = self.model.__table__
+        select = db.select(table).order_by(table.c.created_at, table.c.id)
+        if since is not None:
+            select = select.where(table.c.updated_at >= since)
+        result = db.session.execute(select.execution_options(yield_per=batch_size))
+        for batch in result.mappings().partitions():
+            yield [dict(row) for row in batch]
+
+    def get_page(self, limit, cursor=None, profile=None):
+        query = self._query(profile).order_by(self.model.created_at, self.model.id)
+        if cursor:
+            created_at, obj_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                self.model.created_at > created_at,
+                and_(self.model.created_at == created_at, self.model.id > obj_id)
+            ))
+        # Fetch one extra row to know whether another page follows
+        items = query.limit(limit + 1).all()
+        next_cursor = encode_cursor(items[limit - 1]) if len(items) > limit else None
+        return items[:limit], next_cursor
+
+    def count_estimate(self):
+        count, expires_at = self._count_cache
+        if count is None or time.monotonic() >= expires_at:
+            count = self.model.query.count()
+            self._count_cache = (count, time.monotonic() + COUNT_CACHE_TTL)
+        return count
+
+    def _filtered(self, query, filters):
+        for key, value in (filters or {}).items():
+            attr_name, op = parse_filter_key(key)
+            column = getattr(self.model, attr_name, None)
+            if column is None:
+                raise ValueError(f"Unknown filter attribute: {attr_name}")
+            if op == 'in':
+                query = query.filter(column.in_(list(value)))
+            else:
+                query = query.filter(FILTER_OPERATORS[op](column, value))
+        return query
+
+    def find(self, filters=None, order_by=None, limit=None, offset=0, profile=None):
+        query = self._filtered(self._query(profile), filters)
+        for key in order_by or []:
+            attr_name, descending = parse_order_key(key)
+            column = getattr(self.model, attr_name)
+            query = query.order_by(column.desc() if descending else column.asc())
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
+
+    def count(self, filters=None):
+        query = db.session.query(func.count(self.model.id))
+        return self._filtered(query, filters).scalar()
+
+    def _adjust_count(self, delta):
+        """Keep the cached count roughly in step with writes until it expires"""
+        count, expires_at = self._count_cache
+        if count is not None:
+            self._count_cache = (max(count + delta, 0), expires_at)
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            commit()
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            commit()
+            self._adjust_count(-1)
 
     def get_by_attribute(self, attr_name, attr_value):
-        return self.model.query.filter_by(**{attr_name: attr_value}).first()
\ No newline at end of file
+        return self.model.query.filter_by(**{attr_name: attr_value}).first()
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+
+import re
+from sqlalchemy import DDL, event, text
+from hbnb.app import db
+from hbnb.app.persistence.geo import geo_key
+
+# One FTS5 document per place: its title, description and the text of its
+# reviews, stored under the place's geo_key so it can be updated by rowid.
+SEARCH_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS place_search USING fts5("
+    "place_id UNINDEXED, title, description, reviews, tokenize='porter unicode61')"
+)
+
+# Built and dropped with the tables by db.create_all()/drop_all(), as schema.sql does
+event.listen(db.metadata, 'after_create', DDL(SEARCH_INDEX_DDL).execute_if(dialect='sqlite'))
+event.listen(db.metadata, 'before_drop', DDL("DROP TABLE IF EXISTS place_search").execute_if(dialect='sqlite'))
+
+# BM25 weights per column: a title match counts most, review text least
+SEARCH_RANK = "bm25(place_search, 0.0, 10.0, 4.0, 1.0)"
+
+# Review texts of a place, one per line
+REVIEWS_TEXT = "(SELECT group_concat(text, char(10)) FROM reviews WHERE reviews.place_id = {place_id})"
+
+_WORD = re.compile(r'\w+')
+
+
+def search_words(query):
+    """Split free text such as 'ocean view loft' into words, ignoring punctuation"""
+    words = _WORD.findall(query)
+    if not words:
+        raise ValueError("Search query must contain at least one word")
+    return words
+
+
+def match_query(query):
+    """Turn free text into an FTS5 query requiring every word"""
+    words = search_words(query)
+    # Quoting keeps FTS5 operators (AND, NEAR, column:...) in user input literal
+    return ' '.join(f'"{word}"' for word in words)
+
+
+class PlaceTextIndex:
+    """SQLite FTS5 index over place titles, descriptions and review text.
+
+    PlaceRepository and ReviewRepository update it in the same transaction
+    as their writes. On other databases the index is not maintained and
+    PlaceRepository.search_text() falls back to LIKE queries.
+    """
+
+    def available(self):
+        """Whether the index is maintained on the current engine"""
+        return db.engine.dialect.name == 'sqlite'
+
+    def index_places(self, rows):
+        """Insert or refresh place documents from dicts with id, title and description"""
+        if not rows or not self.available():
+            return
+        db.session.execute(text(
+            "INSERT OR REPLACE INTO place_search (rowid, place_id, title, description, reviews) "
+            f"VALUES (:key, :place_id, :title, :description, {REVIEWS_TEXT.format(place_id=':place_id')})"
+        ), [{'key': geo_key(row['id']), 'place_id': row['id'], 'title': row['title'],
+             'description': row.get('description') or ''} for row in rows])
+
+    def index_reviews(self, place_ids):
+        """Refresh the review text of the given places"""
+        if not place_ids or not self.available():
+            return
+        db.session.execute(text(
+            f"UPDATE place_search SET reviews = {REVIEWS_TEXT.format(place_id='place_search.place_id')} "
+            "WHERE rowid = :key"
+        ), [{'key': geo_key(place_id)} for place_id in dict.fromkeys(place_ids)])
+
+    def search(self, query, limit, offset=0):
+        """Return ([(place_id, score, snippet)], total) for the best matches first"""
+        match = match_query(query)
+        total = db.session.execute(
+            text("SELECT count(*) FROM place_search WHERE place_search MATCH :match"), {'match': match}
+        ).scalar()
+        rows = db.session.execute(text(
+            f"SELECT place_id, {SEARCH_RANK} AS score, "
+            "snippet(place_search, -1, '<mark>', '</mark>', '…', 16) "
+            "FROM place_search WHERE place_search MATCH :match "
+            "ORDER BY score, rowid LIMIT :limit OFFSET :offset"
+        ), {'match': match, 'limit': limit, 'offset': offset}).all()
+        # BM25 scores are negative, lower being better; report relevance as a positive number
+        return [(place_id, -score, snippet) for place_id, score, snippet in rows], total
+
+    def rebuild(self):
+        """Drop and repopulate the index from the places and reviews tables"""
+        if db.engine.dialect.name != 'sqlite':
+            return 0
+        db.session.execute(text("DROP TABLE IF EXISTS place_search"))
+        db.session.execute(text(SEARCH_INDEX_DDL))
+        rows = db.session.execute(text("SELECT id, title, description FROM places")).mappings().all()
+        self.index_places(rows)
+        return len(rows)
+
+
+# Shared by the place and review repositories
+place_text_index = PlaceTextIndex()
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from hbnb.app import db
+
+# Unit of work the current request or block runs in, if any
+_current_unit = ContextVar('hbnb_unit_of_work', default=None)
+
+
+class UnitOfWork:
+    """Groups the writes of a request or facade call into one transaction.
+
+    While a unit is open, repositories only flush on commit(); the unit
+    commits once when it closes, or rolls everything back. Work that must
+    wait for the commit, such as publishing cache invalidations, is queued
+    with after_commit() and dropped on rollback.
+    """
+
+    def __init__(self):
+        self._after_commit = []
+        self._token = None
+
+    def open(self):
+        self._token = _current_unit.set(self)
+        return self
+
+    def after_commit(self, callback):
+        self._after_commit.append(callback)
+
+    def close(self, commit=True):
+        """Commit (or roll back) the session and leave the unit"""
+        callbacks, self._after_commit = self._after_commit, []
+        try:
+            if commit:
+                db.session.commit()
+            else:
+                db.session.rollback()
+        except BaseException:
+            db.session.rollback()
+            raise
+        finally:
+            _current_unit.reset(self._token)
+        if commit:
+            for callback in callbacks:
+                callback()
+
+
+def current_unit():
+    return _current_unit.get()
+
+
+def commit():
+    """Commit the session, or only flush it inside a unit of work"""
+    if _current_unit.get() is None:
+        db.session.commit()
+    else:
+        db.session.flush()
+
+
+@contextmanager
+def unit_of_work():
+    """Run a block in one transaction; inside an open unit, join it instead"""
+    unit = _current_unit.get()
+    if unit is not None:
+        yield unit
+        return
+    unit = UnitOfWork().open()
+    try:
+        yield unit
+    except BaseException:
+        unit.close(commit=False)
+        raise
+    unit.close()
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+
+import csv
+import io
+import json
+from datetime import datetime
+
+# Entity in the export URL -> (record type, facade repository attribute)
+EXPORT_ENTITIES = {
+    'users': ('user', 'user_repo'),
+    'amenities': ('amenity', 'amenity_repo'),
+    'places': ('place', 'place_repo'),
+    'reviews': ('review', 'review_repo'),
+}
+
+# Column renames so exported records can be fed back to the bulk import
+RENAMED_COLUMNS = {
+    'user': {'password': 'password_hash'},
+    'place': {'user_id': 'owner_id'},
+}
+
+# Characters of output buffered before a chunk is handed to the response
+FLUSH_SIZE = 64 * 1024
+
+
+def export_records(facade, entity, since=None, batch_size=1000):
+    """Return a generator of import-compatible records for every row of an entity's table"""
+    if entity not in EXPORT_ENTITIES:
+        raise ValueError(f"Unknown entity: {entity}")
+    kind, repo_name = EXPORT_ENTITIES[entity]
+    renames = RENAMED_COLUMNS.get(kind, {})
+
+    def records():
+        for rows in getattr(facade, repo_name).iter_row_batches(since, batch_size):
+            for row in rows:
+                record = {'type': kind}
+                for column, value in row.items():
+                    if isinstance(value, datetime):
+                        value = value.isoformat()
+                    record[renames.get(column, column)] = value
+                yield record
+    return records()
+
+
+def ndjson_chunks(records):
+    """Encode records as NDJSON, yielding chunks of about FLUSH_SIZE characters"""
+    buffer = []
+    size = 0
+    for record in records:
+        line = json.dumps(record) + '\n'
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_SIZE:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def csv_chunks(records):
+    """Encode records as CSV with a header row; lists are joined with ';'"""
+    buffer = io.StringIO()
+    writer = None
+    for record in records:
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(record))
+            writer.writeheader()
+        writer.writerow({key: ';'.join(value) if isinstance(value, list) else value
+                         for key, value in record.items()})
+        if buffer.tell() >= FLUSH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
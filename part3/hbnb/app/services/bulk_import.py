@@ -0,0 +1,262 @@
+#!/usr/bin/python3
+
+import json
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from sqlalchemy.exc import SQLAlchemyError
+from hbnb.app import db, password_hasher
+from hbnb.app.passwords import hash_rounds
+from hbnb.app.models.user import User
+from hbnb.app.models.amenity import Amenity
+from hbnb.app.models.place import Place
+from hbnb.app.models.review import Review
+
+
+def parse_datetime(value):
+    """Parse an ISO 8601 timestamp into the naive UTC datetimes the models store"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _base_row(record):
+    now = datetime.utcnow()
+    created_at = parse_datetime(record['created_at']) if record.get('created_at') else now
+    updated_at = parse_datetime(record['updated_at']) if record.get('updated_at') else created_at
+    return {'id': str(record.get('id') or uuid.uuid4()), 'created_at': created_at, 'updated_at': updated_at}
+
+
+def _prepare_user(record):
+    row = _base_row(record)
+    row.update(
+        first_name=User._validate_name(record['first_name'], "First"),
+        last_name=User._validate_name(record['last_name'], "Last"),
+        email=User._validate_email(record['email']),
+        is_admin=record.get('is_admin', False),
+    )
+    if not isinstance(row['is_admin'], bool):
+        raise ValueError("is_admin must be a boolean")
+    if ('password' in record) == ('password_hash' in record):
+        raise ValueError("Provide either a password or a password hash")
+    if 'password_hash' in record:
+        if hash_rounds(record['password_hash']) is None:
+            raise ValueError("Invalid password hash")
+        row['password'] = record['password_hash']
+        return row, None
+    User._validate_password(record['password'])
+    row['password'] = None  # Hashed for the whole chunk at once
+    return row, record['password']
+
+
+def _prepare_amenity(record):
+    row = _base_row(record)
+    row['name'] = Amenity._validate_name(record['name'])
+    return row, None
+
+
+def _prepare_place(record):
+    row = _base_row(record)
+    row.update(
+        title=Place.validate_title(record['title']),
+        description=record.get('description', ''),
+        price=Place.validate_price(float(record['price'])),
+        latitude=Place.validate_latitude(float(record['latitude'])),
+        longitude=Place.validate_longitude(float(record['longitude'])),
+        user_id=str(record['owner_id']),
+    )
+    amenity_names = [Amenity._validate_name(name) for name in record.get('amenities', [])]
+    return row, amenity_names
+
+
+def _prepare_review(record):
+    row = _base_row(record)
+    row.update(
+        text=Review._validate_text(record['text']),
+        rating=Review._validate_rating(int(record['rating'])),
+        user_id=str(record['user_id']),
+        place_id=str(record['place_id']),
+    )
+    return row, None
+
+
+# Record types, in the order their rows are written within a chunk
+PREPARERS = {
+    'user': _prepare_user,
+    'amenity': _prepare_amenity,
+    'place': _prepare_place,
+    'review': _prepare_review,
+}
+
+
+class BulkImporter:
+    """Loads NDJSON records into the database in chunked transactions.
+
+    Each line is an object with a "type" of user, amenity, place or review
+    and the fields the API accepts; ids and created_at/updated_at may be
+    given to keep references between records. Places list their amenities
+    by name, and amenities are created the first time a name is seen.
+    A line that fails validation, or that the database rejects, is
+    reported with its line number and the rest of the chunk is still
+    written.
+    """
+
+    def __init__(self, facade, chunk_size=1000, max_errors=1000):
+        self.facade = facade
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.imported = Counter()
+        self.errors = []
+        self.error_count = 0
+        self._pending = []  # (line number, type, row, extra) waiting for the next chunk
+        self._reviewed_places = set()  # Full-text index entries to refresh once at the end
+
+    def run(self, lines):
+        """Import an iterable of NDJSON lines (str or bytes) and return the report"""
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("Record must be a JSON object")
+                kind = record.get('type')
+                if kind not in PREPARERS:
+                    raise ValueError(f"Unknown record type: {kind}")
+                row, extra = PREPARERS[kind](record)
+            except KeyError as e:
+                self._error(line_number, f"Missing field: {e.args[0]}")
+            except (ValueError, TypeError) as e:
+                self._error(line_number, str(e))
+            else:
+                self._pending.append((line_number, kind, row, extra))
+                if len(self._pending) >= self.chunk_size:
+                    self._flush()
+        self._flush()
+        if self._reviewed_places:
+            self.facade.review_repo.index_text(list(self._reviewed_places))
+        return self.report()
+
+    def report(self):
+        return {
+            'imported': dict(self.imported),
+            'error_count': self.error_count,
+            'errors': [{'line': line, 'error': message} for line, message in self.errors],
+        }
+
+    def _error(self, line_number, message):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line_number, message))
+
+    def _flush(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        # Hash the chunk's plaintext passwords in parallel, once, before any retry
+        plain = [(index, extra) for index, (_, kind, _, extra) in enumerate(batch) if kind == 'user' and extra]
+        for (index, _), password_hash in zip(plain, password_hasher.hash_many([extra for _, extra in plain])):
+            line_number, kind, row, _ = batch[index]
+            row['password'] = password_hash
+            batch[index] = (line_number, kind, row, None)
+
+        try:
+            errors, counts = self._write(batch)
+            db.session.commit()
+        except SQLAlchemyError:
+            db.session.rollback()
+            # Write row by row to find the ones the database rejects
+            errors, counts = [], Counter()
+            for entry in batch:
+                try:
+                    row_errors, row_counts = self._write([entry])
+                    db.session.commit()
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    row_errors, row_counts = [(entry[0], str(getattr(e, 'orig', e)))], Counter()
+                errors.extend(row_errors)
+                counts.update(row_counts)
+
+        for line_number, message in sorted(errors):
+            self._error(line_number, message)
+        self.imported.update(counts)
+
+    def _write(self, batch):
+        """Insert one batch in the current transaction; return (row errors, counts by type)"""
+        by_type = {kind: [] for kind in PREPARERS}
+        for line_number, kind, row, extra in batch:
+            by_type[kind].append((line_number, row, extra))
+        errors, counts = [], Counter()
+
+        # Users: emails are unique within the batch and against the table
+        users = []
+        emails = self.facade.user_repo.get_existing('email', [row['email'] for _, row, _ in by_type['user']])
+        for line_number, row, _ in by_type['user']:
+            if row['email'] in emails:
+                errors.append((line_number, "Email already registered"))
+                continue
+            emails.add(row['email'])
+            users.append(row)
+        self.facade.user_repo.insert_rows(users)
+        counts['user'] = len(users)
+
+        # Amenities: get-or-create by name, for amenity records and place amenity lists
+        names = [row['name'] for _, row, _ in by_type['amenity']]
+        names += [name for _, _, place_names in by_type['place'] for name in place_names]
+        amenity_ids = self.facade.amenity_repo.get_ids_by_name(names) if names else {}
+        amenities = []
+        for _, row, _ in by_type['amenity']:
+            if row['name'] not in amenity_ids:
+                amenity_ids[row['name']] = row['id']
+                amenities.append(row)
+        for name in names:
+            if name not in amenity_ids:
+                row = _base_row({})
+                row['name'] = name
+                amenity_ids[name] = row['id']
+                amenities.append(row)
+        self.facade.amenity_repo.insert_rows(amenities)
+        counts['amenity'] = len(amenities)
+
+        # Places: the owner must exist already or come earlier in the batch
+        user_ids = {row['id'] for row in users}
+        user_ids |= self.facade.user_repo.get_existing(
+            'id', {row['user_id'] for _, row, _ in by_type['place'] + by_type['review']} - user_ids)
+        places, links = [], []
+        for line_number, row, place_names in by_type['place']:
+            if row['user_id'] not in user_ids:
+                errors.append((line_number, "Invalid owner ID"))
+                continue
+            places.append(row)
+            links.extend({'place_id': row['id'], 'amenity_id': amenity_ids[name]}
+                         for name in dict.fromkeys(place_names))
+        self.facade.place_repo.insert_rows(places, links)
+        counts['place'] = len(places)
+
+        # Reviews: the author and the place must exist, and as in the API an
+        # owner cannot review their own place nor a user review a place twice
+        owners = {row['id']: row['user_id'] for row in places}
+        owners.update(self.facade.place_repo.get_owner_ids(
+            {row['place_id'] for _, row, _ in by_type['review']} - owners.keys()))
+        reviewed = self.facade.review_repo.get_reviewed_pairs(
+            (row['user_id'], row['place_id']) for _, row, _ in by_type['review'])
+        reviews = []
+        for line_number, row, _ in by_type['review']:
+            if row['user_id'] not in user_ids or row['place_id'] not in owners:
+                errors.append((line_number, "Invalid user or place ID"))
+                continue
+            if owners[row['place_id']] == row['user_id']:
+                errors.append((line_number, "You cannot review your own place."))
+                continue
+            if (row['user_id'], row['place_id']) in reviewed:
+                errors.append((line_number, "You have already reviewed this place."))
+                continue
+            reviewed.add((row['user_id'], row['place_id']))
+            reviews.append(row)
+        self.facade.review_repo.insert_rows(reviews, index_text=False)
+        self._reviewed_places.update(row['place_id'] for row in reviews)
+        counts['review'] = len(reviews)
+
+        return errors, +counts
@@ -1,15 +1,28 @@
 #!/usr/bin/python3
 
+from flask import g
+from hbnb.app import password_hasher
 from hbnb.app.persistence.repository import InMemoryRepository
 from hbnb.app.models.user import User
 from hbnb.app.models.amenity import Amenity
 from hbnb.app.models.place import Place
 from hbnb.app.models.review import Review
-from hbnb.app.persistence.repository import SQLAlchemyRepository
+from hbnb.app.persistence.repository import SQLAlchemyRepository, decode_cursor, encode_cursor
+from hbnb.app.persistence.cache import ALL, InvalidationBus, create_backend, create_bus
+from hbnb.app.persistence.unit_of_work import UnitOfWork, current_unit, unit_of_work
 from hbnb.app.services.repositories.user_repo import UserRepository
 from hbnb.app.services.repositories.amenity_repo import AmenityRepository
 from hbnb.app.services.repositories.place_repo import PlaceRepository
 from hbnb.app.services.repositories.review_repo import ReviewRepository
+from hbnb.app.services.repositories.version_repo import VersionRepository
+from hbnb.app.services.principals import Principal, PrincipalCache
+from hbnb.app.services.response_cache import ResponseCache
+from hbnb.app.services.place_facets import PlaceFacetIndex
+from hbnb.app.services.bulk_import import BulkImporter
+from hbnb.app.services.bulk_export import export_records
+
+# Fields accepted for a new user; the password is given in clear and hashed here
+USER_FIELDS = frozenset({'first_name', 'last_name', 'email', 'password', 'is_admin'})
 
 class HBnBFacade:
     def __init__(self):
@@ -17,124 +30,456 @@ class HBnBFacade:
         self.amenity_repo = AmenityRepository()
         self.place_repo = PlaceRepository()
         self.review_repo = ReviewRepository()
+        self.version_repo = VersionRepository()
+        self.principals = PrincipalCache()
+        self.responses = ResponseCache()
+        self.place_facets = PlaceFacetIndex()
+        self.bus = InvalidationBus()
+        self._connect()
+
+    def init_app(self, app):
+        """Set up the response cache backend and the invalidation bus from the app config"""
+        path = app.config.get('CACHE_SQLITE_PATH')
+        backend = create_backend(app.config.get('CACHE_BACKEND', 'memory'), path,
+                                 app.config.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+        self.responses = ResponseCache(backend, app.config.get('RESPONSE_CACHE_TTL', 30))
+        self.bus = create_bus(app.config.get('CACHE_BUS', 'local'), path,
+                              app.config.get('CACHE_BUS_POLL_INTERVAL', 0.005),
+                              app.config.get('CACHE_BUS_RETENTION', 300))
+        self._connect()
+        # Catch up with other workers' writes before serving each request
+        app.before_request(self.bus.poll)
+        app.before_request(self._begin_request)
+        app.after_request(self._end_request)
+        app.teardown_request(self._teardown_request)
+
+    def unit_of_work(self):
+        """Context manager running a block of facade calls in one transaction.
+
+        Each request already runs in one: it commits once after a 2xx/3xx
+        response and rolls back on an error response or exception.
+        """
+        return unit_of_work()
+
+    def _begin_request(self):
+        g.unit_of_work = UnitOfWork().open()
+
+    def _end_request(self, response):
+        unit = g.pop('unit_of_work', None)
+        if unit is not None:
+            unit.close(commit=response.status_code < 400)
+        return response
+
+    def _teardown_request(self, exc=None):
+        unit = g.pop('unit_of_work', None)
+        if unit is not None:
+            unit.close(commit=False)
+
+    def _connect(self):
+        # A shared backend already reflects other workers' invalidations
+        self.bus.subscribe(self._invalidate_responses, remote=not self.responses.backend.shared)
+        self.bus.subscribe(self._invalidate_principals)
+
+    def _invalidate(self, *tags):
+        """Publish invalidation tags to the caches of every worker, once the current unit of work commits"""
+        unit = current_unit()
+        if unit is not None:
+            unit.after_commit(lambda: self.bus.publish(tags))
+        else:
+            self.bus.publish(tags)
+
+    def _invalidate_responses(self, tags):
+        tags = [tag for tag in tags if not tag.startswith('principal:')]
+        if tags:
+            self.responses.invalidate(*tags)
+
+    def _invalidate_principals(self, tags):
+        if ALL in tags:
+            self.principals.clear()
+        else:
+            self.principals.invalidate(*(tag.split(':', 1)[1] for tag in tags if tag.startswith('principal:')))
+
+    def import_records(self, lines, chunk_size=1000):
+        """Bulk-load NDJSON records (see BulkImporter) and return the import report"""
+        # The importer commits chunk by chunk itself
+        importer = BulkImporter(self, chunk_size)
+        report = importer.run(lines)
+        tables = {'user': 'users', 'amenity': 'amenities', 'place': 'places', 'review': 'reviews'}
+        if importer.imported:
+            with unit_of_work():
+                self._touch(*(tables[kind] for kind in importer.imported))
+                self.clear_caches()
+            # Bulk changes: rebuild the facet index from the tables on the next filter
+            self.place_facets.clear()
+        return report
+
+    def export_records(self, entity, since=None, batch_size=1000):
+        """Stream import-compatible records for an entity's table, optionally only rows updated since"""
+        return export_records(self, entity, since, batch_size)
+
+    def clear_caches(self):
+        """Drop every cached response and principal, in all workers"""
+        self._invalidate(ALL)
+
+    def get_table_versions(self, *tables):
+        """Return {table: (version, updated_at)}, used to validate cached collections"""
+        return self.version_repo.get_versions(tables)
+
+    def _touch(self, *tables):
+        # Part of the write's unit of work, so a new version never describes old rows
+        self.version_repo.bump(tables)
+
+    def _update_facets(self, tables, places=(), amenity_names=None):
+        """Apply a write to this worker's facet index once it commits; call after _touch(*tables)"""
+        # Read inside the write's transaction: exactly the versions it commits
+        versions = self.get_table_versions('places', 'amenities')
+        places = [(place.id, place.price, place.created_at, {amenity.id for amenity in place.amenities})
+                  for place in places]
+        apply = lambda: self.place_facets.apply(versions, tables, places, amenity_names)
+        unit = current_unit()
+        if unit is not None:
+            unit.after_commit(apply)
+        else:
+            apply()
 
     def create_user(self, user_data):
+        with unit_of_work():
+            # User.__init__ hashes the password, once
             user = User(**user_data)
-            user.hash_password(user_data['password'])
             self.user_repo.add(user)
+            self._touch('users')
             return user
 
-    def get_user(self, user_id):
-        return self.user_repo.get(user_id)
+    def create_users(self, users_data):
+        """Create several users at once, hashing their passwords in parallel"""
+        emails = [user_data['email'] for user_data in users_data]
+        if len(set(emails)) != len(emails) or self.user_repo.count({'email__in': emails}):
+            raise ValueError("Email already registered")
+
+        # Validate every user before paying for any hashing
+        for user_data in users_data:
+            unknown = set(user_data) - USER_FIELDS
+            if unknown:
+                raise ValueError(f"Unknown field: {sorted(unknown)[0]}")
+            missing = USER_FIELDS - {'is_admin'} - set(user_data)
+            if missing:
+                raise ValueError(f"Missing field: {sorted(missing)[0]}")
+            User._validate_name(user_data['first_name'], "First")
+            User._validate_name(user_data['last_name'], "Last")
+            User._validate_email(user_data['email'])
+            User._validate_password(user_data['password'])
+        hashes = password_hasher.hash_many([user_data['password'] for user_data in users_data])
+        users = [User(**{key: value for key, value in user_data.items() if key != 'password'},
+                      password_hash=password_hash)
+                 for user_data, password_hash in zip(users_data, hashes)]
+        with unit_of_work():
+            self.user_repo.add_all(users)
+            self._touch('users')
+        return users
+
+    def authenticate(self, email, password):
+        """Return the user for valid credentials, upgrading an outdated hash on the way"""
+        user = self.get_user_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+        if user.needs_rehash():
+            password_hash = password_hasher.hash(password)
+            with unit_of_work():
+                self.user_repo.update(user.id, {'password': password_hash})
+        return user
+
+    def get_user(self, user_id, profile=None):
+        return self.user_repo.get(user_id, profile)
+
+    def get_user_updated_at(self, user_id):
+        return self.user_repo.get_updated_at(user_id)
 
     def get_user_by_email(self, email):
         return self.user_repo.get_user_by_email(email)
 
+    def update_user(self, user_id, user_data):
+        user = self.get_user(user_id)
+        if not user:
+            return None
+        user_data = dict(user_data)
+        if 'password' in user_data:
+            user_data['password'] = password_hasher.hash(User._validate_password(user_data['password']))
+        with unit_of_work():
+            self.user_repo.update(user_id, user_data)
+            self._invalidate(f'principal:{user_id}', f'user:{user_id}')
+            self._touch('users')
+        return user
+
+    def get_principal(self, user_id):
+        """Return the cached Principal for a user, loading it on a miss"""
+        principal = self.principals.get(user_id)
+        if principal is None:
+            user = self.user_repo.get(user_id)
+            if not user:
+                return None
+            principal = Principal(user.id, bool(user.is_admin),
+                                  frozenset(self.place_repo.get_ids_by_owner(user.id)))
+            self.principals.set(principal)
+        return principal
+
     def get_all_users(self):
         return self.user_repo.get_all()
 
+    def get_users_by_ids(self, user_ids, profile=None):
+        return self.user_repo.get_many(user_ids, profile)
+
+    def get_users_page(self, limit, cursor=None, profile=None):
+        return self.user_repo.get_page(limit, cursor, profile)
+
+    def count_users(self):
+        return self.user_repo.count_estimate()
+
     def create_amenity(self, amenity_data):
-    # Placeholder for logic to create an amenity
-        amenity = Amenity(**amenity_data)
-        self.amenity_repo.add(amenity)
-        return amenity
+        # Placeholder for logic to create an amenity
+        with unit_of_work():
+            amenity = Amenity(**amenity_data)
+            self.amenity_repo.add(amenity)
+            self._touch('amenities')
+            self._update_facets(('amenities',), amenity_names={amenity.id: amenity.name})
+            self._invalidate('amenities')
+            return amenity
 
     def get_amenity(self, amenity_id):
         # Placeholder for logic to retrieve an amenity by ID
         return self.amenity_repo.get(amenity_id)
 
+    def get_amenity_updated_at(self, amenity_id):
+        return self.amenity_repo.get_updated_at(amenity_id)
+
     def get_all_amenities(self):
         # Placeholder for logic to retrieve all amenities
         return self.amenity_repo.get_all()
 
+    def get_amenities_by_ids(self, amenity_ids, profile=None):
+        return self.amenity_repo.get_many(amenity_ids, profile)
+
+    def get_amenities_page(self, limit, cursor=None, profile=None):
+        return self.amenity_repo.get_page(limit, cursor, profile)
+
+    def count_amenities(self):
+        return self.amenity_repo.count_estimate()
+
     def update_amenity(self, amenity_id, amenity_data):
         # Placeholder for logic to update an amenity
-        amenity = self.get_amenity(amenity_id)
-        if amenity:
-            amenity.update(amenity_data)
-            return amenity
-        return None
+        with unit_of_work():
+            amenity = self.get_amenity(amenity_id)
+            if amenity:
+                amenity.update(amenity_data)
+                self._touch('amenities')
+                self._update_facets(('amenities',), amenity_names={amenity.id: amenity.name})
+                self._invalidate(f'amenity:{amenity_id}')
+                return amenity
+            return None
 
     def create_place(self, place_data):
-    # Placeholder for logic to create a place, including validation for price, latitude, and longitude
-        owner = self.user_repo.get(place_data['owner_id'])
-        if not owner:
-            raise ValueError("Invalid owner ID")
-
-        amenities = [self.amenity_repo.get(aid) for aid in place_data['amenities']]
-        if None in amenities:
-            raise ValueError("Invalid amenity ID in amenities list")
-
-        place = Place(
-            title=place_data['title'],
-            description=place_data.get('description', ''),
-            price=place_data['price'],
-            latitude=place_data['latitude'],
-            longitude=place_data['longitude'],
-            owner=owner,
-            amenities=amenities
-        )
-        self.place_repo.add(place)
-        return place
-
-    def get_place(self, place_id):
-        # Placeholder for logic to retrieve a place by ID, including associated owner and amenities
-        return self.place_repo.get(place_id)
+        # Placeholder for logic to create a place, including validation for price, latitude, and longitude
+        with unit_of_work():
+            owner = self.user_repo.get(place_data['owner_id'])
+            if not owner:
+                raise ValueError("Invalid owner ID")
+
+            amenities = self.amenity_repo.get_many(place_data['amenities'])
+            if len(amenities) != len(set(place_data['amenities'])):
+                raise ValueError("Invalid amenity ID in amenities list")
+
+            place = Place(
+                title=place_data['title'],
+                description=place_data.get('description', ''),
+                price=place_data['price'],
+                latitude=place_data['latitude'],
+                longitude=place_data['longitude'],
+                owner=owner,
+                amenities=amenities
+            )
+            self.place_repo.add(place)
+            self._touch('places')
+            self._update_facets(('places',), places=[place])
+            self._invalidate(f'principal:{owner.id}', 'places')
+            return place
+
+    def get_place(self, place_id, profile=None):
+        # profile='detail' loads the owner and amenities along with the place;
+        # a Projection loads chosen columns and relationships instead
+        return self.place_repo.get(place_id, profile)
+
+    def get_place_updated_at(self, place_id):
+        return self.place_repo.get_updated_at(place_id)
 
     def get_all_places(self):
         # Placeholder for logic to retrieve all places
         return self.place_repo.get_all()
 
+    def get_places_by_ids(self, place_ids, profile=None):
+        return self.place_repo.get_many(place_ids, profile)
+
+    def get_places_page(self, limit, cursor=None, profile=None):
+        return self.place_repo.get_page(limit, cursor, profile)
+
+    def count_places(self):
+        return self.place_repo.count_estimate()
+
+    def filter_places(self, limit, cursor=None, min_price=None, max_price=None, amenity_ids=(), profile=None):
+        """Return (places, next_cursor, total, facets, current) for places in a price range having all the amenities.
+
+        facets maps every amenity id to (name, number of matching places offering it).
+        current is False when the facet index is still catching up with another
+        worker's writes and the matches come from its previous snapshot.
+        """
+        versions = self.get_table_versions('places', 'amenities')
+        index = self.place_facets.get(
+            versions, lambda: (*self.place_repo.get_facet_rows(), self.amenity_repo.get_names()))
+        for amenity_id in amenity_ids:
+            if amenity_id not in index.amenity_names:
+                raise ValueError(f"Unknown amenity ID: {amenity_id}")
+        matches = index.match(min_price, max_price, amenity_ids)
+        place_ids = index.page(matches, limit + 1, decode_cursor(cursor) if cursor else None)
+        places = self.place_repo.get_many(place_ids[:limit], profile)
+        next_cursor = encode_cursor(places[-1]) if len(place_ids) > limit and places else None
+        facets = {amenity_id: (index.amenity_names[amenity_id], count)
+                  for amenity_id, count in index.facets(matches).items()}
+        return places, next_cursor, matches.bit_count(), facets, index.versions == versions
+
     def update_place(self, place_id, place_data):
         # Placeholder for logic to update a place
-        place = self.get_place(place_id)
-        if place:
-            place.update(place_data)
-            return place
-        return None
+        with unit_of_work():
+            place = self.get_place(place_id)
+            if place:
+                if 'amenities' in place_data:
+                    amenities = self.amenity_repo.get_many(place_data['amenities'])
+                    if len(amenities) != len(set(place_data['amenities'])):
+                        raise ValueError("Invalid amenity ID in amenities list")
+                    place_data = dict(place_data, amenities=amenities)
+                previous_owner_id = place.user_id
+                place.update(place_data)
+                if place.user_id != previous_owner_id:
+                    self._invalidate(f'principal:{previous_owner_id}', f'principal:{place.user_id}')
+                if 'latitude' in place_data or 'longitude' in place_data:
+                    self.place_repo.index_location(place)
+                if 'title' in place_data or 'description' in place_data:
+                    self.place_repo.index_text(place)
+                self._touch('places')
+                self._update_facets(('places',), places=[place])
+                self._invalidate(f'place:{place_id}')
+                if 'price' in place_data or 'amenities' in place_data:
+                    self._invalidate('place_facets')
+                return place
+            return None
+
+    def search_places_near(self, lat, lon, radius_km, limit):
+        return self.place_repo.search_radius(lat, lon, radius_km, limit)
+
+    def search_places_in_bbox(self, min_lon, min_lat, max_lon, max_lat, limit):
+        return self.place_repo.search_bbox(min_lon, min_lat, max_lon, max_lat, limit)
+
+    def search_places_text(self, query, limit, offset=0):
+        return self.place_repo.search_text(query, limit, offset)
+
+    def rebuild_search_index(self):
+        with unit_of_work():
+            return self.place_repo.rebuild_search_index()
+
+    def rebuild_geo_index(self):
+        with unit_of_work():
+            return self.place_repo.rebuild_geo_index()
 
     def create_review(self, review_data):
-    # Placeholder for logic to create a review, including validation for user_id, place_id, and rating
-        user = self.user_repo.get(review_data['user_id'])
-        place = self.place_repo.get(review_data['place_id'])
-
-        if not user or not place:
-            raise ValueError("Invalid user or place ID")
-
-        review = Review(
-            text=review_data['text'],
-            rating=review_data['rating'],
-            user=user,
-            place=place
-        )
-        self.review_repo.add(review)
-        return review
-
-    def get_review(self, review_id):
-        # Placeholder for logic to retrieve a review by ID
-        return self.review_repo.get(review_id)
+        # Placeholder for logic to create a review, including validation for user_id, place_id, and rating
+        with unit_of_work():
+            user = self.user_repo.get(review_data['user_id'])
+            place = self.place_repo.get(review_data['place_id'])
+
+            if not user or not place:
+                raise ValueError("Invalid user or place ID")
+
+            review = Review(
+                text=review_data['text'],
+                rating=review_data['rating'],
+                user=user,
+                place=place
+            )
+            self.review_repo.add(review)
+            self._touch('reviews')
+            self._invalidate_place_reviews(review.place_id)
+            return review
+
+    def get_review(self, review_id, profile=None):
+        return self.review_repo.get(review_id, profile)
+
+    def get_review_updated_at(self, review_id):
+        return self.review_repo.get_updated_at(review_id)
 
     def get_all_reviews(self):
         # Placeholder for logic to retrieve all reviews
         return self.review_repo.get_all()
 
-    def get_reviews_by_place(self, place_id):
-        # Placeholder for logic to retrieve all reviews for a specific place
-        return [review for review in self.get_all_reviews() if review.place.id == place_id]
+    def get_reviews_by_ids(self, review_ids, profile=None):
+        return self.review_repo.get_many(review_ids, profile)
+
+    def get_reviews_page(self, limit, cursor=None, profile=None):
+        return self.review_repo.get_page(limit, cursor, profile)
+
+    def count_reviews(self):
+        return self.review_repo.count_estimate()
+
+    def get_reviews_by_place(self, place_id, profile=None):
+        return self.review_repo.find({'place_id': place_id}, order_by=['created_at', 'id'], profile=profile)
+
+    def _invalidate_place_reviews(self, *place_ids):
+        # Reviews show up in the place's review list and in its rating
+        self._invalidate(*(f'place:{place_id}' for place_id in place_ids),
+                         *(f'place_reviews:{place_id}' for place_id in place_ids))
+
+    def has_reviewed(self, user_id, place_id):
+        return self.review_repo.count({'user_id': user_id, 'place_id': place_id}) > 0
 
 
     def update_review(self, review_id, review_data):
         # Placeholder for logic to update a review
-        review = self.get_review(review_id)
-        if review:
-            review.update(review_data)
-            return review
-        return None
+        with unit_of_work():
+            review = self.get_review(review_id)
+            if review:
+                # Validate before touching the review: a flush must not hit the rating constraint
+                if 'text' in review_data:
+                    Review._validate_text(review_data['text'])
+                if 'rating' in review_data:
+                    Review._validate_rating(review_data['rating'])
+                place_id = review_data.get('place_id', review.place_id)
+                if place_id != review.place_id and self.place_repo.get_updated_at(place_id) is None:
+                    raise ValueError("Invalid place ID")
+                user_id = review_data.get('user_id', review.user_id)
+                if user_id != review.user_id and self.user_repo.get_updated_at(user_id) is None:
+                    raise ValueError("Invalid user ID")
+                old_place_id, old_rating = review.place_id, review.rating
+                review.update(review_data)
+                self.review_repo.move_rating(review, old_place_id, old_rating)
+                self._touch('reviews')
+                self._invalidate_place_reviews(old_place_id, review.place_id)
+                return review
+            return None
+
+    def get_place_ratings(self, place_ids):
+        return self.review_repo.get_rating_summaries(place_ids)
+
+    def rebuild_rating_summaries(self):
+        with unit_of_work():
+            count = self.review_repo.rebuild_rating_summaries()
+            self._touch('reviews')
+            self.clear_caches()
+            return count
 
     def delete_review(self, review_id):
         # Placeholder for logic to delete a review
-        review = self.get_review(review_id)
-        if review:
-            self.review_repo.delete(review_id)
-            return True
-        return False
\ No newline at end of file
+        with unit_of_work():
+            review = self.get_review(review_id)
+            if review:
+                place_id = review.place_id
+                self.review_repo.delete(review_id)
+                self._touch('reviews')
+                self._invalidate_place_reviews(place_id)
+                return True
+            return False
\ No newline at end of file
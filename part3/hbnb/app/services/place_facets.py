@@ -0,0 +1,201 @@
+#!/usr/bin/python3
+
+import bisect
+import copy
+import threading
+from collections import defaultdict
+from flask import current_app
+
+
+def bitmap_from_ordinals(ordinals, size):
+    """Build a bitmap (a Python int with bit i set for ordinal i) from ordinals below size"""
+    bits = bytearray((size + 7) // 8)
+    for ordinal in ordinals:
+        bits[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def lowest_ordinals(bitmap, count, start=0):
+    """Return up to count set ordinals of a bitmap, ascending, from start"""
+    bitmap >>= start
+    ordinals = []
+    while bitmap and len(ordinals) < count:
+        low = bitmap & -bitmap
+        ordinals.append(start + low.bit_length() - 1)
+        bitmap ^= low
+    return ordinals
+
+
+class FacetSnapshot:
+    """Bitmaps over the places as they were at one pair of table versions.
+
+    Places are numbered in (created_at, id) order, the order of list pages,
+    so ascending ordinals are already sorted for pagination.
+    """
+
+    def __init__(self, versions, places, links, amenity_names):
+        self.versions = versions
+        self.size = len(places)
+        self.ids = [place_id for place_id, _, _ in places]
+        self.keys = [(created_at, place_id) for place_id, _, created_at in places]
+        self.amenity_names = amenity_names
+        self.ordinals = {place_id: ordinal for ordinal, place_id in enumerate(self.ids)}
+
+        self._price_of = [price for _, price, _ in places]
+        by_price = sorted((price, ordinal) for ordinal, price in enumerate(self._price_of))
+        self._prices = [price for price, _ in by_price]
+        self._price_ordinals = [ordinal for _, ordinal in by_price]
+
+        members = defaultdict(list)
+        for place_id, amenity_id in links:
+            if place_id in self.ordinals:
+                members[amenity_id].append(self.ordinals[place_id])
+        self.amenities = {amenity_id: bitmap_from_ordinals(members.get(amenity_id, ()), self.size)
+                          for amenity_id in amenity_names}
+
+    def changed(self, versions, places=(), amenity_names=None):
+        """Copy of the snapshot with places added or updated and amenities added or renamed, or None.
+
+        places holds (id, price, created_at, set of amenity ids) tuples. A new place
+        must sort after every known one, as a newly created place does;
+        otherwise None is returned and the snapshot has to be rebuilt.
+        """
+        snapshot = copy.copy(self)
+        snapshot.versions = versions
+        if amenity_names or places:
+            snapshot.amenity_names = dict(self.amenity_names, **(amenity_names or {}))
+            snapshot.amenities = {amenity_id: self.amenities.get(amenity_id, 0)
+                                  for amenity_id in snapshot.amenity_names}
+        if places:
+            snapshot.ids, snapshot.keys = list(self.ids), list(self.keys)
+            snapshot.ordinals = dict(self.ordinals)
+            snapshot._price_of = list(self._price_of)
+            snapshot._prices, snapshot._price_ordinals = list(self._prices), list(self._price_ordinals)
+        for place_id, price, created_at, amenity_ids in places:
+            if not snapshot._set_place(place_id, price, created_at, amenity_ids):
+                return None
+        return snapshot
+
+    def _set_place(self, place_id, price, created_at, amenity_ids):
+        ordinal = self.ordinals.get(place_id)
+        if ordinal is None:
+            if self.keys and (created_at, place_id) < self.keys[-1]:
+                return False
+            ordinal = self.size
+            self.size += 1
+            self.ids.append(place_id)
+            self.keys.append((created_at, place_id))
+            self.ordinals[place_id] = ordinal
+            self._price_of.append(price)
+        else:
+            index = bisect.bisect_left(self._prices, self._price_of[ordinal])
+            while self._price_ordinals[index] != ordinal:
+                index += 1
+            del self._prices[index], self._price_ordinals[index]
+            self._price_of[ordinal] = price
+        index = bisect.bisect_right(self._prices, price)
+        self._prices.insert(index, price)
+        self._price_ordinals.insert(index, ordinal)
+        bit = 1 << ordinal
+        for amenity_id in self.amenities:
+            members = self.amenities[amenity_id] & ~bit
+            self.amenities[amenity_id] = members | bit if amenity_id in amenity_ids else members
+        return True
+
+    def match(self, min_price=None, max_price=None, amenity_ids=()):
+        """Bitmap of the places in the price range that have every one of the amenities"""
+        low = bisect.bisect_left(self._prices, min_price) if min_price is not None else 0
+        high = bisect.bisect_right(self._prices, max_price) if max_price is not None else self.size
+        if low == 0 and high == self.size:
+            bitmap = (1 << self.size) - 1
+        else:
+            bitmap = bitmap_from_ordinals(self._price_ordinals[low:high], self.size)
+        for amenity_id in amenity_ids:
+            bitmap &= self.amenities[amenity_id]
+        return bitmap
+
+    def page(self, bitmap, limit, after=None):
+        """Place ids of the first limit matches after a (created_at, id) position"""
+        start = bisect.bisect_right(self.keys, after) if after is not None else 0
+        return [self.ids[ordinal] for ordinal in lowest_ordinals(bitmap, limit, start)]
+
+    def facets(self, bitmap):
+        """Number of matching places offering each amenity"""
+        return {amenity_id: (bitmap & places).bit_count() for amenity_id, places in self.amenities.items()}
+
+
+class PlaceFacetIndex:
+    """Per-worker amenity bitmaps and price index for faceted place filtering.
+
+    "price <= 120 with wifi and a pool" becomes a bisect over sorted prices
+    and a few big-integer ANDs, and facet counts are popcounts, instead of a
+    place_amenity join per place. Writes made through this worker are
+    applied to the snapshot as they commit. When the table versions show a
+    write from elsewhere, the snapshot is rebuilt in a background thread and
+    the previous one keeps serving until the new one is ready.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    def get(self, versions, load):
+        """Return the snapshot to filter with; load() returns (places, links, amenity_names).
+
+        Compare the snapshot's versions with the current ones to know whether
+        it is up to date. Only the first call waits for a build.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = FacetSnapshot(versions, *load())
+                    self._snapshot = snapshot
+        elif snapshot.versions != versions:
+            self._rebuild_in_background(versions, load)
+        return snapshot
+
+    def apply(self, versions, tables, places=(), amenity_names=None):
+        """Apply a committed write to the snapshot.
+
+        versions are the table versions the write committed, tables the ones
+        it bumped. The snapshot takes them only if no other write happened
+        since it was built; otherwise it keeps its own versions and the next
+        get() rebuilds it.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None:
+                return
+            follows = all(snapshot.versions[table][0] == version - (table in tables)
+                          for table, (version, _) in versions.items())
+            self._snapshot = snapshot.changed(versions if follows else snapshot.versions, places, amenity_names)
+
+    def _rebuild_in_background(self, versions, load):
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        app = current_app._get_current_object()
+        threading.Thread(target=self._rebuild, args=(app, versions, load), daemon=True).start()
+
+    def _rebuild(self, app, versions, load):
+        try:
+            with app.app_context():
+                snapshot = FacetSnapshot(versions, *load())
+            with self._lock:
+                # Writes applied meanwhile may have moved the current snapshot past this one
+                current = self._snapshot
+                if current is None or all(version >= current.versions[table][0]
+                                          for table, (version, _) in versions.items()):
+                    self._snapshot = snapshot
+        except Exception:
+            app.logger.exception("Rebuilding the place facet index failed")
+        finally:
+            with self._lock:
+                self._rebuilding = False
+
+    def clear(self):
+        self._snapshot = None
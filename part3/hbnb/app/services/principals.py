@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from flask import current_app, has_app_context
+
+# What authenticated handlers need to know about the caller
+Principal = namedtuple('Principal', ['id', 'is_admin', 'place_ids'])
+
+
+class PrincipalCache:
+    """Per-process LRU of resolved principals, keyed by user id, with a TTL.
+
+    Entries live for PRINCIPAL_CACHE_TTL seconds (default 60) and are
+    dropped by the facade whenever a write changes a user or the owner of
+    a place.
+    """
+
+    def __init__(self, max_size=10000, default_ttl=60):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()  # user id -> (Principal, monotonic expiry)
+        self._lock = threading.Lock()
+
+    def _ttl(self):
+        if has_app_context():
+            return current_app.config.get('PRINCIPAL_CACHE_TTL', self.default_ttl)
+        return self.default_ttl
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return principal
+
+    def set(self, principal):
+        with self._lock:
+            self._entries[principal.id] = (principal, time.monotonic() + self._ttl())
+            self._entries.move_to_end(principal.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
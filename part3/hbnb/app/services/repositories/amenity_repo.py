@@ -1,8 +1,22 @@
 #!/usr/bin/python3
 
+from hbnb.app import db
 from hbnb.app.models.amenity import Amenity
 from hbnb.app.persistence.repository import SQLAlchemyRepository
 
 class AmenityRepository(SQLAlchemyRepository):
     def __init__(self):
-        super().__init__(Amenity)
\ No newline at end of file
+        super().__init__(Amenity)
+
+    def get_ids_by_name(self, names):
+        """Return {name: id} for the given names, the oldest amenity winning on duplicates"""
+        ids = {}
+        rows = db.session.query(Amenity.name, Amenity.id).filter(Amenity.name.in_(set(names))) \
+            .order_by(Amenity.created_at.desc())
+        for name, amenity_id in rows:
+            ids[name] = amenity_id
+        return ids
+
+    def get_names(self):
+        """Return {id: name} for every amenity"""
+        return dict(db.session.query(Amenity.id, Amenity.name))
@@ -1,8 +1,211 @@
 #!/usr/bin/python3
 
-from hbnb.app.models.place import Place
-from hbnb.app.persistence.repository import SQLAlchemyRepository
+import heapq
+from sqlalchemy import DDL, and_, event, or_, text
+from sqlalchemy.orm import selectinload
+from hbnb.app import db
+from hbnb.app.models.amenity import Amenity
+from hbnb.app.models.place import Place, place_amenity
+from hbnb.app.persistence.geo import geo_key, haversine_km, radius_boxes, split_antimeridian
+from hbnb.app.persistence.repository import IN_CHUNK_SIZE, SQLAlchemyRepository
+from hbnb.app.persistence.search import place_text_index, search_words
+from hbnb.app.persistence.unit_of_work import commit as commit_session
+
+# R*Tree over place coordinates. The integer key is derived from the place
+# UUID and the UUID itself is kept as an auxiliary column.
+GEO_INDEX_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS place_geo USING rtree("
+    "id, min_lat, max_lat, min_lon, max_lon, +place_id)"
+)
+
+# Built and dropped with the tables by db.create_all()/drop_all(), as schema.sql does
+event.listen(db.metadata, 'after_create', DDL(GEO_INDEX_DDL).execute_if(dialect='sqlite'))
+event.listen(db.metadata, 'before_drop', DDL("DROP TABLE IF EXISTS place_geo").execute_if(dialect='sqlite'))
+
 
 class PlaceRepository(SQLAlchemyRepository):
+    LOAD_PROFILES = {
+        'list': (),
+        'detail': (selectinload(Place.owner), selectinload(Place.amenities)),
+    }
+    INCLUDES = {
+        'owner': ('owner', ('user_id',)),
+        'amenities': ('amenities', ()),
+        'reviews': ('reviews', ()),
+    }
+
     def __init__(self):
-        super().__init__(Place)
\ No newline at end of file
+        super().__init__(Place)
+
+    def add(self, obj):
+        db.session.add(obj)
+        self.index_location(obj, commit=False)
+        self.index_text(obj, commit=False)
+        commit_session()
+        self._adjust_count(1)
+
+    def insert_rows(self, rows, amenity_links=()):
+        """Bulk insert places, their amenity links and their spatial and text index entries"""
+        super().insert_rows(rows)
+        if amenity_links:
+            db.session.execute(place_amenity.insert(), list(amenity_links))
+        if rows and self._use_rtree():
+            db.session.execute(text(
+                "INSERT OR REPLACE INTO place_geo VALUES (:key, :lat, :lat, :lon, :lon, :place_id)"
+            ), [{'key': geo_key(row['id']), 'lat': row['latitude'], 'lon': row['longitude'],
+                 'place_id': row['id']} for row in rows])
+        place_text_index.index_places(rows)
+
+    def iter_row_batches(self, since=None, batch_size=1000):
+        """Stream place rows, each with the names of its amenities"""
+        for rows in super().iter_row_batches(since, batch_size):
+            names = {row['id']: [] for row in rows}
+            links = db.session.execute(
+                db.select(place_amenity.c.place_id, Amenity.name)
+                .join(Amenity, Amenity.id == place_amenity.c.amenity_id)
+                .where(place_amenity.c.place_id.in_(list(names)))
+            )
+            for place_id, name in links:
+                names[place_id].append(name)
+            for row in rows:
+                row['amenities'] = sorted(names[row['id']])
+            yield rows
+
+    def get_facet_rows(self):
+        """Return (id, price, created_at) of every place in page order, and every (place_id, amenity_id) link"""
+        places = db.session.execute(
+            db.select(Place.id, Place.price, Place.created_at).order_by(Place.created_at, Place.id)).all()
+        links = db.session.execute(db.select(place_amenity.c.place_id, place_amenity.c.amenity_id)).all()
+        return places, links
+
+    def get_ids_by_owner(self, owner_id):
+        return [row[0] for row in db.session.query(Place.id).filter(Place.user_id == owner_id)]
+
+    def get_owner_ids(self, place_ids):
+        """Return {place_id: owner id} for the stored places among place_ids"""
+        place_ids = list(set(place_ids))
+        owners = {}
+        for start in range(0, len(place_ids), IN_CHUNK_SIZE):
+            chunk = place_ids[start:start + IN_CHUNK_SIZE]
+            owners.update(db.session.execute(db.select(Place.id, Place.user_id).where(Place.id.in_(chunk))).all())
+        return owners
+
+    def _use_rtree(self):
+        """Whether the R*Tree index is available on the current engine"""
+        return db.engine.dialect.name == 'sqlite'
+
+    def index_location(self, place, commit=True):
+        """Insert or move a place in the spatial index"""
+        if self._use_rtree():
+            db.session.execute(text(
+                "INSERT OR REPLACE INTO place_geo VALUES (:key, :lat, :lat, :lon, :lon, :place_id)"
+            ), {'key': geo_key(place.id), 'lat': place.latitude,
+                'lon': place.longitude, 'place_id': place.id})
+            if commit:
+                commit_session()
+
+    def index_text(self, place, commit=True):
+        """Insert or refresh a place's title and description in the full-text index"""
+        place_text_index.index_places([{'id': place.id, 'title': place.title, 'description': place.description}])
+        if commit:
+            commit_session()
+
+    def rebuild_search_index(self):
+        """Drop and repopulate the full-text index from the places and reviews tables"""
+        count = place_text_index.rebuild()
+        commit_session()
+        return count
+
+    def search_text(self, query, limit, offset=0):
+        """Return ([(place, score, snippet)], total) for places matching every word, best first"""
+        if place_text_index.available():
+            matches, total = place_text_index.search(query, limit, offset)
+            places = {place.id: place for place in self.get_many([place_id for place_id, _, _ in matches])}
+            return [(places[place_id], score, snippet)
+                    for place_id, score, snippet in matches if place_id in places], total
+        # Without FTS5: every word must appear in the title or description, unranked
+        conditions = [or_(self.model.title.ilike(f'%{word}%'), self.model.description.ilike(f'%{word}%'))
+                      for word in search_words(query)]
+        places = self.model.query.filter(and_(*conditions))
+        total = places.count()
+        return [(place, None, None) for place in
+                places.order_by(self.model.created_at, self.model.id).offset(offset).limit(limit)], total
+
+    def rebuild_geo_index(self):
+        """Drop and repopulate the spatial index from the places table"""
+        if db.engine.dialect.name != 'sqlite':
+            return 0
+        db.session.execute(text("DROP TABLE IF EXISTS place_geo"))
+        db.session.execute(text(GEO_INDEX_DDL))
+        rows = db.session.query(Place.id, Place.latitude, Place.longitude).all()
+        if rows:
+            db.session.execute(text(
+                "INSERT INTO place_geo VALUES (:key, :lat, :lat, :lon, :lon, :place_id)"
+            ), [{'key': geo_key(place_id), 'lat': lat, 'lon': lon, 'place_id': place_id}
+                for place_id, lat, lon in rows])
+        commit_session()
+        return len(rows)
+
+    def _nearest(self, boxes, lat, lon, limit, radius_km=None):
+        """Return [(place, distance_km)] for the places inside the boxes, nearest first.
+
+        Bounds, distance, ordering and the limit are applied in SQL; only the
+        places returned are loaded as rows.
+        """
+        if self._use_rtree():
+            nearest = self._nearest_rtree(boxes, lat, lon, limit, radius_km)
+        else:
+            nearest = self._nearest_scan(boxes, lat, lon, limit, radius_km)
+        places = {place.id: place for place in self.get_many([place_id for place_id, _ in nearest])}
+        return [(places[place_id], distance) for place_id, distance in nearest if place_id in places]
+
+    def _nearest_rtree(self, boxes, lat, lon, limit, radius_km):
+        # Per connection, and cheap to repeat: pooled connections may predate the first search
+        db.session.connection().connection.driver_connection.create_function(
+            'haversine_km', 4, haversine_km, deterministic=True)
+        # R*Tree bounds are float32 rounded outwards, so test for overlap, then check the exact
+        # coordinates. A point on the antimeridian can fall in both boxes: UNION drops the duplicate.
+        params = {'lat': lat, 'lon': lon, 'radius_km': radius_km, 'limit': limit}
+        selects = []
+        for index, (min_lat, min_lon, max_lat, max_lon) in enumerate(boxes):
+            selects.append(
+                f"SELECT p.id AS id, haversine_km(:lat, :lon, p.latitude, p.longitude) AS distance "
+                f"FROM place_geo g JOIN places p ON p.id = g.place_id "
+                f"WHERE g.max_lat >= :min_lat_{index} AND g.min_lat <= :max_lat_{index} "
+                f"AND g.max_lon >= :min_lon_{index} AND g.min_lon <= :max_lon_{index} "
+                f"AND p.latitude BETWEEN :min_lat_{index} AND :max_lat_{index} "
+                f"AND p.longitude BETWEEN :min_lon_{index} AND :max_lon_{index}")
+            params.update({f'min_lat_{index}': min_lat, f'max_lat_{index}': max_lat,
+                           f'min_lon_{index}': min_lon, f'max_lon_{index}': max_lon})
+        rows = db.session.execute(text(
+            f"SELECT id, distance FROM ({' UNION '.join(selects)}) "
+            f"WHERE :radius_km IS NULL OR distance <= :radius_km ORDER BY distance, id LIMIT :limit"
+        ), params)
+        return [(place_id, distance) for place_id, distance in rows]
+
+    def _nearest_scan(self, boxes, lat, lon, limit, radius_km):
+        # Without the R*Tree: range query on the coordinate columns, distances over (id, lat, lon) only
+        rows = db.session.query(self.model.id, self.model.latitude, self.model.longitude).filter(or_(*[
+            and_(self.model.latitude.between(min_lat, max_lat),
+                 self.model.longitude.between(min_lon, max_lon))
+            for min_lat, min_lon, max_lat, max_lon in boxes
+        ]))
+        distances = ((place_id, haversine_km(lat, lon, place_lat, place_lon))
+                     for place_id, place_lat, place_lon in rows)
+        return heapq.nsmallest(limit, (result for result in distances
+                                       if radius_km is None or result[1] <= radius_km),
+                               key=lambda result: (result[1], result[0]))
+
+    def search_radius(self, lat, lon, radius_km, limit):
+        """Return [(place, distance_km)] within radius_km, nearest first"""
+        return self._nearest(radius_boxes(lat, lon, radius_km), lat, lon, limit, radius_km)
+
+    def search_bbox(self, min_lon, min_lat, max_lon, max_lat, limit):
+        """Return [(place, distance_km)] inside the box, nearest to its centre first"""
+        boxes = split_antimeridian(min_lat, min_lon, max_lat, max_lon)
+        center_lon = (min_lon + max_lon) / 2
+        if min_lon > max_lon:
+            center_lon = (min_lon + max_lon + 360) / 2
+            if center_lon > 180:
+                center_lon -= 360
+        return self._nearest(boxes, (min_lat + max_lat) / 2, center_lon, limit)
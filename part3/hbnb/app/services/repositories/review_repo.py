@@ -1,8 +1,171 @@
 #!/usr/bin/python3
 
+from collections import defaultdict
+from sqlalchemy import bindparam, case, func, insert, tuple_, update
+from hbnb.app import db
 from hbnb.app.models.review import Review
-from hbnb.app.persistence.repository import SQLAlchemyRepository
+from hbnb.app.models.place_rating import PlaceRating
+from hbnb.app.persistence.repository import IN_CHUNK_SIZE, SQLAlchemyRepository
+from hbnb.app.persistence.search import place_text_index
+from hbnb.app.persistence.unit_of_work import commit as commit_session
 
 class ReviewRepository(SQLAlchemyRepository):
+    # Review responses only carry user_id/place_id, so no relationship is loaded
+    LOAD_PROFILES = {
+        'list': (),
+    }
+    INCLUDES = {
+        'user': ('user', ('user_id',)),
+        'place': ('place', ('place_id',)),
+    }
+
     def __init__(self):
-        super().__init__(Review)
\ No newline at end of file
+        super().__init__(Review)
+
+    def add(self, obj):
+        db.session.add(obj)
+        self._apply_rating(obj.place_id, obj.rating, 1)
+        db.session.flush()
+        place_text_index.index_reviews([obj.place_id])
+        commit_session()
+        self._adjust_count(1)
+
+    def delete(self, obj_id):
+        obj = self.get(obj_id)
+        if obj:
+            self._apply_rating(obj.place_id, obj.rating, -1)
+            db.session.delete(obj)
+            db.session.flush()
+            place_text_index.index_reviews([obj.place_id])
+            commit_session()
+            self._adjust_count(-1)
+
+    def insert_rows(self, rows, index_text=True):
+        """Bulk insert reviews and fold their ratings into the place summaries.
+
+        With index_text=False the caller refreshes the full-text index later
+        with index_text(), once per place rather than once per batch.
+        """
+        super().insert_rows(rows)
+        if index_text:
+            self.index_text([row['place_id'] for row in rows], commit=False)
+        totals = defaultdict(lambda: [0] * 5)
+        for row in rows:
+            totals[row['place_id']][row['rating'] - 1] += 1
+        if not totals:
+            return
+        existing = self._summarized_place_ids(list(totals))
+        params = [{
+            'b_place_id': place_id,
+            'b_count': sum(stars),
+            'b_sum': sum(count * rating for rating, count in enumerate(stars, 1)),
+            **{f'b_stars_{rating}': count for rating, count in enumerate(stars, 1)},
+        } for place_id, stars in totals.items()]
+        table = PlaceRating.__table__
+        updates = [param for param in params if param['b_place_id'] in existing]
+        if updates:
+            db.session.execute(
+                table.update()
+                .where(table.c.place_id == bindparam('b_place_id'))
+                .values(review_count=table.c.review_count + bindparam('b_count'),
+                        rating_sum=table.c.rating_sum + bindparam('b_sum'),
+                        **{f'stars_{rating}': table.c[f'stars_{rating}'] + bindparam(f'b_stars_{rating}')
+                           for rating in range(1, 6)}),
+                updates
+            )
+        inserts = [{
+            'place_id': param['b_place_id'],
+            'review_count': param['b_count'],
+            'rating_sum': param['b_sum'],
+            **{f'stars_{rating}': param[f'b_stars_{rating}'] for rating in range(1, 6)},
+        } for param in params if param['b_place_id'] not in existing]
+        if inserts:
+            db.session.execute(table.insert(), inserts)
+
+    def index_text(self, place_ids, commit=True):
+        """Refresh the review text of the given places in the full-text index"""
+        place_text_index.index_reviews(place_ids)
+        if commit:
+            commit_session()
+
+    def get_reviewed_pairs(self, pairs):
+        """Return the (user_id, place_id) pairs among pairs that already have a review"""
+        pairs = list(set(pairs))
+        key = tuple_(Review.user_id, Review.place_id)
+        found = set()
+        # Each pair binds two parameters
+        for start in range(0, len(pairs), IN_CHUNK_SIZE // 2):
+            chunk = pairs[start:start + IN_CHUNK_SIZE // 2]
+            found.update(tuple(row) for row in db.session.execute(
+                db.select(Review.user_id, Review.place_id).where(key.in_(chunk))))
+        return found
+
+    def _summarized_place_ids(self, place_ids):
+        """Places among place_ids that already have a summary row"""
+        found = set()
+        for start in range(0, len(place_ids), IN_CHUNK_SIZE):
+            chunk = place_ids[start:start + IN_CHUNK_SIZE]
+            found.update(db.session.execute(
+                db.select(PlaceRating.place_id).where(PlaceRating.place_id.in_(chunk))).scalars())
+        return found
+
+    def move_rating(self, review, old_place_id, old_rating):
+        """Save an updated review together with the matching summary and text index changes"""
+        if (review.place_id, review.rating) != (old_place_id, old_rating):
+            self._apply_rating(old_place_id, old_rating, -1)
+            self._apply_rating(review.place_id, review.rating, 1)
+        db.session.flush()
+        place_text_index.index_reviews([old_place_id, review.place_id])
+        commit_session()
+
+    def _apply_rating(self, place_id, rating, delta):
+        """Add (or with delta=-1 remove) one rating to the place summary in the current transaction"""
+        star = PlaceRating.star_column(rating)
+        result = db.session.execute(
+            update(PlaceRating)
+            .where(PlaceRating.place_id == place_id)
+            .values({
+                'review_count': PlaceRating.review_count + delta,
+                'rating_sum': PlaceRating.rating_sum + delta * rating,
+                star: getattr(PlaceRating, star) + delta,
+            })
+        )
+        if result.rowcount == 0 and delta > 0:
+            db.session.add(PlaceRating(place_id=place_id, review_count=1, rating_sum=rating,
+                                       **{PlaceRating.star_column(stars): int(stars == rating)
+                                          for stars in range(1, 6)}))
+
+    def get_rating_summaries(self, place_ids):
+        """Return {place_id: PlaceRating} for the given places in one query"""
+        if not place_ids:
+            return {}
+        summaries = PlaceRating.query.filter(PlaceRating.place_id.in_(place_ids)).all()
+        return {summary.place_id: summary for summary in summaries}
+
+    def rebuild_rating_summaries(self):
+        """Recompute every place summary from the reviews table"""
+        self._summarize()
+        commit_session()
+        return PlaceRating.query.count()
+
+    def _summarize(self, place_ids=None):
+        """Replace the summaries of the given places (default: all) with totals from their reviews"""
+        delete = PlaceRating.__table__.delete()
+        if place_ids is not None:
+            delete = delete.where(PlaceRating.place_id.in_(place_ids))
+        db.session.execute(delete)
+        columns = [
+            Review.place_id,
+            func.count(Review.id),
+            func.sum(Review.rating),
+        ] + [func.sum(case((Review.rating == stars, 1), else_=0)) for stars in range(1, 6)]
+        select = db.select(*columns).group_by(Review.place_id)
+        if place_ids is not None:
+            select = select.where(Review.place_id.in_(place_ids))
+        db.session.execute(
+            insert(PlaceRating).from_select(
+                ['place_id', 'review_count', 'rating_sum'] +
+                [PlaceRating.star_column(stars) for stars in range(1, 6)],
+                select
+            )
+        )
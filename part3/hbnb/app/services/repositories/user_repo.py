@@ -4,6 +4,10 @@ from hbnb.app.models.user import User
 from hbnb.app.persistence.repository import SQLAlchemyRepository
 
 class UserRepository(SQLAlchemyRepository):
+    INCLUDES = {
+        'places': ('places', ()),
+    }
+
     def __init__(self):
         super().__init__(User)
 
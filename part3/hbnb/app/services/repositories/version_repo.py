@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+
+from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from hbnb.app import db
+from hbnb.app.models.table_version import TableVersion
+from hbnb.app.persistence.unit_of_work import commit
+
+
+class VersionRepository:
+    """Per-table write counters shared by every worker through the database"""
+
+    def get_versions(self, names):
+        """Return {name: (version, updated_at)}; tables never written report (0, None)"""
+        rows = db.session.query(TableVersion.name, TableVersion.version, TableVersion.updated_at) \
+            .filter(TableVersion.name.in_(names)).all()
+        versions = {name: (0, None) for name in names}
+        versions.update((name, (version, updated_at)) for name, version, updated_at in rows)
+        return versions
+
+    def bump(self, names):
+        """Increment the counters of the given tables, in the current unit of work"""
+        now = datetime.utcnow()
+        for name in names:
+            if self._increment(name, now):
+                continue
+            try:
+                with db.session.begin_nested():
+                    db.session.add(TableVersion(name=name, version=1, updated_at=now))
+            except IntegrityError:
+                # Another worker created the counter first; count this write against it
+                self._increment(name, now)
+        commit()
+
+    def _increment(self, name, now):
+        result = db.session.execute(
+            update(TableVersion)
+            .where(TableVersion.name == name)
+            .values(version=TableVersion.version + 1, updated_at=now)
+        )
+        return result.rowcount > 0
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+
+import json
+import threading
+from collections import namedtuple
+from hbnb.app.persistence.cache import ALL, MemoryCacheBackend
+
+# A serialized GET response, ready to be sent again
+CachedResponse = namedtuple('CachedResponse', ['body', 'status', 'headers'])
+
+
+def encode_response(response):
+    """Pack a CachedResponse into bytes: a JSON header line, then the body"""
+    head = json.dumps([response.status, response.headers]).encode('utf-8')
+    return head + b'\n' + response.body
+
+
+def decode_response(value):
+    head, _, body = bytes(value).partition(b'\n')
+    status, headers = json.loads(head)
+    return CachedResponse(body, status, [tuple(header) for header in headers])
+
+
+class ResponseCache:
+    """Serialized responses, keyed by route and query string, stored in a CacheBackend.
+
+    Entries carry tags such as 'places' (a collection) or 'place:<id>' (one
+    entity); the facade invalidates tags as it writes. Entries expire after
+    RESPONSE_CACHE_TTL seconds (0 disables the cache) and the backend evicts
+    beyond RESPONSE_CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, backend=None, ttl=30):
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self._hits = self._misses = self._invalidations = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.ttl > 0
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return decode_response(value)
+
+    def generation(self):
+        """Invalidation generation to read before building a response (see CacheBackend)"""
+        return self.backend.generation()
+
+    def set(self, key, response, tags, generation=None):
+        self.backend.set(key, encode_response(response), self.ttl, tags, generation)
+
+    def invalidate(self, *tags):
+        """Drop every entry carrying any of the given tags"""
+        if ALL in tags:
+            self.clear()
+            return
+        dropped = self.backend.invalidate(tags)
+        with self._lock:
+            self._invalidations += dropped
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            stats = {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else None,
+                'invalidations': self._invalidations,
+            }
+        stats.update(self.backend.stats())
+        return stats
@@ -55,6 +55,46 @@ CREATE TABLE place_amenity (
     FOREIGN KEY (amenity_id) REFERENCES amenities(id)
 );
 
+-- Create Place_Ratings table (review totals per place, maintained by ReviewRepository)
+CREATE TABLE place_ratings (
+    place_id CHAR(36) PRIMARY KEY,
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    stars_1 INT NOT NULL DEFAULT 0,
+    stars_2 INT NOT NULL DEFAULT 0,
+    stars_3 INT NOT NULL DEFAULT 0,
+    stars_4 INT NOT NULL DEFAULT 0,
+    stars_5 INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (place_id) REFERENCES places(id)
+);
+
+-- Write counters per table, used as collection ETags
+CREATE TABLE table_versions (
+    name VARCHAR(64) PRIMARY KEY,
+    version INT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL
+);
+
+-- Keyset pagination indexes on (created_at, id)
+CREATE INDEX ix_users_created_at_id ON users (created_at, id);
+CREATE INDEX ix_places_created_at_id ON places (created_at, id);
+CREATE INDEX ix_reviews_created_at_id ON reviews (created_at, id);
+CREATE INDEX ix_amenities_created_at_id ON amenities (created_at, id);
+
+-- Lookup of a user's places and a place's reviews
+CREATE INDEX ix_places_user_id ON places (owner_id);
+
+-- Price range filters
+CREATE INDEX ix_places_price ON places (price);
+CREATE INDEX ix_reviews_place_id ON reviews (place_id);
+
+-- Spatial index for place search (SQLite R*Tree, kept in sync by PlaceRepository)
+CREATE INDEX ix_places_lat_lon ON places (latitude, longitude);
+CREATE VIRTUAL TABLE place_geo USING rtree(id, min_lat, max_lat, min_lon, max_lon, +place_id);
+
+-- Full-text index of place titles, descriptions and review text (SQLite FTS5, kept in sync by the repositories)
+CREATE VIRTUAL TABLE place_search USING fts5(place_id UNINDEXED, title, description, reviews, tokenize='porter unicode61');
+
 -- Insert initial admin user
 INSERT INTO users (
     id,
@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+
+import json
+import os
+import tempfile
+import unittest
+from config import Config
+from hbnb.app import create_app, db
+from hbnb.app.services import facade
+
+
+class BulkImportConfig(Config):
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    PASSWORD_HASH_WORKERS = 0
+    BCRYPT_LOG_ROUNDS = 4
+    RESPONSE_CACHE_TTL = 0
+
+
+def user(user_id, email, **fields):
+    return dict({'type': 'user', 'id': user_id, 'first_name': 'Ada', 'last_name': 'Lovelace',
+                 'email': email, 'password': 'secret'}, **fields)
+
+
+def place(place_id, owner_id, **fields):
+    return dict({'type': 'place', 'id': place_id, 'title': 'Loft', 'price': 100,
+                 'latitude': 48.85, 'longitude': 2.35, 'owner_id': owner_id}, **fields)
+
+
+def review(user_id, place_id, **fields):
+    return dict({'type': 'review', 'text': 'Great stay', 'rating': 5,
+                 'user_id': user_id, 'place_id': place_id}, **fields)
+
+
+class TestBulkImport(unittest.TestCase):
+    """Test cases for the NDJSON importer"""
+
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        config = type('Config', (BulkImportConfig,), {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{self.db_path}'})
+        self.app = create_app(config)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.context.pop()
+        os.remove(self.db_path)
+
+    def run_import(self, *records, chunk_size=1000):
+        lines = [record if isinstance(record, str) else json.dumps(record) for record in records]
+        return facade.import_records(lines, chunk_size)
+
+    def errors(self, report):
+        return [(error['line'], error['error']) for error in report['errors']]
+
+    def test_line_errors(self):
+        """Test that invalid lines are reported by number and the valid ones imported"""
+        report = self.run_import(
+            user('u1', 'ada@example.com'),
+            '{not json',
+            '[1, 2]',
+            {'type': 'booking'},
+            {'type': 'amenity'},
+            user('u2', 'alan@example.com', is_admin='false'),
+            user('u3', 'grace@example.com', first_name=''),
+            place('p1', 'missing-owner'),
+            {'type': 'amenity', 'name': 'Wifi'},
+        )
+        self.assertEqual(report['imported'], {'user': 1, 'amenity': 1})
+        self.assertEqual(report['error_count'], 7)
+        lines = [line for line, _ in self.errors(report)]
+        self.assertEqual(lines, [2, 3, 4, 5, 6, 7, 8])
+        self.assertIn((5, 'Missing field: name'), self.errors(report))
+        self.assertIn((6, 'is_admin must be a boolean'), self.errors(report))
+        self.assertIn((8, 'Invalid owner ID'), self.errors(report))
+
+    def test_is_admin_accepts_booleans(self):
+        """Test that JSON booleans set is_admin and a missing value means a regular user"""
+        self.run_import(user('u1', 'ada@example.com', is_admin=True),
+                        user('u2', 'alan@example.com', is_admin=False),
+                        user('u3', 'grace@example.com'))
+        self.assertEqual([facade.get_user(user_id).is_admin for user_id in ('u1', 'u2', 'u3')],
+                         [True, False, False])
+
+    def test_rejected_row_retried_alone(self):
+        """Test that a row the database rejects fails alone and the rest of its chunk is written"""
+        self.run_import(user('u1', 'ada@example.com'))
+        report = self.run_import(user('u2', 'alan@example.com'), user('u1', 'grace@example.com'),
+                                 user('u3', 'hedy@example.com'))
+        self.assertEqual(report['imported'], {'user': 2})
+        self.assertEqual([line for line, _ in self.errors(report)], [2])
+        self.assertIn('UNIQUE constraint failed', report['errors'][0]['error'])
+        self.assertIsNotNone(facade.get_user('u3'))
+
+    def test_duplicate_email_rejected(self):
+        """Test that an email taken in the table or earlier in the batch is rejected"""
+        self.run_import(user('u1', 'ada@example.com'))
+        report = self.run_import(user('u2', 'ada@example.com'), user('u3', 'alan@example.com'),
+                                 user('u4', 'alan@example.com'))
+        self.assertEqual(report['imported'], {'user': 1})
+        self.assertEqual(self.errors(report), [(1, 'Email already registered'), (3, 'Email already registered')])
+
+    def test_owner_cannot_review_own_place(self):
+        """Test that a review by the place's owner is rejected, as the API does"""
+        self.run_import(user('u1', 'ada@example.com'), place('p1', 'u1'))
+        report = self.run_import(place('p2', 'u1'), review('u1', 'p1'), review('u1', 'p2'))
+        self.assertEqual(report['imported'], {'place': 1})
+        self.assertEqual(self.errors(report), [(2, 'You cannot review your own place.'),
+                                               (3, 'You cannot review your own place.')])
+
+    def test_one_review_per_user_and_place(self):
+        """Test that a second review of a place by the same user is rejected, stored or in the batch"""
+        self.run_import(user('u1', 'ada@example.com'), user('u2', 'alan@example.com'),
+                        user('u3', 'grace@example.com'), place('p1', 'u1'), review('u2', 'p1'))
+        report = self.run_import(review('u2', 'p1'), review('u3', 'p1'), review('u3', 'p1', rating=1))
+        self.assertEqual(report['imported'], {'review': 1})
+        self.assertEqual(self.errors(report), [(1, 'You have already reviewed this place.'),
+                                               (3, 'You have already reviewed this place.')])
+        summary = facade.review_repo.get_rating_summaries(['p1'])['p1']
+        self.assertEqual((summary.review_count, summary.rating_sum), (2, 10))
+
+    def test_review_rules_across_chunks(self):
+        """Test that the review rules hold when the records are split over several chunks"""
+        report = self.run_import(user('u1', 'ada@example.com'), user('u2', 'alan@example.com'),
+                                 place('p1', 'u1'), review('u2', 'p1'), review('u2', 'p1'),
+                                 review('u1', 'p1'), chunk_size=2)
+        self.assertEqual(report['imported'], {'user': 2, 'place': 1, 'review': 1})
+        self.assertEqual(self.errors(report), [(5, 'You have already reviewed this place.'),
+                                               (6, 'You cannot review your own place.')])
+
+
+if __name__ == '__main__':
+    unittest.main()
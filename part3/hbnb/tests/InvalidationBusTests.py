@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from hbnb.app.persistence.cache import ALL, InvalidationBus, MemoryCacheBackend, SQLiteInvalidationBus
+
+
+class TestInvalidationBus(unittest.TestCase):
+    """Test cases for the in-process invalidation bus"""
+
+    def test_publish_delivers_locally(self):
+        """Test that publish calls every subscriber and poll does nothing"""
+        bus = InvalidationBus()
+        received, local_only = [], []
+        bus.subscribe(received.extend)
+        bus.subscribe(local_only.extend, remote=False)
+        bus.publish(['places'])
+        bus.publish([])
+        bus.poll()
+        self.assertEqual(received, ['places'])
+        self.assertEqual(local_only, ['places'])
+
+
+class TestSQLiteInvalidationBus(unittest.TestCase):
+    """Test cases for the invalidation log shared by worker processes"""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.first = SQLiteInvalidationBus(self.path, poll_interval=0)
+        self.second = SQLiteInvalidationBus(self.path, poll_interval=0)
+        self.first_received, self.second_received = [], []
+        self.first.subscribe(self.first_received.append)
+        self.second.subscribe(self.second_received.append)
+        # The first poll only finds the end of the log
+        self.first.poll()
+        self.second.poll()
+
+    def tearDown(self):
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_other_worker_receives_after_poll(self):
+        """Test that a published tag reaches the publisher at once and the other worker on poll"""
+        self.first.publish(['places', 'place_facets'])
+        self.assertEqual(self.first_received, [['places', 'place_facets']])
+        self.assertEqual(self.second_received, [])
+        self.second.poll()
+        self.assertEqual(self.second_received, [['places', 'place_facets']])
+        self.second.poll()
+        self.assertEqual(len(self.second_received), 1)
+
+    def test_own_messages_not_redelivered(self):
+        """Test that polling does not deliver a worker's own messages a second time"""
+        self.first.publish(['amenities'])
+        self.first.poll()
+        self.assertEqual(self.first_received, [['amenities']])
+
+    def test_first_poll_starts_at_end_of_log(self):
+        """Test that a new worker skips messages published before it started"""
+        self.first.publish(['users'])
+        late, received = SQLiteInvalidationBus(self.path, poll_interval=0), []
+        late.subscribe(received.append)
+        late.poll()
+        late.poll()
+        self.assertEqual(received, [])
+        self.first.publish(['reviews'])
+        late.poll()
+        self.assertEqual(received, [['reviews']])
+
+    def test_pruned_messages_invalidate_everything(self):
+        """Test that a gap in the log makes the reader drop every cached entry"""
+        self.first.publish(['users'])
+        self.first.publish(['reviews'])
+        conn = sqlite3.connect(self.path)
+        with conn:
+            conn.execute("DELETE FROM cache_invalidations WHERE tag = 'users'")
+        conn.close()
+        self.second.poll()
+        self.assertEqual(self.second_received, [[ALL]])
+
+    def test_local_subscriber_ignores_other_workers(self):
+        """Test that a subscriber registered with remote=False only sees this worker's messages"""
+        local_only = []
+        self.second.subscribe(local_only.append, remote=False)
+        self.first.publish(['places'])
+        self.second.poll()
+        self.second.publish(['amenities'])
+        self.assertEqual(local_only, [['amenities']])
+
+    def test_poll_interval_limits_reads(self):
+        """Test that a worker does not read the log again within poll_interval"""
+        self.second.poll_interval = 3600
+        self.second.poll()
+        self.first.publish(['places'])
+        self.second.poll()
+        self.assertEqual(self.second_received, [])
+
+    def test_remote_tags_invalidate_cache(self):
+        """Test that tags polled from another worker drop the matching cache entries"""
+        cache = MemoryCacheBackend()
+        cache.set('a', b'places', 60, tags=['places'])
+        cache.set('b', b'users', 60, tags=['users'])
+        self.second.subscribe(cache.invalidate)
+        self.first.publish(['places'])
+        self.second.poll()
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('b'), b'users')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/python3
+
+import base64
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from config import Config
+from hbnb.app import create_app, db
+from hbnb.app.models.amenity import Amenity
+from hbnb.app.persistence.repository import (
+    InMemoryRepository, SQLAlchemyRepository, decode_cursor, encode_cursor)
+
+START = datetime(2024, 1, 1, 12, 0, 0)
+
+
+class KeysetPaginationConfig(Config):
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    PASSWORD_HASH_WORKERS = 0
+    RESPONSE_CACHE_TTL = 0
+
+
+def make_amenities():
+    """Seven amenities, three of them created in the same instant"""
+    amenities = []
+    for index, offset in enumerate((0, 1, 1, 1, 2, 3, 4)):
+        amenity = Amenity(name=f'Amenity {index}')
+        amenity.created_at = START + timedelta(seconds=offset)
+        amenities.append(amenity)
+    return amenities
+
+
+def page_order(amenities):
+    return [amenity.id for amenity in sorted(amenities, key=lambda amenity: (amenity.created_at, amenity.id))]
+
+
+class TestCursor(unittest.TestCase):
+    """Test cases for the opaque (created_at, id) cursor"""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the position it was made from"""
+        amenity = make_amenities()[1]
+        self.assertEqual(decode_cursor(encode_cursor(amenity)), (amenity.created_at, amenity.id))
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors raise ValueError"""
+        no_separator = base64.urlsafe_b64encode(b'2024-01-01T12:00:00').decode('ascii')
+        bad_date = base64.urlsafe_b64encode(b'yesterday|abc').decode('ascii')
+        for cursor in ('not a cursor', no_separator, bad_date, 'é'):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+class PaginationCases:
+    """Walks shared by the in-memory and SQLAlchemy repositories"""
+
+    def walk(self, limit):
+        """Return every id reached by following next_cursor, and the number of pages"""
+        ids, cursor, pages = [], None, 0
+        while True:
+            items, cursor = self.repo.get_page(limit, cursor)
+            ids.extend(item.id for item in items)
+            pages += 1
+            if cursor is None:
+                return ids, pages
+
+    def test_pages_follow_created_at_then_id(self):
+        """Test that pages list every object once, ties on created_at broken by id"""
+        for limit in (1, 2, 3, 6):
+            ids, _ = self.walk(limit)
+            self.assertEqual(ids, page_order(self.amenities))
+
+    def test_last_full_page_has_no_cursor(self):
+        """Test that a page ending exactly on the last object does not point to an empty page"""
+        ids, pages = self.walk(7)
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(pages, 1)
+
+    def test_cursor_inside_tied_timestamps(self):
+        """Test that a cursor on one of several equal timestamps resumes after it"""
+        expected = page_order(self.amenities)
+        items, cursor = self.repo.get_page(2)
+        self.assertEqual([item.id for item in items], expected[:2])
+        items, _ = self.repo.get_page(2, cursor)
+        self.assertEqual([item.id for item in items], expected[2:4])
+
+    def test_earlier_insert_does_not_shift_pages(self):
+        """Test that an object created before the cursor does not repeat or skip later ones"""
+        expected = page_order(self.amenities)
+        items, cursor = self.repo.get_page(3)
+        early = Amenity(name='Early')
+        early.created_at = START - timedelta(days=1)
+        self.add(early)
+        rest = []
+        while cursor:
+            items, cursor = self.repo.get_page(3, cursor)
+            rest.extend(item.id for item in items)
+        self.assertEqual(rest, expected[3:])
+
+
+class TestInMemoryPagination(PaginationCases, unittest.TestCase):
+    """Test cases for keyset pagination in InMemoryRepository"""
+
+    def setUp(self):
+        self.repo = InMemoryRepository()
+        self.amenities = make_amenities()
+        for amenity in self.amenities:
+            self.add(amenity)
+
+    def add(self, amenity):
+        self.repo.add(amenity)
+
+
+class TestSQLAlchemyPagination(PaginationCases, unittest.TestCase):
+    """Test cases for keyset pagination in SQLAlchemyRepository and the list endpoints"""
+
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        config = type('Config', (KeysetPaginationConfig,),
+                      {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{self.db_path}'})
+        self.app = create_app(config)
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        self.repo = SQLAlchemyRepository(Amenity)
+        self.amenities = make_amenities()
+        for amenity in self.amenities:
+            self.add(amenity)
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.context.pop()
+        os.remove(self.db_path)
+
+    def add(self, amenity):
+        self.repo.add(amenity)
+
+    def test_endpoint_pages(self):
+        """Test that a list endpoint pages with next_cursor and rejects a bad cursor"""
+        client = self.app.test_client()
+        ids, cursor = [], None
+        while True:
+            response = client.get('/api/v1/amenities/?limit=3' + (f'&cursor={cursor}' if cursor else ''))
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item['id'] for item in response.json['items'])
+            cursor = response.json['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(ids, page_order(self.amenities))
+
+        response = client.get('/api/v1/amenities/?cursor=garbage')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {'error': 'Invalid cursor'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+
+import os
+import tempfile
+import unittest
+from config import Config
+from hbnb.app import create_app, db, password_hasher
+from hbnb.app.models.user import User
+from hbnb.app.services import facade
+
+LONG_PASSWORD = 'p' * 100
+
+
+class PasswordConfig(Config):
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    PASSWORD_HASH_WORKERS = 0
+    BCRYPT_LOG_ROUNDS = 4
+    RESPONSE_CACHE_TTL = 0
+
+
+class TestPasswords(unittest.TestCase):
+    """Test cases for password validation and checks"""
+
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        config = type('Config', (PasswordConfig,), {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{self.db_path}'})
+        self.app = create_app(config)
+        with self.app.app_context():
+            db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        os.remove(self.db_path)
+
+    def user_data(self, email, password):
+        return {'first_name': 'Ada', 'last_name': 'Lovelace', 'email': email, 'password': password}
+
+    def test_validate_password(self):
+        """Test that passwords must be non-empty and fit in bcrypt's 72 bytes"""
+        self.assertEqual(User._validate_password('p' * 72), 'p' * 72)
+        for password in ('', None, 'p' * 73, 'é' * 37):
+            with self.assertRaises(ValueError):
+                User._validate_password(password)
+
+    def test_long_password_rejected_on_registration(self):
+        """Test that registering with a password over 72 bytes is a 400"""
+        response = self.client.post('/api/v1/users/', json=self.user_data('ada@example.com', LONG_PASSWORD))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {'error': 'Password must be at most 72 bytes'})
+
+    def test_long_password_rejected_in_bulk(self):
+        """Test that create_users rejects a long password before hashing any"""
+        with self.app.app_context():
+            with self.assertRaises(ValueError):
+                facade.create_users([self.user_data('ada@example.com', 'secret'),
+                                     self.user_data('alan@example.com', LONG_PASSWORD)])
+            self.assertIsNone(facade.get_user_by_email('ada@example.com'))
+
+    def test_long_password_login_fails(self):
+        """Test that logging in with a password over 72 bytes is a 401, not an error"""
+        with self.app.app_context():
+            facade.create_user(self.user_data('ada@example.com', 'secret'))
+        response = self.client.post('/api/v1/auth/login',
+                                    json={'email': 'ada@example.com', 'password': LONG_PASSWORD})
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post('/api/v1/auth/login', json={'email': 'ada@example.com', 'password': 'secret'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_verify_long_password(self):
+        """Test that verify returns False for a password bcrypt would reject"""
+        password_hash = password_hasher.hash('p' * 72)
+        self.assertTrue(password_hasher.verify('p' * 72, password_hash))
+        self.assertFalse(password_hasher.verify(LONG_PASSWORD, password_hash))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+
+import os
+import tempfile
+import unittest
+from config import Config
+from hbnb.app import create_app, db
+from hbnb.app.services import facade
+
+
+class PlaceFacetConfig(Config):
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    PASSWORD_HASH_WORKERS = 0
+    BCRYPT_LOG_ROUNDS = 4
+    RESPONSE_CACHE_TTL = 60
+    JWT_SECRET_KEY = 'place-facet-tests-' * 2
+    # Tokens carry a dict identity
+    JWT_VERIFY_SUB = False
+
+
+class TestPlaceFacets(unittest.TestCase):
+    """Test cases for amenity filters and facets as places are updated"""
+
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        config = type('Config', (PlaceFacetConfig,), {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{self.db_path}'})
+        self.app = create_app(config)
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({'first_name': 'Ada', 'last_name': 'Lovelace',
+                                        'email': 'ada@example.com', 'password': 'secret'})
+            self.wifi = facade.create_amenity({'name': 'Wifi'}).id
+            self.pool = facade.create_amenity({'name': 'Pool'}).id
+            self.place_id = facade.create_place({'title': 'Loft', 'price': 100, 'latitude': 48.85,
+                                                 'longitude': 2.35, 'owner_id': owner.id,
+                                                 'amenities': [self.wifi]}).id
+        self.client = self.app.test_client()
+        token = self.client.post('/api/v1/auth/login',
+                                 json={'email': 'ada@example.com', 'password': 'secret'}).json['access_token']
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        os.remove(self.db_path)
+
+    def filtered(self, *amenity_ids):
+        response = self.client.get(f'/api/v1/places/?amenities={",".join(amenity_ids)}')
+        self.assertEqual(response.status_code, 200)
+        return response.json
+
+    def update(self, data):
+        return self.client.put(f'/api/v1/places/{self.place_id}', json=data, headers=self.headers)
+
+    def test_update_amenities(self):
+        """Test that a PUT replacing the amenities updates the place, the filter and the cached facets"""
+        self.assertEqual(self.filtered(self.pool)['total'], 0)
+        response = self.update({'amenities': [self.pool]})
+        self.assertEqual(response.status_code, 200)
+        with self.app.app_context():
+            self.assertEqual([amenity.id for amenity in facade.get_place(self.place_id).amenities], [self.pool])
+        self.assertEqual(self.filtered(self.pool)['total'], 1)
+        self.assertEqual(self.filtered(self.wifi)['total'], 0)
+
+    def test_update_unknown_amenity(self):
+        """Test that a PUT naming an unknown amenity is a 400 and changes nothing"""
+        response = self.update({'amenities': [self.pool, 'no-such-amenity']})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json, {'error': 'Invalid amenity ID in amenities list'})
+        self.assertEqual(self.filtered(self.wifi)['total'], 1)
+
+    def test_update_price(self):
+        """Test that a PUT changing the price moves the place between price filters"""
+        self.assertEqual(self.update({'price': 250}).status_code, 200)
+        response = self.client.get('/api/v1/places/?min_price=200')
+        self.assertEqual([place['id'] for place in response.json['items']], [self.place_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+
+import os
+import tempfile
+import unittest
+from config import Config
+from hbnb.app import create_app, db
+from hbnb.app.services import facade
+
+
+class PlaceSearchConfig(Config):
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    PASSWORD_HASH_WORKERS = 0
+    RESPONSE_CACHE_TTL = 0
+
+
+class TestPlaceSearch(unittest.TestCase):
+    """Test cases for the R*Tree and FTS5 indexes on databases built by db.create_all()"""
+
+    def setUp(self):
+        self.db_paths = []
+
+    def tearDown(self):
+        for path in self.db_paths:
+            os.remove(path)
+
+    def make_app(self):
+        """An app on a new SQLite file, as each worker or test database gets"""
+        handle, path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.db_paths.append(path)
+        config = type('Config', (PlaceSearchConfig,), {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}'})
+        app = create_app(config)
+        with app.app_context():
+            db.create_all()
+        return app
+
+    def populate(self):
+        owner = facade.create_user({'first_name': 'Ada', 'last_name': 'Lovelace',
+                                    'email': 'ada@example.com', 'password': 'secret'})
+        guest = facade.create_user({'first_name': 'Alan', 'last_name': 'Turing',
+                                    'email': 'alan@example.com', 'password': 'secret'})
+        near = facade.create_place({'title': 'Harbour loft', 'description': 'Ocean view', 'price': 120,
+                                    'latitude': 48.8566, 'longitude': 2.3522, 'owner_id': owner.id,
+                                    'amenities': []})
+        far = facade.create_place({'title': 'Mountain hut', 'description': 'Quiet', 'price': 80,
+                                   'latitude': 45.8326, 'longitude': 6.8652, 'owner_id': owner.id,
+                                   'amenities': []})
+        facade.create_review({'text': 'Lovely sunset', 'rating': 5, 'user_id': guest.id, 'place_id': far.id})
+        return near, far
+
+    def test_indexes_on_each_new_database(self):
+        """Test that every new database gets its indexes, not only the first one of the process"""
+        for _ in range(2):
+            app = self.make_app()
+            with app.app_context():
+                near, far = self.populate()
+                found = facade.search_places_near(48.85, 2.35, 50, 10)
+                self.assertEqual([place.id for place, _ in found], [near.id])
+                found = facade.search_places_in_bbox(-10, 40, 10, 50, 10)
+                self.assertEqual([place.id for place, _ in found], [near.id, far.id])
+                results, total = facade.search_places_text('ocean', 10)
+                self.assertEqual(([place.id for place, _, _ in results], total), ([near.id], 1))
+                results, total = facade.search_places_text('sunset', 10)
+                self.assertEqual(([place.id for place, _, _ in results], total), ([far.id], 1))
+                db.session.remove()
+                db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
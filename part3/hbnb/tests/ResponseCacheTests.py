@@ -0,0 +1,154 @@
+#!/usr/bin/python3
+
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from config import Config
+from hbnb.app import create_app, db
+from hbnb.app.persistence.cache import MemoryCacheBackend, SQLiteCacheBackend
+from hbnb.app.services import facade
+
+
+class ResponseCacheConfig(Config):
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    PASSWORD_HASH_WORKERS = 0
+    RESPONSE_CACHE_TTL = 60
+
+
+class BackendCases:
+    """Generation checks shared by the memory and SQLite backends"""
+
+    def test_set_and_invalidate(self):
+        """Test that invalidating a tag drops only the entries carrying it"""
+        self.backend.set('a', b'places', 60, ['places'])
+        self.backend.set('b', b'users', 60, ['users'])
+        self.assertEqual(self.backend.invalidate(['places']), 1)
+        self.assertIsNone(self.backend.get('a'))
+        self.assertEqual(self.backend.get('b'), b'users')
+
+    def test_set_skipped_after_tag_invalidated(self):
+        """Test that a value is not stored if one of its tags was invalidated after its generation"""
+        generation = self.backend.generation()
+        self.backend.invalidate(['place:1'])
+        self.backend.set('a', b'stale', 60, ['places', 'place:1'], generation)
+        self.assertIsNone(self.backend.get('a'))
+
+    def test_set_kept_after_other_tag_invalidated(self):
+        """Test that invalidating an unrelated tag does not keep a value out"""
+        generation = self.backend.generation()
+        self.backend.invalidate(['users'])
+        self.backend.set('a', b'fresh', 60, ['places'], generation)
+        self.assertEqual(self.backend.get('a'), b'fresh')
+
+    def test_set_skipped_after_clear(self):
+        """Test that clearing the cache keeps out values built before it"""
+        generation = self.backend.generation()
+        self.backend.clear()
+        self.backend.set('a', b'stale', 60, ['places'], generation)
+        self.assertIsNone(self.backend.get('a'))
+        self.backend.set('a', b'fresh', 60, ['places'], self.backend.generation())
+        self.assertEqual(self.backend.get('a'), b'fresh')
+
+
+class TestMemoryCacheBackend(BackendCases, unittest.TestCase):
+    """Test cases for the per-process cache backend"""
+
+    def setUp(self):
+        self.backend = MemoryCacheBackend()
+
+    def test_evicts_least_recently_used(self):
+        """Test that values beyond max_bytes evict the least recently used ones"""
+        backend = MemoryCacheBackend(max_bytes=8)
+        backend.set('a', b'aaaa', 60)
+        backend.set('b', b'bbbb', 60)
+        backend.get('a')
+        backend.set('c', b'cccc', 60)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.get('a'), b'aaaa')
+
+
+class TestSQLiteCacheBackend(BackendCases, unittest.TestCase):
+    """Test cases for the cache backend shared by the workers of a host"""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.backend = SQLiteCacheBackend(self.path)
+
+    def tearDown(self):
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_other_worker_sees_generation(self):
+        """Test that an invalidation by another worker keeps this worker's stale value out"""
+        other = SQLiteCacheBackend(self.path)
+        generation = self.backend.generation()
+        other.invalidate(['places'])
+        self.backend.set('a', b'stale', 60, ['places'], generation)
+        self.assertIsNone(other.get('a'))
+
+
+class TestCachedResponse(unittest.TestCase):
+    """Test cases for cached GET responses racing with writes"""
+
+    def setUp(self):
+        handle, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        config = type('Config', (ResponseCacheConfig,), {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{self.db_path}'})
+        self.app = create_app(config)
+        with self.app.app_context():
+            db.create_all()
+            self.amenity_id = facade.create_amenity({'name': 'Wifi'}).id
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        os.remove(self.db_path)
+
+    def rename(self, name):
+        """Update the amenity from another thread, as a concurrent request would"""
+        def update():
+            with self.app.app_context():
+                facade.update_amenity(self.amenity_id, {'name': name})
+                db.session.remove()
+        thread = threading.Thread(target=update)
+        thread.start()
+        thread.join()
+
+    def names(self, response):
+        return [item['name'] for item in response.json['items']]
+
+    def test_hit_after_miss(self):
+        """Test that a second GET is served from the cache until a write invalidates it"""
+        self.assertEqual(self.client.get('/api/v1/amenities/').headers['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/v1/amenities/').headers['X-Cache'], 'HIT')
+        self.rename('Fiber')
+        response = self.client.get('/api/v1/amenities/')
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertEqual(self.names(response), ['Fiber'])
+
+    def test_write_during_read_is_not_cached_over(self):
+        """Test that a write committed between a GET's read and its cache store is not hidden"""
+        read_page = facade.get_amenities_page
+
+        def read_then_write(*args, **kwargs):
+            page = read_page(*args, **kwargs)
+            self.rename('Fiber')
+            return page
+
+        with mock.patch.object(facade, 'get_amenities_page', read_then_write):
+            response = self.client.get('/api/v1/amenities/')
+        self.assertEqual(self.names(response), ['Wifi'])
+        response = self.client.get('/api/v1/amenities/')
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertEqual(self.names(response), ['Fiber'])
+
+
+if __name__ == '__main__':
+    unittest.main()
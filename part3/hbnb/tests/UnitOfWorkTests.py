@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from config import Config
+from hbnb.app import create_app, db
+from hbnb.app.models.amenity import Amenity
+from hbnb.app.persistence.unit_of_work import commit, current_unit, unit_of_work
+from hbnb.app.services import facade
+
+
+class UnitOfWorkConfig(Config):
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    PASSWORD_HASH_WORKERS = 0
+    RESPONSE_CACHE_TTL = 0
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """Test cases for the request and facade units of work"""
+
+    def setUp(self):
+        """Create an app on a fresh SQLite file and record published invalidations"""
+        handle, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        config = type('Config', (UnitOfWorkConfig,), {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{self.db_path}'})
+        self.app = create_app(config)
+        with self.app.app_context():
+            db.create_all()
+        self.published = []
+        facade.bus.subscribe(self.published.extend)
+
+        @self.app.route('/test/amenity/<name>/<int:status>')
+        def create_amenity(name, status):
+            facade.create_amenity({'name': name})
+            if status == 0:
+                raise RuntimeError("handler failed")
+            return {'name': name}, status
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        os.remove(self.db_path)
+
+    def stored_names(self):
+        """Amenity names committed to the database, read over a separate connection"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return sorted(row[0] for row in conn.execute("SELECT name FROM amenities"))
+        finally:
+            conn.close()
+
+    def test_request_commits_on_success(self):
+        """Test that a request answering below 400 commits its writes"""
+        response = self.client.get('/test/amenity/Wifi/201')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.stored_names(), ['Wifi'])
+
+    def test_request_rolls_back_on_error_status(self):
+        """Test that a request answering 400 or more rolls back its writes"""
+        response = self.client.get('/test/amenity/Wifi/409')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.stored_names(), [])
+
+    def test_request_rolls_back_on_exception(self):
+        """Test that a request raising an exception rolls back its writes"""
+        with self.assertRaises(RuntimeError):
+            self.client.get('/test/amenity/Wifi/0')
+        self.assertEqual(self.stored_names(), [])
+
+    def test_invalidations_wait_for_commit(self):
+        """Test that invalidations are published after a commit and dropped on rollback"""
+        self.client.get('/test/amenity/Pool/409')
+        self.assertEqual(self.published, [])
+        self.client.get('/test/amenity/Pool/200')
+        self.assertIn('amenities', self.published)
+
+    def test_nested_unit_joins_outer(self):
+        """Test that a nested unit_of_work() joins the open unit and commits with it"""
+        with self.app.app_context():
+            with unit_of_work() as outer:
+                with unit_of_work() as inner:
+                    self.assertIs(inner, outer)
+                    facade.create_amenity({'name': 'Gym'})
+                # The inner block only flushed
+                self.assertEqual(self.stored_names(), [])
+                self.assertEqual(self.published, [])
+            self.assertIsNone(current_unit())
+            self.assertEqual(self.stored_names(), ['Gym'])
+            self.assertIn('amenities', self.published)
+
+    def test_nested_unit_rolls_back_with_outer(self):
+        """Test that an exception in the outer unit rolls back the nested unit's writes"""
+        with self.app.app_context():
+            with self.assertRaises(ValueError):
+                with unit_of_work():
+                    with unit_of_work():
+                        facade.create_amenity({'name': 'Gym'})
+                    raise ValueError("outer failed")
+            self.assertIsNone(current_unit())
+            self.assertEqual(self.stored_names(), [])
+            self.assertEqual(self.published, [])
+
+    def test_commit_flushes_inside_unit(self):
+        """Test that commit() flushes inside a unit and commits outside one"""
+        with self.app.app_context():
+            with unit_of_work():
+                db.session.add(Amenity(name='Sauna'))
+                commit()
+                self.assertEqual(Amenity.query.filter_by(name='Sauna').count(), 1)
+                self.assertEqual(self.stored_names(), [])
+            db.session.add(Amenity(name='Crib'))
+            commit()
+            self.assertEqual(self.stored_names(), ['Crib', 'Sauna'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,10 @@
 #!/usr/bin/python3
 
+import os
+from config import config
 from hbnb.app import create_app
 
-app = create_app()
+app = create_app(config[os.getenv('HBNB_CONFIG', 'default')])
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=app.config['DEBUG'])